@@ -0,0 +1,55 @@
+"""
+Benchmark build of the API application.
+
+Wraps crontopus_api.main:app for load testing:
+- Rate limiting is disabled (the limits would cap throughput at 100 req/min)
+- SQL statements executed by both engines are counted and exposed at
+  GET /_benchmark/queries so the runner can report queries per request
+
+Serve it like the real app:
+    uvicorn benchmarks.app:app --workers 4
+
+Never deploy this module; it removes rate limiting.
+"""
+import logging
+import threading
+
+from fastapi import Request, Response
+from fastapi_limiter.depends import RateLimiter
+from sqlalchemy import event
+
+from crontopus_api.config import engine, async_engine
+from crontopus_api.main import app
+
+# Deprecated token-less check-ins log a warning per request
+logging.getLogger("crontopus_api").setLevel(logging.ERROR)
+
+
+async def _no_rate_limit(self, request: Request, response: Response):
+    return
+
+
+RateLimiter.__call__ = _no_rate_limit
+
+
+class QueryCounter:
+    """Thread-safe count of SQL statements sent to the database."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args) -> None:
+        with self._lock:
+            self.value += 1
+
+
+query_counter = QueryCounter()
+event.listen(engine, "before_cursor_execute", query_counter)
+event.listen(async_engine.sync_engine, "before_cursor_execute", query_counter)
+
+
+@app.get("/_benchmark/queries", include_in_schema=False)
+async def benchmark_queries():
+    """SQL statements executed by this worker since it started."""
+    return {"queries": query_counter.value}
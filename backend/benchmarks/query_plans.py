@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Run history query plan benchmark.
+
+Runs the run-history query shapes used by routes/checkins.py under
+EXPLAIN (ANALYZE, BUFFERS) on a seeded PostgreSQL database and reports
+execution time, buffers touched and the indexes each plan uses. Record
+results before and after an index or schema migration and compare them:
+
+    alembic upgrade e6a0f3b2c815
+    python benchmarks/query_plans.py --database-url $URL --seed 2000000 --json > before.json
+    alembic upgrade f2c7d4a9e613
+    python benchmarks/query_plans.py --database-url $URL --json > after.json
+    python benchmarks/query_plans.py --compare before.json after.json
+
+Seeding writes through the COPY bulk loader, so the database must already
+be migrated. Use a scratch database; seeded runs are not cleaned up.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(BACKEND_DIR))
+
+TENANT_ID = "benchmark-plans"
+JOBS_PER_TENANT = 200
+NAMESPACES_PER_TENANT = 10
+ENDPOINTS_PER_TENANT = 50
+HISTORY_DAYS = 90
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE run history queries")
+    parser.add_argument("--database-url", help="PostgreSQL database to use (default: DATABASE_URL)")
+    parser.add_argument("--seed", type=int, default=0, help="Runs to seed before measuring (default: none)")
+    parser.add_argument("--tenants", type=int, default=20,
+                        help="Tenants to spread seeded runs over; queries use the first (default: 20)")
+    parser.add_argument("--repeat", type=int, default=5, help="Executions per query; the median is reported")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="Compare two --json result files instead of measuring")
+    return parser.parse_args()
+
+
+def tenant_ids(count: int) -> List[str]:
+    return [TENANT_ID] + [f"{TENANT_ID}-{i}" for i in range(1, count)]
+
+
+def generate_runs(count: int, tenants: List[str], rng: random.Random) -> Iterator[Dict[str, Any]]:
+    """Yield run rows in the insert_runs() format spread over HISTORY_DAYS."""
+    from crontopus_api.models import JobStatus
+
+    statuses = [JobStatus.SUCCESS] * 8 + [JobStatus.FAILURE, JobStatus.TIMEOUT]
+    now = datetime.now(timezone.utc)
+    for _ in range(count):
+        tenant_index = rng.randrange(len(tenants))
+        job = rng.randrange(JOBS_PER_TENANT)
+        started_at = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+        duration = int(rng.expovariate(1 / 60))
+        yield {
+            "tenant_id": tenants[tenant_index],
+            "job_name": f"job-{job:03d}",
+            "namespace": f"namespace-{job % NAMESPACES_PER_TENANT}",
+            "status": rng.choice(statuses),
+            "started_at": started_at,
+            "finished_at": started_at + timedelta(seconds=duration),
+            "duration": duration,
+            "exit_code": 0,
+            "agent_id": None,
+            "endpoint_id": tenant_index * ENDPOINTS_PER_TENANT + job % ENDPOINTS_PER_TENANT + 1,
+            "output": None,
+            "error_message": None,
+        }
+
+
+def seed(db, count: int, tenants: List[str]) -> None:
+    from sqlalchemy import text
+    from crontopus_api.models import Tenant
+    from crontopus_api.services.bulk_load import bulk_load_runs
+
+    for tenant_id in tenants:
+        if not db.get(Tenant, tenant_id):
+            db.add(Tenant(id=tenant_id, name=tenant_id, is_active=True))
+    db.commit()
+
+    loaded = bulk_load_runs(db, generate_runs(count, tenants, random.Random(42)))
+    db.execute(text("ANALYZE job_run"))
+    db.commit()
+    print(f"Seeded {loaded} runs", file=sys.stderr)
+
+
+def build_queries() -> Dict[str, Any]:
+    """Statements mirroring the run history routes, for the first tenant."""
+    from sqlalchemy import case, desc, func, select, tuple_
+    from crontopus_api.models import JobRun, JobStatus
+
+    now = datetime.now(timezone.utc)
+    newest_first = (JobRun.started_at.desc(), JobRun.id.desc())
+    tenant = JobRun.tenant_id == TENANT_ID
+
+    def aggregate(*group_by):
+        return select(
+            *group_by,
+            func.count(JobRun.id),
+            func.sum(case((JobRun.status == JobStatus.SUCCESS, 1), else_=0)),
+            func.sum(case((JobRun.status == JobStatus.FAILURE, 1), else_=0))
+        ).where(tenant, JobRun.started_at >= now - timedelta(days=1)).group_by(*group_by)
+
+    return {
+        # GET /runs (first page)
+        "list-first-page": select(JobRun).where(tenant).order_by(*newest_first).limit(101),
+        # GET /runs?cursor=... (a page about a month back)
+        "list-cursor-page": select(JobRun).where(
+            tenant, tuple_(JobRun.started_at, JobRun.id) < tuple_(now - timedelta(days=30), 0)
+        ).order_by(*newest_first).limit(101),
+        # GET /runs?job_name=...
+        "list-job-name-substring": select(JobRun).where(
+            tenant, JobRun.job_name.ilike("%ob-04%")
+        ).order_by(*newest_first).limit(101),
+        # GET /runs?namespace=...&days=7
+        "list-namespace-7d": select(JobRun).where(
+            tenant, JobRun.namespace == "namespace-3", JobRun.started_at >= now - timedelta(days=7)
+        ).order_by(*newest_first).limit(101),
+        # GET /runs?endpoint_id=...&days=7
+        "list-endpoint-7d": select(JobRun).where(
+            tenant, JobRun.endpoint_id == 1, JobRun.started_at >= now - timedelta(days=7)
+        ).order_by(*newest_first).limit(101),
+        # GET /runs/by-job?days=1
+        "by-job-1d": aggregate(JobRun.job_name, JobRun.namespace).order_by(desc(func.count(JobRun.id))),
+        # GET /runs/by-endpoint?days=1
+        "by-endpoint-1d": aggregate(JobRun.endpoint_id),
+    }
+
+
+def _walk(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def explain(db, statement, repeat: int) -> dict:
+    """EXPLAIN ANALYZE a statement repeat times and summarize the median run."""
+    sql = str(statement.compile(bind=db.get_bind(), compile_kwargs={"literal_binds": True}))
+    connection = db.connection()
+    runs = []
+    for _ in range(repeat):
+        # Driver-level execution: literal timestamps contain ':' that text() would take for binds
+        runs.append(connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}").scalar()[0])
+    runs.sort(key=lambda result: result["Execution Time"])
+    result = runs[len(runs) // 2]
+    nodes = list(_walk(result["Plan"]))
+    return {
+        "execution_ms": result["Execution Time"],
+        "planning_ms": result["Planning Time"],
+        "execution_ms_min": runs[0]["Execution Time"],
+        "shared_buffers": result["Plan"].get("Shared Hit Blocks", 0) + result["Plan"].get("Shared Read Blocks", 0),
+        "rows": result["Plan"]["Actual Rows"],
+        "nodes": sorted({node["Node Type"] for node in nodes}),
+        "indexes": sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+    }
+
+
+def measure(args: argparse.Namespace) -> Dict[str, Any]:
+    from sqlalchemy import text
+    from crontopus_api.config import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            raise SystemExit("query_plans.py needs PostgreSQL (use --database-url)")
+        if args.seed:
+            seed(db, args.seed, tenant_ids(args.tenants))
+
+        revision = db.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        total = db.execute(text("SELECT count(*) FROM job_run")).scalar()
+        results = {name: explain(db, statement, args.repeat) for name, statement in build_queries().items()}
+    finally:
+        db.close()
+
+    return {"revision": revision, "job_run_rows": total, "repeat": args.repeat, "results": results}
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    print(f"revision {report['revision']}, {report['job_run_rows']} job_run rows, median of {report['repeat']}")
+    header = f"{'query':<24} {'exec ms':>9} {'plan ms':>8} {'buffers':>8} {'rows':>6}  indexes"
+    print(header)
+    print("-" * len(header))
+    for name, result in report["results"].items():
+        print(
+            f"{name:<24} {result['execution_ms']:>9.2f} {result['planning_ms']:>8.2f} "
+            f"{result['shared_buffers']:>8} {result['rows']:>6}  {', '.join(result['indexes']) or 'none (seq scan)'}"
+        )
+
+
+def print_comparison(before: Dict[str, Any], after: Dict[str, Any]) -> None:
+    print(f"before: revision {before['revision']}, {before['job_run_rows']} rows")
+    print(f"after:  revision {after['revision']}, {after['job_run_rows']} rows")
+    header = f"{'query':<24} {'before ms':>10} {'after ms':>10} {'speedup':>8} {'buffers':>17}"
+    print(header)
+    print("-" * len(header))
+    for name, old in before["results"].items():
+        new = after["results"].get(name)
+        if new is None:
+            continue
+        speedup = old["execution_ms"] / new["execution_ms"] if new["execution_ms"] else float("inf")
+        buffers = f"{old['shared_buffers']} -> {new['shared_buffers']}"
+        print(f"{name:<24} {old['execution_ms']:>10.2f} {new['execution_ms']:>10.2f} {speedup:>7.1f}x {buffers:>17}")
+        if old["indexes"] != new["indexes"]:
+            print(f"  indexes: {', '.join(old['indexes']) or 'none'} -> {', '.join(new['indexes']) or 'none'}")
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.compare:
+        before, after = (json.loads(Path(path).read_text()) for path in args.compare)
+        print_comparison(before, after)
+        return 0
+
+    # Configure the database before crontopus_api reads its settings
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    report = measure(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_results(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
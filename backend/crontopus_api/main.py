@@ -3,14 +3,21 @@ Main FastAPI application for Crontopus.
 API-first job scheduling and monitoring platform.
 """
 from fastapi import FastAPI, Depends, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from crontopus_api.config import settings, get_db
-from crontopus_api.routes import auth, checkins, agents, endpoints, jobs, enrollment_tokens, namespaces, api_tokens
+from crontopus_api.routes import auth, checkins, agents, endpoints, jobs, enrollment_tokens, namespaces, api_tokens, retention
 from crontopus_api.middleware.rate_limit import get_identifier
+from crontopus_api.services.ingestion import ingestion_queue
+from crontopus_api.services.partitions import partition_maintenance
+from crontopus_api.services.retention import run_retention
+from crontopus_api.services.rollups import rollup_compactor
+from crontopus_api.services.archive import run_archiver
+from crontopus_api.services.metrics import render_metrics
 
 # Create FastAPI app
 app = FastAPI(
@@ -42,6 +49,7 @@ app.include_router(endpoints.router, prefix=settings.api_prefix)  # New: Agent 
 app.include_router(enrollment_tokens.router, prefix=settings.api_prefix)  # Enrollment token management
 app.include_router(namespaces.router, prefix=settings.api_prefix)  # Namespace/group management
 app.include_router(api_tokens.router, prefix=settings.api_prefix)  # API token management
+app.include_router(retention.router, prefix=settings.api_prefix)  # Run retention policies
 app.include_router(jobs.router, prefix=f"{settings.api_prefix}/jobs")
 
 # Log all registered routes on startup
@@ -68,6 +76,22 @@ async def startup_event():
         logger.error(f"Failed to initialize rate limiting: {e}")
         # Continue without rate limiting - graceful degradation
     
+    # Start write-behind check-in ingestion if enabled
+    if settings.ingestion_mode == "buffered":
+        await ingestion_queue.start()
+    
+    # Create upcoming job_run partitions (no-op unless job_run is partitioned)
+    await partition_maintenance.start()
+    
+    # Fold queued check-ins into the hourly rollups
+    await rollup_compactor.start()
+    
+    # Apply run retention policies in bounded batches
+    await run_retention.start()
+    
+    # Move old runs to the Parquet archive (only when run_archive_uri is set)
+    await run_archiver.start()
+    
     # Log registered routes
     logger.info("="*50)
     logger.info("Registered routes:")
@@ -77,6 +101,17 @@ async def startup_event():
     logger.info("="*50)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered state before the worker exits."""
+    # Drain buffered check-ins so accepted runs are not lost
+    await ingestion_queue.stop()
+    await partition_maintenance.stop()
+    await rollup_compactor.stop()
+    await run_retention.stop()
+    await run_archiver.stop()
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -116,6 +151,10 @@ async def health_check():
         "version": settings.api_version,
         "environment": settings.environment,
         "database": db_status,
+        "ingestion": {
+            "mode": settings.ingestion_mode,
+            "queue_depth": ingestion_queue.depth
+        },
         "timestamp": datetime.utcnow().isoformat()
     }
     
@@ -125,6 +164,17 @@ async def health_check():
     return response
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics for this worker process.
+    
+    Returns:
+        str: Metrics in the Prometheus text exposition format
+    """
+    return render_metrics()
+
+
 @app.get("/")
 async def root():
     """
@@ -8,6 +8,11 @@ from .base import TenantScopedBase
 from .tenant import Tenant
 from .user import User
 from .job_run import JobRun, JobStatus
+from .job_run_output import JobRunOutput, JobRunOutputSegment
+from .checkin_idempotency_key import CheckinIdempotencyKey
+from .job_run_rollup import JobRunRollupHourly, JobRunRollupDuration, JobRunRollupPending
+from .job_last_status import JobLastStatus
+from .run_retention_policy import RunRetentionPolicy
 from .agent import Agent, AgentStatus  # Keep for backward compatibility during migration
 from .endpoint import Endpoint, EndpointStatus
 from .job_instance import JobInstance, JobInstanceStatus, JobInstanceSource
@@ -20,6 +25,14 @@ __all__ = [
     "User",
     "JobRun",
     "JobStatus",
+    "JobRunOutput",
+    "JobRunOutputSegment",
+    "CheckinIdempotencyKey",
+    "JobRunRollupHourly",
+    "JobRunRollupDuration",
+    "JobRunRollupPending",
+    "JobLastStatus",
+    "RunRetentionPolicy",
     "Agent",
     "AgentStatus",
     "Endpoint",
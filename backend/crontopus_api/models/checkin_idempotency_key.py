@@ -0,0 +1,35 @@
+"""
+CheckinIdempotencyKey model for deduplicating retried check-ins.
+
+Agents retry check-ins on timeouts. When a check-in carries an
+idempotency key, the key is recorded with the run it created so a
+replayed request returns the original run instead of inserting a
+duplicate.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from crontopus_api.config import Base
+
+
+class CheckinIdempotencyKey(Base):
+    """
+    Idempotency key recorded for a check-in.
+    
+    Keys are scoped to the endpoint that sent them; the primary key on
+    (endpoint_id, key) makes the dedupe lookup a single index probe and
+    rejects concurrent inserts of the same key.
+    """
+    __tablename__ = "checkin_idempotency_key"
+    
+    endpoint_id = Column(Integer, primary_key=True)
+    key = Column(String(255), primary_key=True)
+    run_id = Column(Integer, nullable=False, index=True)  # job_run.id (no foreign key, see JobRunOutput)
+    
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self):
+        return f"<CheckinIdempotencyKey(endpoint_id={self.endpoint_id}, key={self.key})>"
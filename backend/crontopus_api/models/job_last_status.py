@@ -0,0 +1,49 @@
+"""
+Latest run per job model.
+
+Answering "what is the current state of every job?" from job_run means
+finding the newest run of every (namespace, job, endpoint). Instead,
+each inserted run also upserts its row here, keyed like the rollups by
+(tenant, namespace, job_name, endpoint_id), so the overview reads one
+row per job.
+
+Key columns are NOT NULL so they can form a primary key (and an upsert
+conflict target): runs without a namespace are stored with namespace ''
+and runs without an endpoint with endpoint_id 0.
+
+Rows are maintained by services/last_status.py and outlive the runs
+they point to when those are deleted by retention or archived.
+"""
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Index, Integer, String
+
+from crontopus_api.config import Base
+from crontopus_api.models.job_run import JobStatus
+
+
+class JobLastStatus(Base):
+    """
+    Latest run of one job on one endpoint.
+    """
+    __tablename__ = "job_last_status"
+    
+    tenant_id = Column(String, primary_key=True)
+    namespace = Column(String(255), primary_key=True)  # '' when the run has no namespace
+    job_name = Column(String(255), primary_key=True)
+    endpoint_id = Column(Integer, primary_key=True)  # 0 when the run has no endpoint
+    
+    # Newest run by (started_at, id)
+    last_run_id = Column(Integer, nullable=False)
+    status = Column(SQLEnum(JobStatus), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Failed or timed-out runs since the last success
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Overview queries filter one tenant's jobs by status
+        Index("ix_job_last_status_tenant_status", "tenant_id", "status"),
+    )
+    
+    def __repr__(self):
+        return f"<JobLastStatus(tenant_id={self.tenant_id}, job_name={self.job_name}, endpoint_id={self.endpoint_id}, status={self.status}, consecutive_failures={self.consecutive_failures})>"
@@ -4,12 +4,27 @@ JobRun model for tracking job execution history.
 Since job definitions live in Git, we only track runtime data here:
 - Which job ran (by name from Git manifest)
 - When it ran and how long it took
-- Success/failure status and output
+- Success/failure status
+
+Captured output lives in the job_run_output side table (see JobRunOutput)
+so that this table stays narrow for listings and aggregations.
+
+On PostgreSQL the table is range partitioned by month on started_at, with
+primary key (id, started_at); see services/partitions.py. The model keeps
+id as the mapped primary key so it also works as a plain table (SQLite,
+create_all() in tests).
+
+Indexes follow the run history query shapes: every query is tenant-scoped
+and ranges or orders on started_at, and job name filters are substring
+(ILIKE '%...%') matches served by a pg_trgm GIN index on PostgreSQL.
 """
-from sqlalchemy import Column, String, Integer, Text, DateTime, Enum as SQLEnum, func
+from typing import Optional
+from sqlalchemy import Column, DDL, String, Integer, DateTime, Enum as SQLEnum, Index, event, func
+from sqlalchemy.orm import relationship
 import enum
 
 from crontopus_api.models.base import TenantScopedBase
+from crontopus_api.models.job_run_output import JobRunOutput, compress_text
 
 
 class JobStatus(enum.Enum):
@@ -29,9 +44,13 @@ class JobRun(TenantScopedBase):
     so we reference them by name (from manifest metadata.name).
     """
     
+    # No single-column indexes: the primary key and the composite indexes below cover them
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(String, nullable=False)
+    
     # Job identification (from Git manifest)
-    job_name = Column(String(255), nullable=False, index=True)
-    namespace = Column(String(255), nullable=True, index=True)  # Job namespace/group
+    job_name = Column(String(255), nullable=False)
+    namespace = Column(String(255), nullable=True)  # Job namespace/group
     
     # Execution details
     status = Column(
@@ -45,17 +64,75 @@ class JobRun(TenantScopedBase):
     finished_at = Column(DateTime(timezone=True), nullable=True)
     duration = Column(Integer, nullable=True)  # seconds
     
-    # Output
-    output = Column(Text, nullable=True)  # stdout/stderr
-    error_message = Column(Text, nullable=True)  # error details
     exit_code = Column(Integer, nullable=True)
     
     # Agent that executed the job (optional)
     agent_id = Column(String(255), nullable=True, index=True)
-    endpoint_id = Column(Integer, nullable=True, index=True)  # Endpoint that executed the job
+    endpoint_id = Column(Integer, nullable=True)  # Endpoint that executed the job
     
     # Check-in metadata
     checkin_secret_hash = Column(String(255), nullable=True)  # for verification
     
+    __table_args__ = (
+        # Run listings: tenant-scoped, newest first, (started_at, id) keyset cursor
+        Index("ix_job_run_tenant_started_id", "tenant_id", started_at.desc(), id.desc()),
+        # Job history and per-job aggregations
+        Index("ix_job_run_tenant_namespace_job_started", "tenant_id", "namespace", "job_name", "started_at"),
+        # Per-endpoint aggregations
+        Index("ix_job_run_endpoint_started", "endpoint_id", "started_at"),
+        # Substring job name filters (ILIKE '%...%')
+        Index(
+            "ix_job_run_job_name_trgm",
+            "job_name",
+            postgresql_using="gin",
+            postgresql_ops={"job_name": "gin_trgm_ops"}
+        ),
+    )
+    
+    # Captured output (compressed, loaded on access)
+    output_record = relationship(
+        JobRunOutput,
+        primaryjoin="JobRun.id == foreign(JobRunOutput.run_id)",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
+    
+    def _get_or_create_output_record(self) -> JobRunOutput:
+        if self.output_record is None:
+            self.output_record = JobRunOutput()
+        return self.output_record
+    
+    @property
+    def output(self) -> Optional[str]:
+        """Job output (stdout/stderr)."""
+        return self.output_record.output_text if self.output_record is not None else None
+    
+    @output.setter
+    def output(self, value: Optional[str]) -> None:
+        if value is None and self.output_record is None:
+            return
+        record = self._get_or_create_output_record()
+        record.output, record.output_compression = compress_text(value)
+    
+    @property
+    def error_message(self) -> Optional[str]:
+        """Error details."""
+        return self.output_record.error_text if self.output_record is not None else None
+    
+    @error_message.setter
+    def error_message(self, value: Optional[str]) -> None:
+        if value is None and self.output_record is None:
+            return
+        record = self._get_or_create_output_record()
+        record.error_message, record.error_compression = compress_text(value)
+    
     def __repr__(self):
         return f"<JobRun(id={self.id}, job_name={self.job_name}, status={self.status.value}, tenant_id={self.tenant_id})>"
+
+
+# The trigram operator class needs pg_trgm before create_all() builds the index
+event.listen(
+    JobRun.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
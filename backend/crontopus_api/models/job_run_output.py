@@ -0,0 +1,133 @@
+"""
+JobRunOutput model for storing captured job output.
+
+Output and error messages are kept out of the job_run table so that run
+listings and aggregations only scan narrow rows. Text is zlib-compressed
+before storage and loaded only when a single run's details are requested.
+
+Logs too large for a check-in are uploaded separately and stored as
+appended JobRunOutputSegment rows.
+
+On PostgreSQL each output row also holds a full-text search vector of its
+text, computed when the row is inserted (see services/run_search.py).
+"""
+import zlib
+from typing import Optional, Tuple
+
+from sqlalchemy import Column, Index, Integer, BigInteger, String, LargeBinary, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+
+from crontopus_api.config import Base
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib"
+
+
+def compress_bytes(raw: bytes) -> Tuple[bytes, str]:
+    """
+    Compress bytes for storage.
+
+    Falls back to the raw bytes when compression would not save space
+    (typical for very short output).
+
+    Returns:
+        Tuple of (stored bytes, compression name)
+    """
+    compressed = zlib.compress(raw)
+    if len(compressed) < len(raw):
+        return compressed, COMPRESSION_ZLIB
+    return raw, COMPRESSION_NONE
+
+
+def decompress_bytes(data: bytes, compression: str) -> bytes:
+    """Restore bytes stored by compress_bytes()."""
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    return data
+
+
+def compress_text(text: Optional[str]) -> Tuple[Optional[bytes], str]:
+    """Compress text for storage as UTF-8 (see compress_bytes())."""
+    if text is None:
+        return None, COMPRESSION_NONE
+    return compress_bytes(text.encode("utf-8"))
+
+
+def decompress_text(data: Optional[bytes], compression: str) -> Optional[str]:
+    """Decode text stored by compress_text()."""
+    if data is None:
+        return None
+    return decompress_bytes(data, compression).decode("utf-8", errors="replace")
+
+
+class JobRunOutput(Base):
+    """
+    Captured output for a job run (one row per run, if any output exists).
+
+    Compression is tracked per column so each value is stored in whichever
+    form is smaller.
+    """
+    __tablename__ = "job_run_output"
+
+    # References job_run.id. There is no foreign key because job_run is
+    # partitioned on PostgreSQL (see services/partitions.py).
+    run_id = Column(Integer, primary_key=True)
+
+    output = Column(LargeBinary, nullable=True)  # stdout/stderr
+    output_compression = Column(String(16), nullable=False, default=COMPRESSION_NONE)
+
+    error_message = Column(LargeBinary, nullable=True)  # error details
+    error_compression = Column(String(16), nullable=False, default=COMPRESSION_NONE)
+
+    # Full-text search document (PostgreSQL only; never loaded with the row)
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True))
+
+    __table_args__ = (
+        Index("ix_job_run_output_search", "search_vector", postgresql_using="gin"),
+    )
+
+    @classmethod
+    def values_for(cls, run_id: int, output: Optional[str], error_message: Optional[str]) -> dict:
+        """Build column values for a run's output row."""
+        output_data, output_compression = compress_text(output)
+        error_data, error_compression = compress_text(error_message)
+        return {
+            "run_id": run_id,
+            "output": output_data,
+            "output_compression": output_compression,
+            "error_message": error_data,
+            "error_compression": error_compression,
+        }
+
+    @property
+    def output_text(self) -> Optional[str]:
+        return decompress_text(self.output, self.output_compression)
+
+    @property
+    def error_text(self) -> Optional[str]:
+        return decompress_text(self.error_message, self.error_compression)
+
+    def __repr__(self):
+        return f"<JobRunOutput(run_id={self.run_id})>"
+
+
+class JobRunOutputSegment(Base):
+    """
+    One appended, compressed chunk of a run's uploaded log.
+
+    Segments are keyed by their byte offset in the uncompressed log, so a
+    byte range can be served by reading only the segments that overlap it.
+    The primary key also rejects two uploads appending at the same offset.
+    """
+    __tablename__ = "job_run_output_segment"
+
+    run_id = Column(Integer, primary_key=True)  # job_run.id (no foreign key, see JobRunOutput)
+    byte_offset = Column(BigInteger, primary_key=True)  # offset in the uncompressed log
+    byte_length = Column(Integer, nullable=False)  # uncompressed length
+
+    data = Column(LargeBinary, nullable=False)
+    compression = Column(String(16), nullable=False, default=COMPRESSION_NONE)
+
+    def __repr__(self):
+        return f"<JobRunOutputSegment(run_id={self.run_id}, byte_offset={self.byte_offset})>"
@@ -0,0 +1,115 @@
+"""
+Hourly job run rollups.
+
+Dashboards aggregate up to a year of runs. Rather than rescanning job_run
+on every load, each inserted run is also counted into an hourly rollup
+row keyed by (tenant, namespace, job_name, endpoint_id, hour), which is
+orders of magnitude smaller than the raw table.
+
+Key columns are NOT NULL so they can form a primary key (and an upsert
+conflict target): runs without a namespace are stored with namespace ''
+and runs without an endpoint with endpoint_id 0.
+
+Durations are summarized twice: exact count/sum/sum of squares/min/max
+on the rollup row, and a log-bucketed histogram (sketch) in
+job_run_rollup_duration for approximate percentiles. Both merge by
+addition, so any set of hours can be combined. See services/rollups.py.
+
+Check-ins do not update rollups themselves: each inserted run is queued
+in job_run_rollup_pending, and a background compactor folds queued runs
+into the rollups in batches.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Enum as SQLEnum, Index, Integer, String
+
+from crontopus_api.config import Base
+from crontopus_api.models.job_run import JobStatus
+
+
+class JobRunRollupHourly(Base):
+    """
+    Run counts and duration summary for one job on one endpoint in one hour.
+    """
+    __tablename__ = "job_run_rollup_hourly"
+    
+    tenant_id = Column(String, primary_key=True)
+    namespace = Column(String(255), primary_key=True)  # '' when the run has no namespace
+    job_name = Column(String(255), primary_key=True)
+    endpoint_id = Column(Integer, primary_key=True)  # 0 when the run has no endpoint
+    hour = Column(DateTime(timezone=True), primary_key=True)  # UTC, truncated to the hour
+    
+    # Counts by status
+    run_count = Column(Integer, nullable=False, default=0)
+    running_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+    timeout_count = Column(Integer, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+    
+    # Duration summary (seconds) over runs that reported a duration
+    duration_count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(BigInteger, nullable=False, default=0)
+    duration_sum_squares = Column(BigInteger, nullable=True, default=0)  # for the standard deviation; NULL if unknown (hours rolled up before it was added)
+    duration_min = Column(Integer, nullable=True)
+    duration_max = Column(Integer, nullable=True)
+    
+    __table_args__ = (
+        # Dashboard queries scan one tenant's hours
+        Index("ix_job_run_rollup_hourly_tenant_hour", "tenant_id", "hour"),
+    )
+    
+    def __repr__(self):
+        return f"<JobRunRollupHourly(tenant_id={self.tenant_id}, job_name={self.job_name}, hour={self.hour}, run_count={self.run_count})>"
+
+
+class JobRunRollupDuration(Base):
+    """
+    Duration histogram bucket for a rollup row.
+    
+    Buckets grow geometrically, so percentiles estimated from them have a
+    bounded relative error (see services.rollups.duration_bucket()).
+    """
+    __tablename__ = "job_run_rollup_duration"
+    
+    tenant_id = Column(String, primary_key=True)
+    namespace = Column(String(255), primary_key=True)
+    job_name = Column(String(255), primary_key=True)
+    endpoint_id = Column(Integer, primary_key=True)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    
+    count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        Index("ix_job_run_rollup_duration_tenant_hour", "tenant_id", "hour"),
+    )
+    
+    def __repr__(self):
+        return f"<JobRunRollupDuration(tenant_id={self.tenant_id}, job_name={self.job_name}, hour={self.hour}, bucket={self.bucket})>"
+
+
+class JobRunRollupPending(Base):
+    """
+    Run not yet counted into its hourly rollup.
+    
+    Key columns are normalized like the rollup's ('' namespace, endpoint
+    0, hour). The compactor deletes rows as it adds them to the rollups.
+    """
+    __tablename__ = "job_run_rollup_pending"
+    
+    id = Column(Integer, primary_key=True)  # queue order
+    run_id = Column(Integer, nullable=False)  # job_run.id (no foreign key: runs may be deleted first)
+    tenant_id = Column(String, nullable=False)
+    namespace = Column(String(255), nullable=False)
+    job_name = Column(String(255), nullable=False)
+    endpoint_id = Column(Integer, nullable=False)
+    hour = Column(DateTime(timezone=True), nullable=False)
+    status = Column(SQLEnum(JobStatus), nullable=False)
+    duration = Column(Integer, nullable=True)
+    
+    __table_args__ = (
+        # rebuild_rollups() joins runs to their pending rows
+        Index("ix_job_run_rollup_pending_run_id", "run_id"),
+    )
+    
+    def __repr__(self):
+        return f"<JobRunRollupPending(id={self.id}, run_id={self.run_id}, job_name={self.job_name})>"
@@ -0,0 +1,38 @@
+"""
+Run retention policy model.
+
+A policy limits how much run history a tenant keeps: runs older than
+retention_days are deleted, and so are runs beyond the newest keep_last
+of each job. Either rule may be unset.
+
+One policy per tenant applies to every namespace (stored with namespace
+''); a policy for a specific namespace replaces it for that namespace.
+Policies are applied in the background by services/retention.py.
+"""
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+
+from crontopus_api.models.base import TenantScopedBase
+
+
+class RunRetentionPolicy(TenantScopedBase):
+    """
+    Retention rules for a tenant's runs, optionally scoped to a namespace.
+    """
+    __tablename__ = "run_retention_policy"
+    
+    namespace = Column(String(255), nullable=False, default="")  # '' = every namespace without its own policy
+    
+    # Rules (None disables the rule)
+    retention_days = Column(Integer, nullable=True)  # Delete runs that started longer ago
+    keep_last = Column(Integer, nullable=True)  # Keep only the newest N runs per job
+    
+    # Progress of the last pass that applied this policy
+    last_applied_at = Column(DateTime(timezone=True), nullable=True)
+    last_deleted_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "namespace", name="uq_run_retention_policy_tenant_namespace"),
+    )
+    
+    def __repr__(self):
+        return f"<RunRetentionPolicy(id={self.id}, tenant_id={self.tenant_id}, namespace={self.namespace!r}, retention_days={self.retention_days}, keep_last={self.keep_last})>"
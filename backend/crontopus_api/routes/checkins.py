@@ -4,27 +4,188 @@ Check-in and run history routes.
 Jobs report execution results via check-ins.
 Run history is queried by authenticated users.
 """
-from typing import Optional, List
+import csv
+import io
+import math
+from collections import defaultdict
+from itertools import groupby
+from typing import AsyncIterator, Iterable, Iterator, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Header
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, case
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import BigInteger, Float, func, desc, case, cast, literal, select, tuple_, type_coerce
+from sqlalchemy.dialects import postgresql
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from crontopus_api.config import get_db
-from crontopus_api.models import JobRun, JobStatus, User, Endpoint
+from crontopus_api.config import get_db, get_async_db
+from crontopus_api.models import JobLastStatus, JobRun, JobRunOutput, JobRunRollupDuration, JobRunRollupHourly, JobStatus, User, Endpoint
+from crontopus_api.models.job_run_output import COMPRESSION_NONE, decompress_text
 from crontopus_api.schemas.checkin import (
     CheckinRequest,
+    CountStrategy,
+    ExportFormat,
+    HistogramBucketSize,
     CheckinResponse,
+    CheckinQueuedResponse,
     JobRunResponse,
     JobRunListResponse,
-    AgentCheckinRequest
+    JobRunSearchResponse,
+    JobRunSearchResult,
+    JobRunSummary,
+    RunView,
+    AgentCheckinRequest,
+    AgentCheckinBatchRequest,
+    AgentCheckinBatchResponse,
+    BatchCheckinResult,
+    RunOutputUploadResponse,
+    RunImportRecord,
+    RunImportError,
+    RunImportResponse
 )
 from crontopus_api.security.dependencies import get_current_user
-from crontopus_api.security.password import verify_password
+from crontopus_api.security.endpoint_tokens import verify_endpoint_token
+from crontopus_api.services.endpoint_cache import EndpointInfo, get_endpoint_info, get_endpoint_infos
+from crontopus_api.services.ingestion import ingestion_queue, buffered_ingestion_enabled, QueueFull
+from crontopus_api.services.runs import (
+    find_idempotent_runs,
+    insert_runs,
+    run_row_from_agent_checkin,
+    run_row_from_checkin,
+    run_row_from_import
+)
+from crontopus_api.services.bulk_load import DEFAULT_BATCH_SIZE, copy_runs
+from crontopus_api.services.rollups import STATUS_COLUMNS, histogram_percentiles, rollup_hour
+from crontopus_api.services import archive
+from crontopus_api.services.run_search import search_runs, snippet
+from crontopus_api.services.view_cache import cache_run_view, cached_run_view, run_view_etag
+from crontopus_api.utils.estimates import estimate_row_count
+from crontopus_api.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from crontopus_api.services.run_output import (
+    InvalidRange,
+    OutputTooLarge,
+    append_output,
+    iter_output,
+    output_size,
+    parse_range
+)
 from fastapi_limiter.depends import RateLimiter
+import logging
 
 router = APIRouter(tags=["checkins", "runs"])
+logger = logging.getLogger(__name__)
+
+# JobRun columns returned by view=summary
+SUMMARY_FIELDS = tuple(JobRunSummary.model_fields)
+
+# Rows fetched per round trip of the export's server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Bulk import limits
+IMPORT_MAX_LINE_BYTES = 4 * 1024 * 1024
+IMPORT_MAX_ERRORS = 20  # rejected lines reported in the response
+
+
+async def _authenticate_endpoint(endpoint: EndpointInfo, token: Optional[str]) -> None:
+    """
+    Validate an endpoint token against the endpoint's stored token_hash.
+    
+    Token validation is optional for backward compatibility until all
+    agents upgrade (v0.1.15+); a missing token is logged and allowed.
+    
+    Raises:
+        HTTPException: 403 if the endpoint is revoked,
+            401 if a token is given but cannot be verified
+    """
+    if endpoint.is_revoked:
+        logger.warning(f"Check-in from revoked endpoint {endpoint.id}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Endpoint has been revoked"
+        )
+    
+    if token is None:
+        # Backward compatibility: allow check-ins without token for now
+        # TODO: Make token required in future version (Phase 17.1 final step)
+        logger.warning(f"Check-in from endpoint {endpoint.id} without token (deprecated)")
+        return
+    
+    # Verify token against stored hash
+    if not endpoint.token_hash:
+        logger.warning(f"Endpoint {endpoint.id} has no token_hash stored")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Endpoint authentication not configured"
+        )
+    
+    if not await verify_endpoint_token(endpoint.id, token, endpoint.token_hash):
+        logger.warning(f"Invalid token provided for endpoint {endpoint.id}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid endpoint token"
+        )
+    
+    logger.debug(f"Endpoint {endpoint.id} authenticated successfully")
+
+
+def _enqueue_run(row: dict) -> Optional[JSONResponse]:
+    """
+    Queue a run for group commit when buffered ingestion is enabled.
+    
+    Returns a 202 response with the provisional ID, or None if the run
+    must be written synchronously (buffered mode off or buffer full).
+    """
+    if not buffered_ingestion_enabled():
+        return None
+    try:
+        provisional_id = ingestion_queue.enqueue(row)
+    except QueueFull:
+        logger.warning("Ingestion buffer full, writing check-in synchronously")
+        return None
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=CheckinQueuedResponse(provisional_id=provisional_id).model_dump()
+    )
+
+
+async def _write_runs(db: AsyncSession, rows: List[dict]) -> List[int]:
+    """
+    Insert and commit runs, returning their IDs in row order.
+    
+    If a concurrent retry records the same idempotency key first, the
+    insert is retried once so the row resolves to that run.
+    """
+    try:
+        run_ids = await db.run_sync(insert_runs, rows)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        run_ids = await db.run_sync(insert_runs, rows)
+        await db.commit()
+    return run_ids
+
+
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """
+    Extract the token from an optional Authorization header.
+    
+    Raises:
+        HTTPException: 401 if the header is present but malformed
+    """
+    if not authorization:
+        return None
+    
+    if not authorization.startswith("Bearer "):
+        logger.warning("Invalid Authorization header format on check-in")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid Authorization header format. Expected: Bearer <token>"
+        )
+    
+    return authorization[7:]  # Remove "Bearer " prefix
 
 
 @router.post("/runs/check-in", response_model=CheckinResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RateLimiter(times=100, seconds=60))])
@@ -32,7 +193,8 @@ async def agent_checkin(
     request: Request,
     checkin_data: AgentCheckinRequest,
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=250),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Simplified check-in endpoint for agent callback scripts.
@@ -44,106 +206,147 @@ async def agent_checkin(
     - Requires Authorization: Bearer <endpoint_token> header
     - Token is validated against endpoint's stored token_hash
     - For backward compatibility, token validation is optional until all agents upgrade (v0.1.15+)
-    """
-    from datetime import datetime, timezone
-    from crontopus_api.models import Endpoint
-    import logging
-    logger = logging.getLogger(__name__)
     
+    Idempotency:
+    - Send an Idempotency-Key header (or idempotency_key field) to make
+      retries safe; a replayed key returns the original run_id
+    
+    In buffered ingestion mode the run is queued and 202 Accepted is
+    returned with a provisional_id instead of the run_id.
+    """
     # Verify endpoint exists and get tenant_id
-    endpoint = db.query(Endpoint).filter(Endpoint.id == checkin_data.endpoint_id).first()
+    endpoint = await get_endpoint_info(db, checkin_data.endpoint_id)
     if not endpoint:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Endpoint not found"
         )
     
-    # Validate endpoint token (optional for backward compatibility)
-    if authorization:
-        # Extract token from Authorization header
-        if not authorization.startswith("Bearer "):
-            logger.warning(f"Invalid Authorization header format for endpoint {endpoint.id}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid Authorization header format. Expected: Bearer <token>"
-            )
-        
-        token = authorization[7:]  # Remove "Bearer " prefix
-        
-        # Verify token against stored hash
-        if not endpoint.token_hash:
-            logger.warning(f"Endpoint {endpoint.id} has no token_hash stored")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Endpoint authentication not configured"
-            )
-        
-        if not verify_password(token, endpoint.token_hash):
-            logger.warning(f"Invalid token provided for endpoint {endpoint.id}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid endpoint token"
-            )
-        
-        logger.debug(f"Endpoint {endpoint.id} authenticated successfully")
-    else:
-        # Backward compatibility: allow check-ins without token for now
-        # TODO: Make token required in future version (Phase 17.1 final step)
-        logger.warning(f"Check-in from endpoint {endpoint.id} without token (deprecated)")
+    await _authenticate_endpoint(endpoint, _bearer_token(authorization))
     
     # Create job run record with captured data
     now = datetime.now(timezone.utc)
-    job_run = JobRun(
-        tenant_id=endpoint.tenant_id,
-        job_name=checkin_data.job_name,
-        namespace=checkin_data.namespace,
-        status=checkin_data.to_job_status(),  # Convert string to enum
-        started_at=now,
-        finished_at=now,
-        endpoint_id=checkin_data.endpoint_id,
-        exit_code=checkin_data.exit_code,
-        duration=checkin_data.duration,
-        output=checkin_data.output,
-        error_message=checkin_data.error_message
-    )
+    row = run_row_from_agent_checkin(checkin_data, endpoint.tenant_id, now)
+    if idempotency_key:
+        row["idempotency_key"] = idempotency_key
     
-    db.add(job_run)
-    db.commit()
-    db.refresh(job_run)
+    if row["idempotency_key"] and buffered_ingestion_enabled():
+        # Answer replays before queueing (the flusher also dedupes)
+        replayed = await db.run_sync(find_idempotent_runs, [row])
+        if replayed:
+            return CheckinResponse(run_id=next(iter(replayed.values())))
+    
+    queued = _enqueue_run(row)
+    if queued:
+        return queued
     
-    return CheckinResponse(run_id=job_run.id)
+    run_ids = await _write_runs(db, [row])
+    
+    return CheckinResponse(run_id=run_ids[0])
+
+
+@router.post("/runs/check-in/batch", response_model=AgentCheckinBatchResponse, dependencies=[Depends(RateLimiter(times=100, seconds=60))])
+async def agent_checkin_batch(
+    request: Request,
+    batch: AgentCheckinBatchRequest,
+    authorization: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=250),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Record many agent check-ins in one request.
+    
+    Used by agents on busy hosts and when replaying a spool after an outage.
+    All accepted items are written with a single multi-row INSERT.
+    
+    Authentication:
+    - Items may belong to different endpoints
+    - Each endpoint is authorized by its entry in endpoint_tokens, falling
+      back to the Authorization: Bearer <endpoint_token> header
+    - Items for endpoints that fail authorization are rejected individually
+    
+    Idempotency:
+    - Items may carry their own idempotency_key
+    - An Idempotency-Key header keys the remaining items by position
+      ("<key>:<index>"), so resending the same batch is safe
+    - Replayed items return the original run_id
+    
+    Returns one result per item, in request order.
+    """
+    header_token = _bearer_token(authorization)
+    endpoint_tokens = batch.endpoint_tokens or {}
+    
+    # Load all referenced endpoints (cache misses in one query)
+    endpoint_ids = {item.endpoint_id for item in batch.checkins}
+    endpoints = await get_endpoint_infos(db, endpoint_ids)
+    
+    # Authenticate each endpoint once
+    endpoint_errors = {}
+    for endpoint_id in endpoint_ids:
+        endpoint = endpoints.get(endpoint_id)
+        if not endpoint:
+            endpoint_errors[endpoint_id] = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Endpoint not found"
+            )
+            continue
+        try:
+            await _authenticate_endpoint(endpoint, endpoint_tokens.get(endpoint_id, header_token))
+        except HTTPException as e:
+            endpoint_errors[endpoint_id] = e
+    
+    now = datetime.now(timezone.utc)
+    results = []
+    rows = []
+    accepted = []
+    for index, item in enumerate(batch.checkins):
+        error = endpoint_errors.get(item.endpoint_id)
+        if error:
+            results.append(BatchCheckinResult(index=index, status_code=error.status_code, detail=error.detail))
+            continue
+        result = BatchCheckinResult(index=index, status_code=status.HTTP_201_CREATED)
+        results.append(result)
+        accepted.append(result)
+        row = run_row_from_agent_checkin(item, endpoints[item.endpoint_id].tenant_id, now)
+        if row["idempotency_key"] is None and idempotency_key:
+            row["idempotency_key"] = f"{idempotency_key}:{index}"
+        rows.append(row)
+    
+    run_ids = await _write_runs(db, rows)
+    
+    for result, run_id in zip(accepted, run_ids):
+        result.run_id = run_id
+    
+    return AgentCheckinBatchResponse(
+        results=results,
+        accepted=len(accepted),
+        rejected=len(results) - len(accepted)
+    )
 
 
 @router.post("/checkins", response_model=CheckinResponse, status_code=status.HTTP_201_CREATED)
 async def create_checkin(
     checkin_data: CheckinRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Record a job check-in (legacy endpoint).
     
     Jobs call this endpoint to report execution results.
     Authentication is handled via tenant validation.
+    
+    In buffered ingestion mode the run is queued and 202 Accepted is
+    returned with a provisional_id instead of the run_id.
     """
-    # Create job run record
-    job_run = JobRun(
-        tenant_id=checkin_data.tenant,
-        job_name=checkin_data.job_name,
-        status=checkin_data.status,
-        started_at=checkin_data.started_at,
-        finished_at=checkin_data.finished_at,
-        duration=checkin_data.duration,
-        output=checkin_data.output,
-        error_message=checkin_data.error_message,
-        exit_code=checkin_data.exit_code,
-        agent_id=checkin_data.agent_id
-    )
+    row = run_row_from_checkin(checkin_data)
+    queued = _enqueue_run(row)
+    if queued:
+        return queued
     
-    db.add(job_run)
-    db.commit()
-    db.refresh(job_run)
+    run_ids = await db.run_sync(insert_runs, [row])
+    await db.commit()
     
-    return CheckinResponse(run_id=job_run.id)
+    return CheckinResponse(run_id=run_ids[0])
 
 
 # Response models for aggregated views
@@ -180,6 +383,81 @@ class EndpointAggregationListResponse(BaseModel):
     total: int
 
 
+class DurationStats(BaseModel):
+    job_name: str
+    namespace: str
+    run_count: int  # runs that reported a duration
+    mean: float
+    stddev: Optional[float]  # population standard deviation (None if unknown for part of the window)
+    min: int
+    max: int
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+
+
+class DurationStatsListResponse(BaseModel):
+    jobs: List[DurationStats]
+    total: int
+    approximate: bool  # percentiles estimated from the rollup histograms
+
+
+class HistogramBucket(BaseModel):
+    start: datetime  # UTC, inclusive
+    run_count: int
+    running_count: int
+    success_count: int
+    failure_count: int
+    timeout_count: int
+    cancelled_count: int
+
+
+class JobLatestRun(BaseModel):
+    job_name: str
+    namespace: str
+    endpoint_id: Optional[int]
+    last_run_id: int
+    status: JobStatus
+    started_at: datetime
+    finished_at: Optional[datetime]
+    consecutive_failures: int
+
+
+class JobLatestRunListResponse(BaseModel):
+    jobs: List[JobLatestRun]
+    total: int
+
+
+class RunHistogramResponse(BaseModel):
+    bucket: HistogramBucketSize
+    buckets: List[HistogramBucket]  # oldest first, empty buckets included
+
+
+# Aggregations over windows longer than this read the hourly rollups
+# instead of scanning job_run (hour granularity at the window start)
+ROLLUP_MIN_DAYS = 1
+
+
+def _rollup_count(column_status: JobStatus, status_filter: Optional[JobStatus]):
+    """Rollup counter for column_status, or 0 when filtering on another status."""
+    if status_filter is not None and status_filter != column_status:
+        return literal(0)
+    return getattr(JobRunRollupHourly, STATUS_COLUMNS[column_status])
+
+
+def _health(success_count: int, run_count: int) -> str:
+    """Classify a success rate as healthy (>= 95%), degraded (>= 70%) or warning."""
+    if run_count == 0:
+        return "warning"
+    success_rate = success_count / run_count
+    if success_rate >= 0.95:
+        return "healthy"
+    if success_rate >= 0.70:
+        return "degraded"
+    return "warning"
+
+
 @router.get("/runs/by-job", response_model=JobAggregationListResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
 async def runs_by_job(
     request: Request,
@@ -199,35 +477,75 @@ async def runs_by_job(
     - Total run count
     - Success/failure counts
     - Health status (healthy/degraded/warning)
+    
+    Windows longer than a day are served from the hourly rollups.
+    
+    Responses carry a weak ETag; send it back in If-None-Match to get
+    304 Not Modified while the tenant's runs are unchanged.
     """
+    etag = run_view_etag(db, current_user.tenant_id, request)
+    cached = cached_run_view(request, current_user.tenant_id, etag)
+    if cached is not None:
+        return cached
+    
     # Calculate time window
     since = datetime.now(timezone.utc) - timedelta(days=days)
     
-    # Base query with tenant isolation and time filter
-    query = db.query(
-        JobRun.job_name,
-        JobRun.namespace,
-        func.count(func.distinct(JobRun.endpoint_id)).label('endpoint_count'),
-        func.count(JobRun.id).label('run_count'),
-        func.sum(case((JobRun.status == JobStatus.SUCCESS, 1), else_=0)).label('success_count'),
-        func.sum(case((JobRun.status == JobStatus.FAILURE, 1), else_=0)).label('failure_count')
-    ).filter(
-        JobRun.tenant_id == current_user.tenant_id,
-        JobRun.started_at >= since
-    )
-    
-    # Apply filters
-    if job_name:
-        query = query.filter(JobRun.job_name.ilike(f"%{job_name}%"))
-    if namespace:
-        query = query.filter(JobRun.namespace == namespace)
-    if endpoint_id:
-        query = query.filter(JobRun.endpoint_id == endpoint_id)
-    if status:
-        query = query.filter(JobRun.status == status)
+    if days > ROLLUP_MIN_DAYS:
+        rollup = JobRunRollupHourly
+        run_count = getattr(rollup, STATUS_COLUMNS[status]) if status else rollup.run_count
+        query = db.query(
+            rollup.job_name,
+            func.nullif(rollup.namespace, '').label('namespace'),
+            func.count(func.distinct(case(
+                ((rollup.endpoint_id != 0) & (run_count > 0), rollup.endpoint_id)
+            ))).label('endpoint_count'),
+            func.sum(run_count).label('run_count'),
+            func.sum(_rollup_count(JobStatus.SUCCESS, status)).label('success_count'),
+            func.sum(_rollup_count(JobStatus.FAILURE, status)).label('failure_count')
+        ).filter(
+            rollup.tenant_id == current_user.tenant_id,
+            rollup.hour >= rollup_hour(since)
+        )
+        
+        # Apply filters
+        if job_name:
+            query = query.filter(rollup.job_name.ilike(f"%{job_name}%"))
+        if namespace:
+            query = query.filter(rollup.namespace == namespace)
+        if endpoint_id:
+            query = query.filter(rollup.endpoint_id == endpoint_id)
+        if status:
+            query = query.filter(run_count > 0)
+        
+        query = query.group_by(rollup.job_name, rollup.namespace)
+    else:
+        # Base query with tenant isolation and time filter
+        query = db.query(
+            JobRun.job_name,
+            JobRun.namespace,
+            func.count(func.distinct(JobRun.endpoint_id)).label('endpoint_count'),
+            func.count(JobRun.id).label('run_count'),
+            func.sum(case((JobRun.status == JobStatus.SUCCESS, 1), else_=0)).label('success_count'),
+            func.sum(case((JobRun.status == JobStatus.FAILURE, 1), else_=0)).label('failure_count')
+        ).filter(
+            JobRun.tenant_id == current_user.tenant_id,
+            JobRun.started_at >= since
+        )
+        
+        # Apply filters
+        if job_name:
+            query = query.filter(JobRun.job_name.ilike(f"%{job_name}%"))
+        if namespace:
+            query = query.filter(JobRun.namespace == namespace)
+        if endpoint_id:
+            query = query.filter(JobRun.endpoint_id == endpoint_id)
+        if status:
+            query = query.filter(JobRun.status == status)
+        
+        # Group by job and namespace
+        query = query.group_by(JobRun.job_name, JobRun.namespace)
     
-    # Group by job and namespace
-    query = query.group_by(JobRun.job_name, JobRun.namespace)
     query = query.order_by(desc('run_count'))
     
     results = query.all()
@@ -237,19 +555,7 @@ async def runs_by_job(
     for row in results:
         success = row.success_count or 0
         failure = row.failure_count or 0
-        total = row.run_count
-        
-        # Calculate health
-        if total == 0:
-            health = "warning"
-        else:
-            success_rate = success / total
-            if success_rate >= 0.95:
-                health = "healthy"
-            elif success_rate >= 0.70:
-                health = "degraded"
-            else:
-                health = "warning"
+        health = _health(success, row.run_count)
         
         jobs.append(JobAggregation(
             job_name=row.job_name,
@@ -261,10 +567,10 @@ async def runs_by_job(
             health=health
         ))
     
-    return JobAggregationListResponse(
+    return cache_run_view(request, current_user.tenant_id, etag, JobAggregationListResponse(
         jobs=jobs,
         total=len(jobs)
-    )
+    ))
 
 
 @router.get("/runs/by-endpoint", response_model=EndpointAggregationListResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
@@ -275,6 +581,10 @@ async def runs_by_endpoint(
     hostname: Optional[str] = Query(None, description="Filter by hostname"),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     machine_id: Optional[str] = Query(None, description="Filter by machine ID"),
+    sort: str = Query("run_count", pattern="^(run_count|success_count|failure_count|name)$", description="Sort column"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of endpoints to return (default: all)"),
+    offset: int = Query(0, ge=0, description="Number of endpoints to skip"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -285,56 +595,94 @@ async def runs_by_endpoint(
     - Total run count
     - Success/failure counts
     - Health status (healthy/degraded/warning)
+    
+    Runs are aggregated per endpoint (from the hourly rollups for windows
+    longer than a day) and LEFT JOINed to the tenant's endpoints in a
+    single query, so endpoints without runs are included.
+    Sorting and pagination happen in SQL; 'total' counts all matching
+    endpoints, not just the returned page.
+    
+    Responses carry a weak ETag; send it back in If-None-Match to get
+    304 Not Modified while the tenant's runs and endpoints are unchanged.
     """
+    etag = run_view_etag(db, current_user.tenant_id, request)
+    cached = cached_run_view(request, current_user.tenant_id, etag)
+    if cached is not None:
+        return cached
+    
     # Calculate time window
     since = datetime.now(timezone.utc) - timedelta(days=days)
     
-    # Base query: get all endpoints for tenant with run stats
-    endpoint_query = db.query(Endpoint).filter(
+    # Run stats per endpoint in the time window
+    if days > ROLLUP_MIN_DAYS:
+        rollup = JobRunRollupHourly
+        run_stats = db.query(
+            rollup.endpoint_id.label('endpoint_id'),
+            func.sum(rollup.run_count).label('run_count'),
+            func.sum(rollup.success_count).label('success_count'),
+            func.sum(rollup.failure_count).label('failure_count')
+        ).filter(
+            rollup.tenant_id == current_user.tenant_id,
+            rollup.endpoint_id != 0,
+            rollup.hour >= rollup_hour(since)
+        ).group_by(rollup.endpoint_id).subquery()
+    else:
+        run_stats = db.query(
+            JobRun.endpoint_id.label('endpoint_id'),
+            func.count(JobRun.id).label('run_count'),
+            func.sum(case((JobRun.status == JobStatus.SUCCESS, 1), else_=0)).label('success_count'),
+            func.sum(case((JobRun.status == JobStatus.FAILURE, 1), else_=0)).label('failure_count')
+        ).filter(
+            JobRun.tenant_id == current_user.tenant_id,
+            JobRun.endpoint_id.isnot(None),
+            JobRun.started_at >= since
+        ).group_by(JobRun.endpoint_id).subquery()
+    
+    run_count = func.coalesce(run_stats.c.run_count, 0)
+    success_count = func.coalesce(run_stats.c.success_count, 0)
+    failure_count = func.coalesce(run_stats.c.failure_count, 0)
+    
+    # All tenant endpoints, with their stats where they have runs
+    query = db.query(
+        Endpoint,
+        run_count.label('run_count'),
+        success_count.label('success_count'),
+        failure_count.label('failure_count'),
+        func.count().over().label('total')
+    ).outerjoin(
+        run_stats, run_stats.c.endpoint_id == Endpoint.id
+    ).filter(
         Endpoint.tenant_id == current_user.tenant_id
     )
     
     # Apply endpoint filters
     if name:
-        endpoint_query = endpoint_query.filter(Endpoint.name.ilike(f"%{name}%"))
+        query = query.filter(Endpoint.name.ilike(f"%{name}%"))
     if hostname:
-        endpoint_query = endpoint_query.filter(Endpoint.hostname.ilike(f"%{hostname}%"))
+        query = query.filter(Endpoint.hostname.ilike(f"%{hostname}%"))
     if platform:
-        endpoint_query = endpoint_query.filter(Endpoint.platform.ilike(f"%{platform}%"))
+        query = query.filter(Endpoint.platform.ilike(f"%{platform}%"))
     if machine_id:
-        endpoint_query = endpoint_query.filter(Endpoint.machine_id.ilike(f"%{machine_id}%"))
+        query = query.filter(Endpoint.machine_id.ilike(f"%{machine_id}%"))
+    
+    sort_column = {
+        "run_count": run_count,
+        "success_count": success_count,
+        "failure_count": failure_count,
+        "name": Endpoint.name,
+    }[sort]
+    sort_column = sort_column.asc() if order == "asc" else sort_column.desc()
+    query = query.order_by(sort_column, Endpoint.id)
     
-    endpoints_list = endpoint_query.all()
+    if offset:
+        query = query.offset(offset)
+    if limit:
+        query = query.limit(limit)
+    
+    results = query.all()
     
-    # Get run stats for each endpoint
     endpoint_aggregations = []
-    for endpoint in endpoints_list:
-        # Query runs for this endpoint in the time window
-        run_stats = db.query(
-            func.count(JobRun.id).label('run_count'),
-            func.sum(case((JobRun.status == JobStatus.SUCCESS, 1), else_=0)).label('success_count'),
-            func.sum(case((JobRun.status == JobStatus.FAILURE, 1), else_=0)).label('failure_count')
-        ).filter(
-            JobRun.endpoint_id == endpoint.id,
-            JobRun.started_at >= since
-        ).first()
-        
-        run_count = run_stats.run_count or 0
-        success = run_stats.success_count or 0
-        failure = run_stats.failure_count or 0
-        
-        # Calculate health
-        if run_count == 0:
-            health = "warning"
-        else:
-            success_rate = success / run_count
-            if success_rate >= 0.95:
-                health = "healthy"
-            elif success_rate >= 0.70:
-                health = "degraded"
-            else:
-                health = "warning"
-        
+    for endpoint, runs, success, failure, _ in results:
         endpoint_aggregations.append(EndpointAggregation(
             id=endpoint.id,
             name=endpoint.name,
@@ -342,48 +690,389 @@ async def runs_by_endpoint(
             platform=endpoint.platform,
             machine_id=endpoint.machine_id,
             version=endpoint.version,
-            run_count=run_count,
+            run_count=runs,
             success_count=success,
             failure_count=failure,
-            health=health
+            health=_health(success, runs)
         ))
     
-    # Sort by run count descending
-    endpoint_aggregations.sort(key=lambda x: x.run_count, reverse=True)
+    if results:
+        total = results[0].total
+    elif offset:
+        # Page past the end: count separately
+        total = query.limit(None).offset(None).order_by(None).count()
+    else:
+        total = 0
     
-    return EndpointAggregationListResponse(
+    return cache_run_view(request, current_user.tenant_id, etag, EndpointAggregationListResponse(
         endpoints=endpoint_aggregations,
-        total=len(endpoint_aggregations)
+        total=total
+    ))
+
+
+# Percentiles reported by /runs/stats/durations
+DURATION_PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def _interpolated_percentiles(durations: List[int], quantiles) -> List[float]:
+    """Percentiles of sorted durations, interpolated like percentile_cont."""
+    estimates = []
+    for quantile in quantiles:
+        position = quantile * (len(durations) - 1)
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        estimates.append(durations[lower] + (durations[upper] - durations[lower]) * (position - lower))
+    return estimates
+
+
+def _duration_stats(
+    job_name: str,
+    namespace: Optional[str],
+    count: int,
+    total: int,
+    sum_squares: Optional[int],
+    minimum: int,
+    maximum: int,
+    percentiles: List[float]
+) -> DurationStats:
+    p50, p90, p95, p99 = percentiles
+    # Exact in integers; a negative variance means inconsistent rollups
+    variance = None if sum_squares is None else (count * sum_squares - total * total) / (count * count)
+    return DurationStats(
+        job_name=job_name,
+        namespace=namespace or "default",
+        run_count=count,
+        mean=total / count,
+        stddev=math.sqrt(variance) if variance is not None and variance >= 0 else None,
+        min=minimum,
+        max=maximum,
+        p50=p50,
+        p90=p90,
+        p95=p95,
+        p99=p99
     )
 
 
-@router.get("/runs", response_model=JobRunListResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
-async def list_runs(
+def _run_duration_stats(
+    db: Session,
+    tenant_id: str,
+    since: datetime,
+    job_name: Optional[str],
+    namespace: Optional[str],
+    endpoint_id: Optional[int]
+) -> List[DurationStats]:
+    """Exact duration statistics per job, computed from job_run."""
+    query = db.query(JobRun.job_name, JobRun.namespace).filter(
+        JobRun.tenant_id == tenant_id,
+        JobRun.started_at >= since,
+        JobRun.duration.isnot(None)
+    )
+    query = _apply_run_filters(query, job_name, namespace, endpoint_id)
+    
+    if db.get_bind().dialect.name == "postgresql":
+        rows = query.add_columns(
+            func.count(JobRun.duration).label('count'),
+            func.sum(JobRun.duration).label('total'),
+            func.sum(cast(JobRun.duration, BigInteger) * JobRun.duration).label('sum_squares'),
+            func.min(JobRun.duration).label('min'),
+            func.max(JobRun.duration).label('max'),
+            type_coerce(
+                func.percentile_cont(postgresql.array(DURATION_PERCENTILES)).within_group(JobRun.duration),
+                postgresql.ARRAY(Float)
+            ).label('percentiles')
+        ).group_by(JobRun.job_name, JobRun.namespace).all()
+        return [
+            _duration_stats(
+                row.job_name, row.namespace, row.count, int(row.total), int(row.sum_squares),
+                row.min, row.max, row.percentiles
+            )
+            for row in rows
+        ]
+    
+    # No percentile_cont elsewhere: sort each job's durations here (the
+    # window is at most ROLLUP_MIN_DAYS long)
+    rows = query.add_columns(JobRun.duration).order_by(JobRun.job_name, JobRun.namespace, JobRun.duration)
+    stats = []
+    for (job, job_namespace), group in groupby(rows, key=lambda row: (row.job_name, row.namespace)):
+        durations = [row.duration for row in group]
+        stats.append(_duration_stats(
+            job, job_namespace, len(durations), sum(durations), sum(d * d for d in durations),
+            durations[0], durations[-1], _interpolated_percentiles(durations, DURATION_PERCENTILES)
+        ))
+    return stats
+
+
+def _rollup_duration_stats(
+    db: Session,
+    tenant_id: str,
+    since: datetime,
+    job_name: Optional[str],
+    namespace: Optional[str],
+    endpoint_id: Optional[int]
+) -> List[DurationStats]:
+    """Duration statistics per job, merged from the hourly rollups."""
+    def filters(model):
+        conditions = [model.tenant_id == tenant_id, model.hour >= rollup_hour(since)]
+        if job_name:
+            conditions.append(model.job_name.ilike(f"%{job_name}%"))
+        if namespace:
+            conditions.append(model.namespace == namespace)
+        if endpoint_id:
+            conditions.append(model.endpoint_id == endpoint_id)
+        return conditions
+    
+    rollup = JobRunRollupHourly
+    rows = db.query(
+        rollup.job_name,
+        rollup.namespace,
+        func.sum(rollup.duration_count).label('count'),
+        func.sum(rollup.duration_sum).label('total'),
+        func.sum(rollup.duration_sum_squares).label('sum_squares'),
+        # Durations in hours without a sum of squares (see the migration adding it)
+        func.sum(case((rollup.duration_sum_squares.is_(None), rollup.duration_count), else_=0)).label('unknown'),
+        func.min(rollup.duration_min).label('min'),
+        func.max(rollup.duration_max).label('max')
+    ).filter(*filters(rollup)).group_by(
+        rollup.job_name, rollup.namespace
+    ).having(func.sum(rollup.duration_count) > 0).all()
+    
+    # Merge each job's duration histograms across hours and endpoints
+    buckets = JobRunRollupDuration
+    histograms = defaultdict(list)
+    for row in db.query(
+        buckets.job_name,
+        buckets.namespace,
+        buckets.bucket,
+        func.sum(buckets.count).label('count')
+    ).filter(*filters(buckets)).group_by(
+        buckets.job_name, buckets.namespace, buckets.bucket
+    ).order_by(buckets.bucket):
+        histograms[(row.job_name, row.namespace)].append((row.bucket, row.count))
+    
+    stats = []
+    for row in rows:
+        percentiles = histogram_percentiles(histograms[(row.job_name, row.namespace)], DURATION_PERCENTILES)
+        # Bucket upper bounds can overshoot the exact extremes
+        percentiles = [min(max(value, row.min), row.max) for value in percentiles]
+        sum_squares = None if row.unknown else int(row.sum_squares)
+        stats.append(_duration_stats(
+            row.job_name, row.namespace, row.count, int(row.total), sum_squares,
+            row.min, row.max, percentiles
+        ))
+    return stats
+
+
+@router.get("/runs/stats/durations", response_model=DurationStatsListResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
+async def run_duration_stats(
     request: Request,
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of runs to return"),
+    days: int = Query(7, ge=1, le=365, description="Days to look back"),
+    job_name: Optional[str] = Query(None, description="Filter by job name"),
+    namespace: Optional[str] = Query(None, description="Filter by namespace"),
+    endpoint_id: Optional[int] = Query(None, description="Filter by endpoint ID"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get run duration distributions grouped by job.
+    
+    For each job with runs that reported a duration, returns the run
+    count, mean, standard deviation, min, max and p50/p90/p95/p99, in
+    seconds. Jobs with the most runs come first.
+    
+    Windows of up to a day are computed exactly from job_run. Longer
+    windows are served from the hourly rollups: mean, stddev, min and
+    max stay exact, while percentiles are estimated from the rollup
+    duration histograms (within about 10%) and 'approximate' is true.
+    stddev is null when the window includes hours rolled up before
+    sums of squares were recorded whose runs are gone.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    approximate = days > ROLLUP_MIN_DAYS
+    
+    compute = _rollup_duration_stats if approximate else _run_duration_stats
+    jobs = compute(db, current_user.tenant_id, since, job_name, namespace, endpoint_id)
+    jobs.sort(key=lambda job: job.run_count, reverse=True)
+    
+    return DurationStatsListResponse(
+        jobs=jobs,
+        total=len(jobs),
+        approximate=approximate
+    )
+
+
+@router.get("/runs/latest", response_model=JobLatestRunListResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
+async def latest_runs(
+    request: Request,
+    job_name: Optional[str] = Query(None, description="Filter by job name"),
+    namespace: Optional[str] = Query(None, description="Filter by namespace"),
+    endpoint_id: Optional[int] = Query(None, description="Filter by endpoint ID"),
+    status: Optional[JobStatus] = Query(None, description="Filter by status of the latest run"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the latest run of every job on every endpoint.
+    
+    Reads job_last_status, which check-ins keep up to date, so the cost
+    depends on the number of jobs rather than the number of runs. Each
+    entry carries the number of consecutive failed or timed-out runs
+    since the job last succeeded.
+    
+    Entries are ordered by namespace, job name and endpoint.
+    """
+    query = db.query(JobLastStatus).filter(JobLastStatus.tenant_id == current_user.tenant_id)
+    
+    # Apply filters
+    if job_name:
+        query = query.filter(JobLastStatus.job_name.ilike(f"%{job_name}%"))
+    if namespace:
+        query = query.filter(JobLastStatus.namespace == namespace)
+    if endpoint_id:
+        query = query.filter(JobLastStatus.endpoint_id == endpoint_id)
+    if status:
+        query = query.filter(JobLastStatus.status == status)
+    
+    rows = query.order_by(
+        JobLastStatus.namespace,
+        JobLastStatus.job_name,
+        JobLastStatus.endpoint_id
+    ).all()
+    
+    jobs = [
+        JobLatestRun(
+            job_name=row.job_name,
+            namespace=row.namespace or "default",
+            endpoint_id=row.endpoint_id or None,
+            last_run_id=row.last_run_id,
+            status=row.status,
+            started_at=row.started_at,
+            finished_at=row.finished_at,
+            consecutive_failures=row.consecutive_failures
+        )
+        for row in rows
+    ]
+    
+    return JobLatestRunListResponse(
+        jobs=jobs,
+        total=len(jobs)
+    )
+
+
+# Largest histogram /runs/histogram returns (5m buckets cover about 34 days)
+HISTOGRAM_MAX_BUCKETS = 10000
+
+
+def _epoch_bucket(db: Session, column, seconds: int):
+    """SQL expression numbering the seconds-wide UTC bucket a timestamp falls in."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.floor(func.extract('epoch', column) / seconds), BigInteger)
+    return cast(func.strftime('%s', column), BigInteger) // seconds
+
+
+def _histogram_range(since: datetime, until: datetime, seconds: int) -> Tuple[int, int]:
+    """
+    Numbers of the first and last histogram buckets of a window.
+    
+    Raises:
+        HTTPException: 400 if the window has more than HISTOGRAM_MAX_BUCKETS buckets
+    """
+    first = int(since.timestamp()) // seconds
+    last = int(until.timestamp()) // seconds
+    if last - first + 1 > HISTOGRAM_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window has more than {HISTOGRAM_MAX_BUCKETS} buckets; use a wider bucket or fewer days"
+        )
+    return first, last
+
+
+@router.get("/runs/histogram", response_model=RunHistogramResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
+async def runs_histogram(
+    request: Request,
+    bucket: HistogramBucketSize = Query(HistogramBucketSize.HOUR, description="Bucket width: 5m, 1h or 1d"),
+    days: int = Query(1, ge=1, le=365, description="Days to look back"),
     job_name: Optional[str] = Query(None, description="Filter by job name"),
     namespace: Optional[str] = Query(None, description="Filter by namespace"),
     endpoint_id: Optional[int] = Query(None, description="Filter by endpoint ID"),
     status: Optional[JobStatus] = Query(None, description="Filter by status"),
-    days: Optional[int] = Query(None, ge=1, le=365, description="Days to look back"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    List job run history for the current tenant.
+    Get run counts by status per time bucket.
     
-    Supports filtering by job name, namespace, endpoint, status, and time window.
-    Returns up to 'limit' most recent runs (default 100).
+    Buckets are aligned to UTC (days start at midnight UTC) and cover the
+    window from 'days' ago to now, oldest first; buckets without runs are
+    included with zero counts. Takes the same filters as GET /runs.
+    
+    Hour and day buckets over windows longer than a day are served from
+    the hourly rollups; 5-minute buckets always read job_run. Returns 400
+    if the window holds more than HISTOGRAM_MAX_BUCKETS buckets.
     """
-    # Base query with tenant isolation
-    query = db.query(JobRun).filter(JobRun.tenant_id == current_user.tenant_id)
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=days)
+    seconds = bucket.seconds
+    first, last = _histogram_range(since, now, seconds)
+    
+    if bucket != HistogramBucketSize.FIVE_MINUTES and days > ROLLUP_MIN_DAYS:
+        rollup = JobRunRollupHourly
+        bucket_number = _epoch_bucket(db, rollup.hour, seconds).label('bucket')
+        run_count = getattr(rollup, STATUS_COLUMNS[status]) if status else rollup.run_count
+        query = db.query(
+            bucket_number,
+            func.sum(run_count).label('run_count'),
+            *(func.sum(_rollup_count(run_status, status)).label(column) for run_status, column in STATUS_COLUMNS.items())
+        ).filter(
+            rollup.tenant_id == current_user.tenant_id,
+            rollup.hour >= rollup_hour(since)
+        )
+        
+        # Apply filters
+        if job_name:
+            query = query.filter(rollup.job_name.ilike(f"%{job_name}%"))
+        if namespace:
+            query = query.filter(rollup.namespace == namespace)
+        if endpoint_id:
+            query = query.filter(rollup.endpoint_id == endpoint_id)
+    else:
+        bucket_number = _epoch_bucket(db, JobRun.started_at, seconds).label('bucket')
+        query = db.query(
+            bucket_number,
+            func.count(JobRun.id).label('run_count'),
+            *(func.sum(case((JobRun.status == run_status, 1), else_=0)).label(column) for run_status, column in STATUS_COLUMNS.items())
+        ).filter(
+            JobRun.tenant_id == current_user.tenant_id,
+            JobRun.started_at >= since
+        )
+        query = _apply_run_filters(query, job_name, namespace, endpoint_id, status)
+    
+    counts = {int(row.bucket): row for row in query.group_by(bucket_number).all()}
+    
+    buckets = []
+    for number in range(first, last + 1):
+        row = counts.get(number)
+        buckets.append(HistogramBucket(
+            start=datetime.fromtimestamp(number * seconds, tz=timezone.utc),
+            run_count=int(row.run_count or 0) if row else 0,
+            **{column: int(getattr(row, column) or 0) if row else 0 for column in STATUS_COLUMNS.values()}
+        ))
     
-    # Apply time filter if specified
+    return RunHistogramResponse(bucket=bucket, buckets=buckets)
+
+
+def _apply_run_filters(
+    query,
+    job_name: Optional[str] = None,
+    namespace: Optional[str] = None,
+    endpoint_id: Optional[int] = None,
+    status: Optional[JobStatus] = None,
+    days: Optional[int] = None
+):
+    """Apply the run list filters shared by run history queries."""
     if days:
         since = datetime.now(timezone.utc) - timedelta(days=days)
         query = query.filter(JobRun.started_at >= since)
     
-    # Apply filters
     if job_name:
         query = query.filter(JobRun.job_name.ilike(f"%{job_name}%"))
     
@@ -396,17 +1085,323 @@ async def list_runs(
     if status:
         query = query.filter(JobRun.status == status)
     
-    # Get total count
-    total = query.count()
+    return query
+
+
+def _decode_run_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a run list cursor into its (started_at, id) sort key.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+@router.get("/runs", response_model=JobRunListResponse, dependencies=[Depends(RateLimiter(times=60, seconds=60))])
+async def list_runs(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of runs to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    job_name: Optional[str] = Query(None, description="Filter by job name"),
+    namespace: Optional[str] = Query(None, description="Filter by namespace"),
+    endpoint_id: Optional[int] = Query(None, description="Filter by endpoint ID"),
+    status: Optional[JobStatus] = Query(None, description="Filter by status"),
+    days: Optional[int] = Query(None, ge=1, le=365, description="Days to look back"),
+    count: CountStrategy = Query(CountStrategy.NONE, description="How to compute total: exact, estimated or none"),
+    view: RunView = Query(RunView.SUMMARY, description="summary, or full to include output and error_message"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List job run history for the current tenant.
+    
+    Supports filtering by job name, namespace, endpoint, status, and time window.
+    Returns up to 'limit' runs, most recent first (default 100).
     
-    # Apply limit (no pagination, just top N results)
-    runs = query.order_by(JobRun.started_at.desc()).limit(limit).all()
+    Pagination:
+    - Pass the returned next_cursor as 'cursor' to get the next page
+    - next_cursor is null on the last page
+    - Pages are keyset-based (started_at, id), so deep pages cost the
+      same as the first and are stable while new runs arrive
     
-    return JobRunListResponse(
-        runs=runs,
+    Totals ('count'):
+    - none (default): total is null; has_more says whether more pages exist
+    - estimated: query planner estimate, cheap at any size (exact on
+      databases without estimates)
+    - exact: COUNT(*) over every matching run, slow for large tenants
+    The response's count_strategy reports the strategy actually used.
+    
+    Views ('view'):
+    - summary (default): JobRunSummary fields only. Output is not read at
+      all, so large pages stay small; fetch a run's output with
+      GET /runs/{id}
+    - full: every field, including output and error_message. Every run's
+      output is read and decompressed, so keep pages small
+    
+    Archived runs:
+    - When the run archive is enabled, runs older than
+      run_archive_after_days live in Parquet files instead of the database
+    - Pages continue into the archive once the database has no older
+      matching runs, as long as 'days' reaches past the archive cutoff
+    
+    Conditional requests:
+    - Responses carry a weak ETag; send it back in If-None-Match to get
+      304 Not Modified while the tenant's runs are unchanged
+    - Unchanged pages are served from a short-lived cache (see
+      services/view_cache.py)
+    """
+    etag = run_view_etag(db, current_user.tenant_id, request)
+    cached = cached_run_view(request, current_user.tenant_id, etag)
+    if cached is not None:
+        return cached
+    
+    # Base query with tenant isolation
+    query = db.query(JobRun).filter(JobRun.tenant_id == current_user.tenant_id)
+    query = _apply_run_filters(query, job_name, namespace, endpoint_id, status, days)
+    include_archive = archive.window_reaches_archive(days)
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    filters = dict(job_name=job_name, namespace=namespace, endpoint_id=endpoint_id, status=status)
+    
+    total = None
+    if count == CountStrategy.ESTIMATED:
+        total = estimate_row_count(db, query)
+        if total is None:
+            count = CountStrategy.EXACT
+    if count == CountStrategy.EXACT:
+        total = query.count()
+    if total is not None and include_archive:
+        total += await run_in_threadpool(
+            archive.count_runs, current_user.tenant_id, since, **filters,
+            exclude_ids=archive.unarchived_run_ids(query)
+        )
+    
+    # Continue after the last row of the previous page
+    before = None
+    if cursor:
+        before = _decode_run_cursor(cursor)
+        query = query.filter(tuple_(JobRun.started_at, JobRun.id) < before)
+    
+    if view == RunView.SUMMARY:
+        # Only the summary columns; output_record is never loaded
+        query = query.options(load_only(*(getattr(JobRun, field) for field in SUMMARY_FIELDS)))
+    else:
+        query = query.options(selectinload(JobRun.output_record))
+    
+    # Fetch one extra row to know whether another page exists
+    runs = query.order_by(
+        JobRun.started_at.desc(),
+        JobRun.id.desc()
+    ).limit(limit + 1).all()
+    
+    # Fill the rest of the page from the archive
+    if len(runs) <= limit and include_archive:
+        archived = await run_in_threadpool(
+            archive.find_runs, current_user.tenant_id, limit + 1, since, before,
+            with_output=view == RunView.FULL, **filters
+        )
+        # A run caught mid-archive is in both; keep the job_run copy
+        hot_ids = {run.id for run in runs}
+        archived = [run for run in archived if run.id not in hot_ids]
+        runs = sorted(
+            runs + archived,
+            key=lambda run: (archive.as_utc(run.started_at), run.id),
+            reverse=True
+        )[:limit + 1]
+    
+    next_cursor = None
+    if len(runs) > limit:
+        runs = runs[:limit]
+        next_cursor = encode_cursor(runs[-1].started_at, runs[-1].id)
+    
+    run_schema = JobRunSummary if view == RunView.SUMMARY else JobRunResponse
+    return cache_run_view(request, current_user.tenant_id, etag, JobRunListResponse(
+        runs=[run_schema.model_validate(run) for run in runs],
         total=total,
-        page=1,
-        page_size=limit
+        count_strategy=count,
+        has_more=next_cursor is not None,
+        page_size=limit,
+        next_cursor=next_cursor
+    ))
+
+
+def _export_row(row, with_output: bool) -> dict:
+    """Turn a streamed run row into JobRunResponse values (output decompressed)."""
+    values = dict(row)
+    if with_output:
+        values["output"] = decompress_text(values.pop("output"), values.pop("output_compression") or COMPRESSION_NONE)
+        values["error_message"] = decompress_text(values.pop("error_message"), values.pop("error_compression") or COMPRESSION_NONE)
+    return values
+
+
+def _serialize_runs(runs: Iterable, run_schema, export_format: ExportFormat) -> bytes:
+    """Encode runs as NDJSON lines or CSV rows (no header)."""
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(run_schema.model_fields))
+        for run in runs:
+            writer.writerow(run_schema.model_validate(run).model_dump(mode="json"))
+        return buffer.getvalue().encode("utf-8")
+    
+    return b"".join(
+        run_schema.model_validate(run).model_dump_json().encode("utf-8") + b"\n"
+        for run in runs
+    )
+
+
+@router.get("/runs/export", dependencies=[Depends(RateLimiter(times=10, seconds=60))])
+async def export_runs(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="ndjson or csv"),
+    job_name: Optional[str] = Query(None, description="Filter by job name"),
+    namespace: Optional[str] = Query(None, description="Filter by namespace"),
+    endpoint_id: Optional[int] = Query(None, description="Filter by endpoint ID"),
+    status: Optional[JobStatus] = Query(None, description="Filter by status"),
+    days: Optional[int] = Query(None, ge=1, le=365, description="Days to look back (default: all runs)"),
+    view: RunView = Query(RunView.FULL, description="full, or summary to leave out output and error_message"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the tenant's run history as a file.
+    
+    Takes the same filters and views as GET /runs (though the view
+    defaults to full here), without paging: every
+    matching run is streamed in one response, so any export size uses
+    constant memory. Runs are read through a server-side cursor,
+    EXPORT_BATCH_SIZE at a time.
+    
+    Formats ('format'):
+    - ndjson (default): one JobRunResponse (or JobRunSummary) object per line
+    - csv: header row with the same fields, then one row per run
+    
+    Database runs come first, most recent first. When the run archive is
+    enabled and 'days' reaches past the archive cutoff, archived runs
+    follow, newest month first (unordered within a month).
+    """
+    with_output = view == RunView.FULL
+    run_schema = JobRunResponse if with_output else JobRunSummary
+    include_archive = archive.window_reaches_archive(days)
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    filters = dict(job_name=job_name, namespace=namespace, endpoint_id=endpoint_id, status=status)
+    
+    columns = [getattr(JobRun, field) for field in SUMMARY_FIELDS]
+    if with_output:
+        columns += [
+            JobRunOutput.output,
+            JobRunOutput.output_compression,
+            JobRunOutput.error_message,
+            JobRunOutput.error_compression,
+        ]
+    statement = select(*columns).where(JobRun.tenant_id == current_user.tenant_id)
+    if with_output:
+        statement = statement.outerjoin(JobRunOutput, JobRunOutput.run_id == JobRun.id)
+    statement = _apply_run_filters(statement, days=days, **filters).order_by(
+        JobRun.started_at.desc(),
+        JobRun.id.desc()
+    )
+    
+    def body() -> Iterator[bytes]:
+        # Runs in a worker thread while the response streams. The dependency's
+        # session is closed once the handler returns; reopen it here and
+        # release it when done.
+        try:
+            if format == ExportFormat.CSV:
+                yield ",".join(run_schema.model_fields).encode("utf-8") + b"\r\n"
+            
+            # Runs due for archiving that are still in job_run, so a run
+            # caught mid-archive is not exported twice
+            cutoff = archive.archive_cutoff()
+            unarchived = set()
+            
+            result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for chunk in result.mappings().partitions():
+                rows = [_export_row(row, with_output) for row in chunk]
+                if include_archive:
+                    unarchived.update(row["id"] for row in rows if archive.as_utc(row["started_at"]) < cutoff)
+                yield _serialize_runs(rows, run_schema, format)
+            
+            if include_archive:
+                batch = []
+                for run in archive.iter_runs(
+                    current_user.tenant_id, since, with_output=with_output,
+                    batch_size=EXPORT_BATCH_SIZE, **filters
+                ):
+                    if run.id in unarchived:
+                        continue
+                    batch.append(run)
+                    if len(batch) >= EXPORT_BATCH_SIZE:
+                        yield _serialize_runs(batch, run_schema, format)
+                        batch = []
+                if batch:
+                    yield _serialize_runs(batch, run_schema, format)
+        finally:
+            db.close()
+    
+    filename = f"runs-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.{format.value}"
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/runs/search", response_model=JobRunSearchResponse, dependencies=[Depends(RateLimiter(times=30, seconds=60))])
+async def search_run_output(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=500, description='Words to find in output and error messages ("phrase", or, -word)'),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of runs to return"),
+    offset: int = Query(0, ge=0, le=10000, description="Number of runs to skip"),
+    job_name: Optional[str] = Query(None, description="Filter by job name"),
+    namespace: Optional[str] = Query(None, description="Filter by namespace"),
+    endpoint_id: Optional[int] = Query(None, description="Filter by endpoint ID"),
+    status: Optional[JobStatus] = Query(None, description="Filter by status"),
+    days: Optional[int] = Query(None, ge=1, le=365, description="Days to look back"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search of the tenant's run output and error messages.
+    
+    Takes the same filters as GET /runs. Runs are ranked by how well they
+    match (error messages count more than output), then most recent first.
+    Each result carries a snippet of the matching text; fetch the whole
+    output with GET /runs/{id}.
+    
+    On PostgreSQL the query uses websearch syntax: "quoted phrases", 'or'
+    and -excluded words. Words match whole, case-insensitively.
+    
+    Archived runs and logs uploaded to POST /runs/{id}/output are not
+    searched.
+    """
+    query = db.query(JobRun).filter(JobRun.tenant_id == current_user.tenant_id)
+    query = _apply_run_filters(query, job_name, namespace, endpoint_id, status, days)
+    query = query.options(selectinload(JobRun.output_record))
+    
+    # Fetch one extra row to know whether another page exists
+    matches = search_runs(db, query, q, limit + 1, offset)
+    
+    results = []
+    for run, rank in matches[:limit]:
+        summary = JobRunSummary.model_validate(run).model_dump()
+        results.append(JobRunSearchResult(
+            **summary,
+            rank=rank,
+            snippet=snippet(run.error_message, q) or snippet(run.output, q)
+        ))
+    
+    return JobRunSearchResponse(
+        runs=results,
+        has_more=len(matches) > limit,
+        offset=offset,
+        limit=limit
     )
 
 
@@ -420,13 +1415,17 @@ async def get_run(
     """
     Get details of a specific job run.
     
-    Enforces tenant isolation.
+    Enforces tenant isolation. Runs moved to the run archive are read
+    from there.
     """
     run = db.query(JobRun).filter(
         JobRun.id == run_id,
         JobRun.tenant_id == current_user.tenant_id
     ).first()
     
+    if not run and archive.archive_enabled():
+        run = await run_in_threadpool(archive.get_archived_run, current_user.tenant_id, run_id)
+    
     if not run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -434,3 +1433,281 @@ async def get_run(
         )
     
     return run
+
+
+@router.post("/runs/{run_id}/output", response_model=RunOutputUploadResponse, dependencies=[Depends(RateLimiter(times=100, seconds=60))])
+async def upload_run_output(
+    request: Request,
+    run_id: int,
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Append a chunk of log output to a run.
+    
+    For logs too large for the check-in output field. The raw request body
+    is appended to the run's log; call repeatedly to upload a log in parts.
+    The body is streamed into compressed segments, so uploads of any size
+    use constant memory.
+    
+    Authentication:
+    - Requires Authorization: Bearer <endpoint_token> of the endpoint that
+      reported the run
+    
+    Returns 413 if the log would exceed run_output_max_bytes and 409 if
+    another upload to the same run is in progress.
+    """
+    token = _bearer_token(authorization)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Endpoint token required"
+        )
+    
+    result = await db.execute(
+        select(JobRun.tenant_id, JobRun.endpoint_id).where(JobRun.id == run_id)
+    )
+    run = result.first()
+    endpoint = None
+    if run and run.endpoint_id is not None:
+        endpoint = await get_endpoint_info(db, run.endpoint_id)
+    if not endpoint or endpoint.tenant_id != run.tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Run not found"
+        )
+    
+    await _authenticate_endpoint(endpoint, token)
+    
+    try:
+        received, size = await append_output(db, run_id, request.stream())
+        await db.commit()
+    except OutputTooLarge:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Run output exceeds maximum size"
+        )
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Concurrent output upload for this run"
+        )
+    
+    return RunOutputUploadResponse(run_id=run_id, bytes_received=received, size=size)
+
+
+@router.get("/runs/{run_id}/output", dependencies=[Depends(RateLimiter(times=60, seconds=60))])
+async def get_run_output(
+    request: Request,
+    run_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Download a run's log as plain text.
+    
+    Serves the uploaded log, or the check-in output if nothing was
+    uploaded. Supports single byte ranges (Range: bytes=start-end) with
+    206 Partial Content, so large logs can be paged or tailed.
+    
+    Enforces tenant isolation. Logs of runs moved to the run archive are
+    read from there.
+    """
+    result = await db.execute(
+        select(JobRun.id).where(
+            JobRun.id == run_id,
+            JobRun.tenant_id == current_user.tenant_id
+        )
+    )
+    archived = None
+    if result.first() is None:
+        if archive.archive_enabled():
+            archived = await run_in_threadpool(archive.get_archived_run, current_user.tenant_id, run_id)
+        if archived is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Run not found"
+            )
+    
+    inline = None
+    if archived is not None:
+        size = await run_in_threadpool(archive.archived_log_size, archived)
+        if size is None:
+            inline = (archived.output or "").encode("utf-8")
+    else:
+        size = await output_size(db, run_id)
+        if size == 0:
+            record = await db.get(JobRunOutput, run_id)
+            inline = (record.output_text or "").encode("utf-8") if record else b""
+    if inline is not None:
+        size = len(inline)
+    
+    try:
+        byte_range = parse_range(range_header, size)
+    except InvalidRange:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    start, end = byte_range if byte_range else (0, size - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+    }
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    status_code = status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK
+    
+    if inline is not None:
+        return Response(
+            content=inline[start:end + 1],
+            status_code=status_code,
+            headers=headers,
+            media_type="text/plain; charset=utf-8"
+        )
+    
+    if archived is not None:
+        # Blocking reads; StreamingResponse iterates them in a thread
+        return StreamingResponse(
+            archive.iter_archived_log(archived, start, end),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/plain; charset=utf-8"
+        )
+    
+    async def body():
+        # The dependency's session is closed once the handler returns, before
+        # the body is streamed; reopen it here and release it when done
+        try:
+            async for chunk in iter_output(db, run_id, start, end):
+                yield chunk
+        finally:
+            await db.close()
+    
+    return StreamingResponse(
+        body(),
+        status_code=status_code,
+        headers=headers,
+        media_type="text/plain; charset=utf-8"
+    )
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split a streamed body into numbered, non-empty lines.
+    
+    Raises:
+        HTTPException: 413 if a single line exceeds IMPORT_MAX_LINE_BYTES
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Line {line_number + 1} exceeds {IMPORT_MAX_LINE_BYTES} bytes"
+            )
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def _load_import_batch(
+    db: Session,
+    tenant_id: str,
+    batch: List[Tuple[int, dict]]
+) -> Tuple[int, List[RunImportError]]:
+    """Write and commit one import batch, rejecting rows for unknown endpoints."""
+    endpoint_ids = {row["endpoint_id"] for _, row in batch if row["endpoint_id"] is not None}
+    known = set()
+    if endpoint_ids:
+        known = {
+            endpoint_id for (endpoint_id,) in db.query(Endpoint.id).filter(
+                Endpoint.tenant_id == tenant_id,
+                Endpoint.id.in_(endpoint_ids)
+            )
+        }
+    
+    rows = []
+    errors = []
+    for line_number, row in batch:
+        if row["endpoint_id"] is not None and row["endpoint_id"] not in known:
+            errors.append(RunImportError(line=line_number, detail="Endpoint not found"))
+            continue
+        rows.append(row)
+    
+    loaded = copy_runs(db, rows)
+    db.commit()
+    return loaded, errors
+
+
+@router.post("/runs/import", response_model=RunImportResponse, dependencies=[Depends(RateLimiter(times=10, seconds=60))])
+async def import_runs(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import historical runs (admin only).
+    
+    The body is newline-delimited JSON, one RunImportRecord per line, for
+    example run history exported from another cron monitor. Runs are
+    imported into the caller's tenant. The body is streamed and written in
+    batches (COPY on PostgreSQL), each committed as it completes, so
+    imports of any size use constant memory.
+    
+    Invalid lines are skipped and reported (first IMPORT_MAX_ERRORS only).
+    Idempotency keys are not checked; import each file once.
+    """
+    if current_user.role != "admin" and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only tenant admins can import runs"
+        )
+    
+    tenant_id = current_user.tenant_id
+    imported = 0
+    rejected = 0
+    errors: List[RunImportError] = []
+    
+    def reject(error: RunImportError) -> None:
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < IMPORT_MAX_ERRORS:
+            errors.append(error)
+    
+    batch = []
+    async for line_number, line in _ndjson_lines(request.stream()):
+        try:
+            record = RunImportRecord.model_validate_json(line)
+        except ValidationError as e:
+            first = e.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            reject(RunImportError(line=line_number, detail=f"{location}: {first['msg']}" if location else first["msg"]))
+            continue
+        batch.append((line_number, run_row_from_import(record, tenant_id)))
+        
+        if len(batch) >= DEFAULT_BATCH_SIZE:
+            loaded, batch_errors = await run_in_threadpool(_load_import_batch, db, tenant_id, batch)
+            imported += loaded
+            for error in batch_errors:
+                reject(error)
+            batch = []
+    
+    if batch:
+        loaded, batch_errors = await run_in_threadpool(_load_import_batch, db, tenant_id, batch)
+        imported += loaded
+        for error in batch_errors:
+            reject(error)
+    
+    logger.info(f"Imported {imported} runs for tenant {tenant_id} ({rejected} rejected)")
+    return RunImportResponse(imported=imported, rejected=rejected, errors=errors)
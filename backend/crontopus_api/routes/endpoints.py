@@ -12,12 +12,14 @@ from datetime import datetime, timezone
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from fastapi.responses import Response
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import logging
 from fastapi_limiter.depends import RateLimiter
-from crontopus_api.config import get_db, get_settings
+from crontopus_api.config import get_db, get_async_db, get_settings
 from crontopus_api.models import Endpoint, EndpointStatus, User, JobInstance, JobInstanceStatus, JobInstanceSource
 from crontopus_api.schemas.agent import (
     AgentEnroll,
@@ -36,12 +38,48 @@ from crontopus_api.schemas.job_instance import (
 )
 from crontopus_api.security.dependencies import get_current_user
 from crontopus_api.security.enrollment_auth import get_user_for_enrollment
+from crontopus_api.security.endpoint_tokens import invalidate_endpoint_token
+from crontopus_api.services.endpoint_cache import (
+    EndpointInfo,
+    get_endpoint_info,
+    get_endpoint_info_sync,
+    invalidate_endpoint
+)
+from crontopus_api.services.view_cache import note_runs_changed
 from crontopus_api.security.password import get_password_hash
 
 router = APIRouter(prefix="/endpoints", tags=["endpoints"])
 logger = logging.getLogger(__name__)
 
 
+def _invalidate_endpoint_caches(endpoint_id: int) -> None:
+    """Drop cached metadata and token verification for an endpoint."""
+    invalidate_endpoint(endpoint_id)
+    invalidate_endpoint_token(endpoint_id)
+
+
+def _require_agent_endpoint(endpoint: Optional[EndpointInfo]) -> EndpointInfo:
+    """
+    Check that an agent-facing call targets an existing, non-revoked endpoint.
+    
+    Raises:
+        HTTPException: 404 if the endpoint does not exist, 403 if it is revoked
+    """
+    if not endpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Endpoint not found"
+        )
+    
+    if endpoint.is_revoked:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Endpoint has been revoked"
+        )
+    
+    return endpoint
+
+
 @router.post("/enroll", response_model=AgentEnrollResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(RateLimiter(times=10, seconds=60))])
 async def enroll_endpoint(
     request: Request,
@@ -77,6 +115,7 @@ async def enroll_endpoint(
     
     if existing_endpoint:
         # Transfer endpoint to new tenant and update token and metadata
+        note_runs_changed(db, {existing_endpoint.tenant_id, current_user.tenant_id})
         existing_endpoint.tenant_id = current_user.tenant_id  # Transfer to new tenant
         existing_endpoint.name = endpoint_data.name
         existing_endpoint.hostname = endpoint_data.hostname
@@ -91,6 +130,9 @@ async def enroll_endpoint(
         db.commit()
         db.refresh(existing_endpoint)
         
+        # Previous token, tenant and status are no longer valid
+        _invalidate_endpoint_caches(existing_endpoint.id)
+        
         return AgentEnrollResponse(
             agent_id=existing_endpoint.id,
             token=token
@@ -111,6 +153,7 @@ async def enroll_endpoint(
         )
         
         db.add(endpoint)
+        note_runs_changed(db, [current_user.tenant_id])
         db.commit()
         db.refresh(endpoint)
         
@@ -213,8 +256,10 @@ async def update_endpoint(
     
     # Update name
     endpoint.name = name
+    note_runs_changed(db, [current_user.tenant_id])
     db.commit()
     db.refresh(endpoint)
+    _invalidate_endpoint_caches(endpoint_id)
     
     return endpoint
 
@@ -224,7 +269,7 @@ async def endpoint_heartbeat(
     request: Request,
     endpoint_id: int,
     heartbeat_data: AgentHeartbeat,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Record endpoint heartbeat.
@@ -232,28 +277,27 @@ async def endpoint_heartbeat(
     Endpoints call this endpoint periodically to report they are alive.
     TODO: Add endpoint token authentication
     """
-    endpoint = db.query(Endpoint).filter(Endpoint.id == endpoint_id).first()
-    
-    if not endpoint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Endpoint not found"
-        )
+    endpoint = _require_agent_endpoint(await get_endpoint_info(db, endpoint_id))
     
     # Update last heartbeat
-    endpoint.last_heartbeat = datetime.now(timezone.utc)
+    values = {"last_heartbeat": datetime.now(timezone.utc)}
     
     # Update status if provided
     if heartbeat_data.status:
-        endpoint.status = heartbeat_data.status
+        values["status"] = heartbeat_data.status
     
     # Update platform/version if provided
     if heartbeat_data.platform:
-        endpoint.platform = heartbeat_data.platform
+        values["platform"] = heartbeat_data.platform
     if heartbeat_data.version:
-        endpoint.version = heartbeat_data.version
+        values["version"] = heartbeat_data.version
     
-    db.commit()
+    # Write without loading the row; metadata came from the endpoint cache
+    await db.execute(update(Endpoint).where(Endpoint.id == endpoint_id).values(**values))
+    await db.commit()
+    
+    if heartbeat_data.status and heartbeat_data.status != endpoint.status:
+        invalidate_endpoint(endpoint_id)
     
     return {"message": "Heartbeat recorded", "endpoint_id": endpoint_id}
 
@@ -282,6 +326,7 @@ async def revoke_endpoint(
     
     endpoint.status = EndpointStatus.REVOKED
     db.commit()
+    _invalidate_endpoint_caches(endpoint_id)
     
     return {"message": "Endpoint revoked", "endpoint_id": endpoint_id}
 
@@ -306,12 +351,7 @@ async def report_discovered_jobs(
     import yaml
     
     # Verify endpoint exists
-    endpoint = db.query(Endpoint).filter(Endpoint.id == endpoint_id).first()
-    if not endpoint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Endpoint not found"
-        )
+    endpoint = _require_agent_endpoint(get_endpoint_info_sync(db, endpoint_id))
     
     # Get user for Git commits
     user = db.query(User).filter(User.tenant_id == endpoint.tenant_id).first()
@@ -430,7 +470,7 @@ async def report_discovered_jobs(
 async def report_job_instances(
     endpoint_id: int,
     instances_data: JobInstancesRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Report current job instances on an endpoint.
@@ -444,23 +484,24 @@ async def report_job_instances(
     TODO: Add endpoint token authentication
     """
     # Verify endpoint exists
-    endpoint = db.query(Endpoint).filter(Endpoint.id == endpoint_id).first()
-    if not endpoint:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Endpoint not found"
-        )
+    endpoint = _require_agent_endpoint(await get_endpoint_info(db, endpoint_id))
+    
+    # Load all current instances for this endpoint in one query
+    result = await db.execute(
+        select(JobInstance).where(JobInstance.endpoint_id == endpoint_id)
+    )
+    existing_instances = {
+        (instance.namespace, instance.job_name): instance
+        for instance in result.scalars()
+    }
     
     instances_updated = 0
-    reported_job_ids = []
+    reported_keys = set()
     
     # Find or create job instance
     for instance_report in instances_data.instances:
-        job_instance = db.query(JobInstance).filter(
-            JobInstance.endpoint_id == endpoint_id,
-            JobInstance.job_name == instance_report.job_name,
-            JobInstance.namespace == instance_report.namespace
-        ).first()
+        key = (instance_report.namespace, instance_report.job_name)
+        job_instance = existing_instances.get(key)
         
         if job_instance:
             # Update existing instance
@@ -468,7 +509,6 @@ async def report_job_instances(
             job_instance.last_seen = datetime.now(timezone.utc)
             if instance_report.original_command:
                 job_instance.original_command = instance_report.original_command
-            reported_job_ids.append(job_instance.id)
         else:
             # Create new instance
             job_instance = JobInstance(
@@ -481,28 +521,18 @@ async def report_job_instances(
                 original_command=instance_report.original_command
             )
             db.add(job_instance)
-            db.flush()  # Ensure ID is generated
-            reported_job_ids.append(job_instance.id)
+            existing_instances[key] = job_instance
         
+        reported_keys.add(key)
         instances_updated += 1
     
     # Delete jobs not reported (drift detection)
     # Remove job instances that are no longer on the endpoint
-    if reported_job_ids:
-        stale_instances = db.query(JobInstance).filter(
-            JobInstance.endpoint_id == endpoint_id,
-            JobInstance.id.notin_(reported_job_ids)
-        ).all()
-    else:
-        # If no jobs reported, remove all instances for this endpoint
-        stale_instances = db.query(JobInstance).filter(
-            JobInstance.endpoint_id == endpoint_id
-        ).all()
-    
-    for stale in stale_instances:
-        db.delete(stale)
+    for key, stale in existing_instances.items():
+        if key not in reported_keys:
+            await db.delete(stale)
     
-    db.commit()
+    await db.commit()
     
     return JobInstancesResponse(
         message=f"Updated {instances_updated} job instances",
@@ -0,0 +1,139 @@
+"""
+Run retention policy routes.
+
+Lets users limit how much run history their tenant keeps, tenant-wide or
+per namespace. Policies are applied in the background by
+services/retention.py; these routes only store them.
+"""
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from fastapi_limiter.depends import RateLimiter
+
+from crontopus_api.config import get_db
+from crontopus_api.models import RunRetentionPolicy, User
+from crontopus_api.security.dependencies import get_current_user
+
+router = APIRouter(prefix="/retention-policies", tags=["retention"])
+
+
+# Schemas
+class RetentionPolicyRequest(BaseModel):
+    """Request to set a retention policy."""
+    namespace: Optional[str] = Field(None, min_length=1, max_length=255, description="Namespace the policy applies to (None = tenant-wide default)")
+    retention_days: Optional[int] = Field(None, ge=1, le=3650, description="Delete runs that started more than this many days ago")
+    keep_last: Optional[int] = Field(None, ge=1, le=1000000, description="Keep only the newest N runs of each job")
+
+
+class RetentionPolicyResponse(BaseModel):
+    """Stored retention policy with the outcome of its last application."""
+    id: int
+    namespace: Optional[str]
+    retention_days: Optional[int]
+    keep_last: Optional[int]
+    last_applied_at: Optional[datetime]
+    last_deleted_count: int
+    created_at: datetime
+    updated_at: datetime
+
+
+def _policy_response(policy: RunRetentionPolicy) -> RetentionPolicyResponse:
+    return RetentionPolicyResponse(
+        id=policy.id,
+        namespace=policy.namespace or None,
+        retention_days=policy.retention_days,
+        keep_last=policy.keep_last,
+        last_applied_at=policy.last_applied_at,
+        last_deleted_count=policy.last_deleted_count,
+        created_at=policy.created_at,
+        updated_at=policy.updated_at
+    )
+
+
+@router.get("", response_model=List[RetentionPolicyResponse], dependencies=[Depends(RateLimiter(times=60, seconds=60))])
+async def list_retention_policies(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List the tenant's retention policies.
+    
+    The tenant-wide policy (namespace null) comes first.
+    """
+    policies = db.query(RunRetentionPolicy).filter(
+        RunRetentionPolicy.tenant_id == current_user.tenant_id
+    ).order_by(RunRetentionPolicy.namespace).all()
+    
+    return [_policy_response(policy) for policy in policies]
+
+
+@router.put("", response_model=RetentionPolicyResponse, dependencies=[Depends(RateLimiter(times=30, seconds=60))])
+async def set_retention_policy(
+    request: Request,
+    policy_data: RetentionPolicyRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create or replace the retention policy for a namespace (or the tenant).
+    
+    Runs older than retention_days are deleted, and so are runs beyond
+    the newest keep_last of each job. A namespace policy replaces the
+    tenant-wide policy for that namespace. Deletion happens in the
+    background, within about run_retention_interval seconds.
+    """
+    if policy_data.retention_days is None and policy_data.keep_last is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Set retention_days, keep_last or both"
+        )
+    
+    namespace = policy_data.namespace or ""
+    policy = db.query(RunRetentionPolicy).filter(
+        RunRetentionPolicy.tenant_id == current_user.tenant_id,
+        RunRetentionPolicy.namespace == namespace
+    ).first()
+    
+    if policy is None:
+        policy = RunRetentionPolicy(tenant_id=current_user.tenant_id, namespace=namespace)
+        db.add(policy)
+    
+    policy.retention_days = policy_data.retention_days
+    policy.keep_last = policy_data.keep_last
+    db.commit()
+    db.refresh(policy)
+    
+    return _policy_response(policy)
+
+
+@router.delete("/{policy_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(RateLimiter(times=30, seconds=60))])
+async def delete_retention_policy(
+    request: Request,
+    policy_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a retention policy.
+    
+    Runs already deleted are not restored. Deleting a namespace policy
+    puts the namespace back under the tenant-wide policy, if any.
+    """
+    policy = db.query(RunRetentionPolicy).filter(
+        RunRetentionPolicy.id == policy_id,
+        RunRetentionPolicy.tenant_id == current_user.tenant_id
+    ).first()
+    
+    if not policy:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Retention policy not found"
+        )
+    
+    db.delete(policy)
+    db.commit()
+    
+    return {"message": "Retention policy deleted", "id": policy_id}
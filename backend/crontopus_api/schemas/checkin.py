@@ -1,8 +1,9 @@
 """
 Pydantic schemas for job check-ins and run history.
 """
-from typing import Optional
+from typing import Optional, List, Dict, Union
 from datetime import datetime
+from enum import Enum
 from pydantic import BaseModel, Field
 
 from crontopus_api.models.job_run import JobStatus
@@ -21,6 +22,8 @@ class AgentCheckinRequest(BaseModel):
     - duration: Execution time in seconds
     - output: Captured stdout/stderr (max 10,000 chars)
     - error_message: Last part of output if failed
+    - idempotency_key: Optional key; retries with the same key return the
+      original run instead of recording a duplicate
     """
     endpoint_id: int = Field(..., description="Endpoint that executed the job")
     job_name: str = Field(..., description="Job name from Git manifest")
@@ -30,6 +33,7 @@ class AgentCheckinRequest(BaseModel):
     duration: Optional[int] = Field(None, description="Execution duration in seconds")
     output: Optional[str] = Field(None, max_length=10000, description="Job output (stdout/stderr)")
     error_message: Optional[str] = Field(None, description="Error details if failed")
+    idempotency_key: Optional[str] = Field(None, max_length=255, description="Deduplicates retried check-ins from the same endpoint")
     
     def to_job_status(self) -> JobStatus:
         """Convert string status to JobStatus enum."""
@@ -43,6 +47,34 @@ class AgentCheckinRequest(BaseModel):
         return status_map.get(self.status.lower(), JobStatus.FAILURE)
 
 
+class AgentCheckinBatchRequest(BaseModel):
+    """
+    Schema for batched agent check-ins.
+    
+    Lets agents on busy hosts (or replaying a spool after an outage) send
+    many results in one request. Items may belong to different endpoints;
+    each endpoint must be authorized either by the Authorization header or
+    by an entry in endpoint_tokens.
+    """
+    checkins: List[AgentCheckinRequest] = Field(..., min_length=1, max_length=1000, description="Check-ins to record")
+    endpoint_tokens: Optional[Dict[int, str]] = Field(None, description="Per-endpoint tokens for mixed-endpoint batches")
+
+
+class BatchCheckinResult(BaseModel):
+    """Result for a single item of a batched check-in."""
+    index: int
+    status_code: int
+    run_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class AgentCheckinBatchResponse(BaseModel):
+    """Schema for batched check-in response."""
+    results: List[BatchCheckinResult]
+    accepted: int
+    rejected: int
+
+
 class CheckinRequest(BaseModel):
     """
     Schema for job check-in request.
@@ -67,6 +99,38 @@ class CheckinRequest(BaseModel):
     agent_id: Optional[str] = Field(None, description="Agent that executed the job")
 
 
+class RunImportRecord(BaseModel):
+    """
+    Schema for one historical run in a bulk import.
+    
+    Imports are newline-delimited JSON, one record per line.
+    """
+    job_name: str = Field(..., max_length=255, description="Job name")
+    namespace: Optional[str] = Field(None, max_length=255, description="Job namespace/group")
+    status: JobStatus = Field(..., description="Execution status")
+    started_at: datetime = Field(..., description="When the job started")
+    finished_at: Optional[datetime] = Field(None, description="When the job finished")
+    duration: Optional[int] = Field(None, description="Duration in seconds")
+    output: Optional[str] = Field(None, description="Job output (stdout/stderr)")
+    error_message: Optional[str] = Field(None, description="Error details if failed")
+    exit_code: Optional[int] = Field(None, description="Process exit code")
+    endpoint_id: Optional[int] = Field(None, description="Endpoint that executed the job")
+    agent_id: Optional[str] = Field(None, description="Agent that executed the job")
+
+
+class RunImportError(BaseModel):
+    """A rejected line of a bulk import."""
+    line: int
+    detail: str
+
+
+class RunImportResponse(BaseModel):
+    """Schema for bulk import response."""
+    imported: int
+    rejected: int
+    errors: List[RunImportError]  # first errors only
+
+
 class CheckinResponse(BaseModel):
     """Schema for check-in response."""
     run_id: int
@@ -76,8 +140,21 @@ class CheckinResponse(BaseModel):
         from_attributes = True
 
 
-class JobRunResponse(BaseModel):
-    """Schema for job run history response."""
+class CheckinQueuedResponse(BaseModel):
+    """Schema for a check-in accepted into the ingestion buffer."""
+    provisional_id: str
+    message: str = "Check-in queued"
+
+
+class RunOutputUploadResponse(BaseModel):
+    """Schema for a run log upload response."""
+    run_id: int
+    bytes_received: int
+    size: int  # total uploaded log size after this upload
+
+
+class JobRunSummary(BaseModel):
+    """Schema for a job run in list summaries (no output)."""
     id: int
     tenant_id: str
     job_name: str
@@ -88,8 +165,6 @@ class JobRunResponse(BaseModel):
     finished_at: Optional[datetime]
     duration: Optional[int]
     
-    output: Optional[str]
-    error_message: Optional[str]
     exit_code: Optional[int]
     
     endpoint_id: Optional[int]
@@ -102,9 +177,66 @@ class JobRunResponse(BaseModel):
         from_attributes = True
 
 
+class JobRunResponse(JobRunSummary):
+    """Schema for job run history response."""
+    output: Optional[str]
+    error_message: Optional[str]
+
+
+class JobRunSearchResult(JobRunSummary):
+    """Schema for a run matching a full-text search."""
+    rank: float  # higher is a better match
+    snippet: Optional[str]  # error message or output around the first match
+
+
+class JobRunSearchResponse(BaseModel):
+    """Schema for ranked run search results."""
+    runs: List[JobRunSearchResult]
+    has_more: bool
+    offset: int
+    limit: int
+
+
+class RunView(str, Enum):
+    """How much of each run a run list returns."""
+    FULL = "full"  # every field, including output and error_message
+    SUMMARY = "summary"  # JobRunSummary fields only; output is not loaded
+
+
+class HistogramBucketSize(str, Enum):
+    """Bucket width of a run histogram."""
+    FIVE_MINUTES = "5m"
+    HOUR = "1h"
+    DAY = "1d"
+    
+    @property
+    def seconds(self) -> int:
+        return {"5m": 300, "1h": 3600, "1d": 86400}[self.value]
+
+
+class ExportFormat(str, Enum):
+    """File format of a run export."""
+    NDJSON = "ndjson"  # one JSON object per line
+    CSV = "csv"  # header row, then one row per run
+
+
+class CountStrategy(str, Enum):
+    """How a run list computes its total."""
+    EXACT = "exact"  # COUNT(*) over all matching runs
+    ESTIMATED = "estimated"  # query planner estimate
+    NONE = "none"  # no total, only has_more
+
+
 class JobRunListResponse(BaseModel):
-    """Schema for paginated job run list."""
-    runs: list[JobRunResponse]
-    total: int
-    page: int
+    """
+    Schema for a cursor-paginated job run list.
+    
+    Pages have no number: pass next_cursor back as ?cursor= for the next
+    one. page_size is the requested limit.
+    """
+    runs: list[Union[JobRunResponse, JobRunSummary]]  # JobRunSummary for view=summary
+    total: Optional[int]  # null when count_strategy is "none"
+    count_strategy: CountStrategy
+    has_more: bool
     page_size: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page
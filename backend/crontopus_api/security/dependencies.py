@@ -7,9 +7,10 @@ from datetime import datetime, timezone
 import logging
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crontopus_api.config import get_db
+from crontopus_api.config import get_async_db
 from crontopus_api.models import User, APIToken
 from crontopus_api.security.jwt import decode_access_token
 
@@ -20,7 +21,7 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token or API token.
@@ -36,7 +37,7 @@ async def get_current_user(
     
     Args:
         credentials: HTTP Authorization header with Bearer token
-        db: Database session
+        db: Async database session
         
     Returns:
         User object if authenticated
@@ -67,7 +68,7 @@ async def get_current_user(
             )
         
         # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.get(User, user_id)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,13 +93,13 @@ async def get_current_user(
     )
 
 
-async def authenticate_api_token(token: str, db: Session) -> Optional[User]:
+async def authenticate_api_token(token: str, db: AsyncSession) -> Optional[User]:
     """
     Authenticate user using an API token.
     
     Args:
         token: Plaintext API token (e.g., ctp_abc123...)
-        db: Database session
+        db: Async database session
         
     Returns:
         User object if token is valid, None otherwise
@@ -107,9 +108,10 @@ async def authenticate_api_token(token: str, db: Session) -> Optional[User]:
     token_hash = hashlib.sha256(token.encode()).hexdigest()
     
     # Look up token in database
-    api_token = db.query(APIToken).filter(
-        APIToken.token_hash == token_hash
-    ).first()
+    result = await db.execute(
+        select(APIToken).where(APIToken.token_hash == token_hash)
+    )
+    api_token = result.scalars().first()
     
     if not api_token:
         logger.warning(f"API token not found (hash: {token_hash[:8]}...)")
@@ -122,10 +124,10 @@ async def authenticate_api_token(token: str, db: Session) -> Optional[User]:
     
     # Update last_used_at timestamp
     api_token.last_used_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     # Get associated user
-    user = db.query(User).filter(User.id == api_token.user_id).first()
+    user = await db.get(User, api_token.user_id)
     if not user:
         logger.error(f"API token {api_token.id} references non-existent user {api_token.user_id}")
         return None
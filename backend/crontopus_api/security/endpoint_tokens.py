@@ -0,0 +1,70 @@
+"""
+Endpoint token verification with an in-process cache.
+
+Endpoint tokens are stored as bcrypt hashes, which makes every verification
+cost hundreds of milliseconds of CPU. Agents present the same token on every
+check-in, so once a token has been verified we remember a keyed digest of
+(endpoint_id, token, token_hash) and skip bcrypt on subsequent requests.
+
+The digest is keyed with the application secret, so the cache never holds
+plaintext tokens. Because token_hash is part of the digest, re-issuing a
+token invalidates the cached entry implicitly; routes that change an
+endpoint's credentials or status still call invalidate_endpoint_token()
+so the entry is dropped immediately.
+"""
+import hashlib
+import hmac
+
+from starlette.concurrency import run_in_threadpool
+
+from crontopus_api.config import settings
+from crontopus_api.security.password import verify_password
+from crontopus_api.utils.cache import TTLCache
+
+_verified_tokens = TTLCache(
+    maxsize=settings.endpoint_token_cache_size,
+    ttl=settings.endpoint_token_cache_ttl,
+)
+
+
+def _token_digest(endpoint_id: int, token: str, token_hash: str) -> bytes:
+    """Compute keyed digest identifying a verified token."""
+    message = f"{endpoint_id}:{token}:{token_hash}".encode()
+    return hmac.new(settings.secret_key.encode(), message, hashlib.sha256).digest()
+
+
+async def verify_endpoint_token(endpoint_id: int, token: str, token_hash: str) -> bool:
+    """
+    Verify an endpoint token against its stored bcrypt hash.
+
+    Cache hits are answered without running bcrypt. On a miss, bcrypt runs
+    in the threadpool so it does not block the event loop.
+
+    Args:
+        endpoint_id: Endpoint the token was presented for
+        token: Plaintext token from the Authorization header
+        token_hash: Stored bcrypt hash for the endpoint
+
+    Returns:
+        True if the token is valid, False otherwise
+    """
+    digest = _token_digest(endpoint_id, token, token_hash)
+    cached = _verified_tokens.get(endpoint_id)
+    if cached is not None and hmac.compare_digest(cached, digest):
+        return True
+
+    if not await run_in_threadpool(verify_password, token, token_hash):
+        return False
+
+    _verified_tokens.set(endpoint_id, digest)
+    return True
+
+
+def invalidate_endpoint_token(endpoint_id: int) -> None:
+    """Forget any cached verification for an endpoint."""
+    _verified_tokens.pop(endpoint_id)
+
+
+def clear_endpoint_token_cache() -> None:
+    """Forget all cached verifications."""
+    _verified_tokens.clear()
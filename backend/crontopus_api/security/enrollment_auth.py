@@ -3,8 +3,9 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crontopus_api.config import get_db
+from crontopus_api.config import get_db, get_async_db
 from crontopus_api.models.user import User
 from crontopus_api.models.enrollment_token import EnrollmentToken
 from crontopus_api.security.dependencies import get_current_user
@@ -61,6 +62,7 @@ async def get_user_from_enrollment_token(
 
 async def get_user_for_enrollment(
     db: Session = Depends(get_db),
+    async_db: AsyncSession = Depends(get_async_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     """
@@ -79,7 +81,7 @@ async def get_user_for_enrollment(
     
     # Fallback to JWT authentication
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(credentials, async_db)
     except HTTPException as e:
         # Re-raise with more specific error message
         raise HTTPException(
@@ -0,0 +1,674 @@
+"""
+Cold run archive (Parquet).
+
+Runs that started more than run_archive_after_days ago are moved out of
+job_run into Parquet files, one directory per tenant and month:
+
+    <run_archive_uri>/tenant_id=<tenant>/month=<YYYY-MM>/<uuid>.parquet
+    <run_archive_uri>/tenant_id=<tenant>/month=<YYYY-MM>/_logs/<run id>.log
+
+run_archive_uri is a local directory or any URI pyarrow.fs understands
+(file://, s3://, gs://). Each batch writes new files and then deletes the
+archived runs from job_run; files are never rewritten. If the delete fails
+after a file was written, the runs are archived again by the next pass,
+so readers drop duplicate run ids, and runs still in job_run win over
+their archived copies (see unarchived_run_ids()).
+
+Run listings, exports and lookups fall back to the archive (find_runs(),
+iter_runs(), get_archived_run()): tenant and month directories are
+pruned by path, newest month first, and the remaining filters are pushed
+down to the Parquet row group statistics by pyarrow datasets. Aggregations are
+unaffected because rollups are kept when runs are archived.
+
+Uploaded logs (POST /runs/{id}/output) are written next to their run's
+Parquet files as one uncompressed object per run, before the run is
+deleted, so GET /runs/{id}/output can keep serving byte ranges from them
+(iter_archived_log()). Dataset reads skip the _logs directory because of
+its leading underscore.
+
+Retention policies (services/retention.py) only delete from job_run, so
+the archiver applies a tenant's policies before archiving its runs:
+runs a policy no longer keeps are deleted instead of archived. Archived
+runs are then governed by the age rule only, a month directory at a time:
+prune_archive() drops months that ended before
+archive_retention_cutoff(), i.e. once every run in them is older than
+the tenant's longest retention_days. Tenants where some runs are kept
+forever (no tenant-wide policy, or a policy without retention_days) are
+never pruned. keep_last is not re-applied to archived runs; they were
+among the newest keep_last of their job when they were archived.
+
+pyarrow is optional. Without it, or without run_archive_uri, archiving
+is disabled and run history only comes from job_run.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from starlette.concurrency import run_in_threadpool
+
+from crontopus_api.config import settings, SessionLocal
+from crontopus_api.models import JobRun, JobRunOutputSegment, JobStatus, RunRetentionPolicy, Tenant
+from crontopus_api.models.job_run_output import decompress_bytes
+from crontopus_api.services import metrics
+from crontopus_api.services.retention import apply_retention, delete_runs, set_batch_lock_timeout
+from crontopus_api.services.view_cache import note_runs_changed
+from crontopus_api.utils.locks import try_advisory_lock
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key ensuring one worker archives at a time
+ARCHIVE_LOCK_ID = 7_412_031_918
+
+# Run columns stored in archive files (tenant and month come from the path)
+SUMMARY_FIELDS = (
+    "id", "job_name", "namespace", "status", "started_at", "finished_at", "duration",
+    "exit_code", "agent_id", "endpoint_id", "created_at", "updated_at",
+)
+ARCHIVE_FIELDS = SUMMARY_FIELDS + ("output", "error_message")
+
+# Month subdirectory holding uploaded logs (ignored by pyarrow datasets)
+LOG_DIR = "_logs"
+
+# Bytes read at a time when serving an archived log
+LOG_CHUNK_SIZE = 256 * 1024
+
+
+class ArchivedRun(NamedTuple):
+    """A run read back from the archive (same attributes as JobRunResponse)."""
+    id: int
+    tenant_id: str
+    job_name: str
+    namespace: Optional[str]
+    status: JobStatus
+    started_at: datetime
+    finished_at: Optional[datetime]
+    duration: Optional[int]
+    exit_code: Optional[int]
+    agent_id: Optional[str]
+    endpoint_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+    output: Optional[str] = None  # not read for summary listings
+    error_message: Optional[str] = None
+
+
+def archive_enabled() -> bool:
+    """Whether runs are archived (run_archive_uri set and pyarrow installed)."""
+    return bool(settings.run_archive_uri) and pa is not None
+
+
+def archive_cutoff(now: Optional[datetime] = None) -> datetime:
+    """Runs that started before this time are archived."""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=settings.run_archive_after_days)
+
+
+def window_reaches_archive(days: Optional[int]) -> bool:
+    """Whether a 'days' look-back window can include archived runs."""
+    return archive_enabled() and (days is None or days > settings.run_archive_after_days)
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Make a timestamp timezone-aware UTC (naive values are taken as UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _month_key(value: datetime) -> str:
+    return f"{as_utc(value):%Y-%m}"
+
+
+def _month_end(month: str) -> datetime:
+    """Start of the month after a YYYY-MM month key."""
+    year, number = (int(part) for part in month.split("-"))
+    return datetime(year + number // 12, number % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _schema():
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema([
+        ("id", pa.int64()),
+        ("job_name", pa.string()),
+        ("namespace", pa.string()),
+        ("status", pa.string()),
+        ("started_at", timestamp),
+        ("finished_at", timestamp),
+        ("duration", pa.int32()),
+        ("exit_code", pa.int32()),
+        ("agent_id", pa.string()),
+        ("endpoint_id", pa.int64()),
+        ("output", pa.large_string()),
+        ("error_message", pa.large_string()),
+        ("created_at", timestamp),
+        ("updated_at", timestamp),
+    ])
+
+
+def _filesystem(uri: Optional[str] = None):
+    """Resolve the archive location to a (pyarrow filesystem, root path) pair."""
+    uri = uri or settings.run_archive_uri
+    if "://" not in uri:
+        return pafs.LocalFileSystem(), os.path.abspath(uri)
+    filesystem, root = pafs.FileSystem.from_uri(uri)
+    return filesystem, root.rstrip("/")
+
+
+def _tenant_dir(root: str, tenant_id: str) -> str:
+    return f"{root}/tenant_id={quote(tenant_id, safe='')}"
+
+
+def _months(filesystem, root: str, tenant_id: str) -> List[str]:
+    """Archived months of a tenant, newest first."""
+    selector = pafs.FileSelector(_tenant_dir(root, tenant_id), allow_not_found=True)
+    months = [
+        info.base_name.split("=", 1)[1]
+        for info in filesystem.get_file_info(selector)
+        if info.type == pafs.FileType.Directory and info.base_name.startswith("month=")
+    ]
+    return sorted(months, reverse=True)
+
+
+def _month_dataset(filesystem, root: str, tenant_id: str, month: str):
+    return ds.dataset(
+        f"{_tenant_dir(root, tenant_id)}/month={month}",
+        filesystem=filesystem,
+        format="parquet",
+        schema=_schema()
+    )
+
+
+def write_archive_file(filesystem, root: str, tenant_id: str, month: str, runs: List[JobRun]) -> str:
+    """
+    Write runs of one tenant and month to a new Parquet file.
+
+    Returns:
+        Path of the file written
+    """
+    columns = defaultdict(list)
+    for run in runs:
+        for field in ARCHIVE_FIELDS:
+            value = getattr(run, field)
+            if field == "status":
+                value = value.value
+            elif isinstance(value, datetime):
+                value = as_utc(value)
+            columns[field].append(value)
+
+    table = pa.Table.from_pydict(dict(columns), schema=_schema())
+    directory = f"{_tenant_dir(root, tenant_id)}/month={month}"
+    filesystem.create_dir(directory, recursive=True)
+    path = f"{directory}/{uuid.uuid4().hex}.parquet"
+    pq.write_table(table, path, filesystem=filesystem, compression="zstd")
+    return path
+
+
+def _log_path(root: str, tenant_id: str, month: str, run_id: int) -> str:
+    return f"{_tenant_dir(root, tenant_id)}/month={month}/{LOG_DIR}/{run_id}.log"
+
+
+def write_archive_logs(db: Session, filesystem, root: str, tenant_id: str, runs: List[JobRun]) -> int:
+    """
+    Write the uploaded logs of runs to the archive, one object per run.
+
+    Segments are streamed from the database and decompressed one at a
+    time, so memory use does not depend on log size. An existing object
+    for the same run (from a pass whose delete failed) is overwritten.
+
+    Returns:
+        Number of logs written
+    """
+    months = {run.id: _month_key(run.started_at) for run in runs}
+    segments = db.execute(
+        select(JobRunOutputSegment.run_id, JobRunOutputSegment.data, JobRunOutputSegment.compression)
+        .where(JobRunOutputSegment.run_id.in_(list(months)))
+        .order_by(JobRunOutputSegment.run_id, JobRunOutputSegment.byte_offset)
+        .execution_options(yield_per=16)
+    )
+
+    written = 0
+    for run_id, run_segments in groupby(segments, key=lambda segment: segment.run_id):
+        path = _log_path(root, tenant_id, months[run_id], run_id)
+        filesystem.create_dir(path.rsplit("/", 1)[0], recursive=True)
+        with filesystem.open_output_stream(path) as stream:
+            for segment in run_segments:
+                stream.write(decompress_bytes(segment.data, segment.compression))
+        written += 1
+    return written
+
+
+def archive_tenant_runs(
+    db: Session,
+    tenant_id: str,
+    before: datetime,
+    batch_size: int,
+    lock_timeout_ms: int,
+    on_batch: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Move a tenant's runs that started before a time into the archive.
+
+    Each batch of up to batch_size runs (oldest first) is written as one
+    file per month, plus one object per uploaded log, then deleted from
+    job_run and committed.
+
+    Returns:
+        Number of runs archived
+    """
+    filesystem, root = _filesystem()
+    archived = 0
+    while True:
+        set_batch_lock_timeout(db, lock_timeout_ms)
+        runs = db.query(JobRun).options(selectinload(JobRun.output_record)).filter(
+            JobRun.tenant_id == tenant_id,
+            JobRun.started_at < before
+        ).order_by(JobRun.started_at, JobRun.id).limit(batch_size).all()
+        if not runs:
+            db.commit()
+            break
+
+        by_month = defaultdict(list)
+        for run in runs:
+            by_month[_month_key(run.started_at)].append(run)
+        for month, month_runs in by_month.items():
+            write_archive_file(filesystem, root, tenant_id, month, month_runs)
+        write_archive_logs(db, filesystem, root, tenant_id, runs)
+
+        run_ids = [run.id for run in runs]
+        delete_runs(db, run_ids)
+        note_runs_changed(db, [tenant_id])
+        db.commit()
+        archived += len(run_ids)
+        if on_batch is not None:
+            on_batch(len(run_ids))
+        if len(run_ids) < batch_size:
+            break
+    return archived
+
+
+def archive_retention_cutoff(
+    policies: List[RunRetentionPolicy],
+    now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Time before which a tenant's retention policies keep no runs.
+
+    Args:
+        policies: Every retention policy of the tenant
+
+    Returns:
+        now minus the longest retention_days, or None if some runs are
+        kept forever (no tenant-wide policy, or a policy without
+        retention_days)
+    """
+    if not any(not policy.namespace for policy in policies):
+        return None
+    if any(policy.retention_days is None for policy in policies):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=max(policy.retention_days for policy in policies))
+
+
+def prune_archive(tenant_id: str, before: datetime) -> List[str]:
+    """
+    Delete a tenant's archived months that ended before a time.
+
+    Whole month directories are removed, uploaded logs included.
+
+    Returns:
+        Months deleted (YYYY-MM)
+    """
+    filesystem, root = _filesystem()
+    pruned = []
+    for month in _months(filesystem, root, tenant_id):
+        if _month_end(month) <= before:
+            filesystem.delete_dir(f"{_tenant_dir(root, tenant_id)}/month={month}")
+            pruned.append(month)
+    return pruned
+
+
+def _filter_expression(
+    since: Optional[datetime] = None,
+    before: Optional[Tuple[datetime, int]] = None,
+    job_name: Optional[str] = None,
+    namespace: Optional[str] = None,
+    endpoint_id: Optional[int] = None,
+    status: Optional[JobStatus] = None
+):
+    """Build a dataset filter mirroring the run list filters."""
+    timestamp = pa.timestamp("us", tz="UTC")
+    conditions = []
+    if since is not None:
+        conditions.append(ds.field("started_at") >= pa.scalar(as_utc(since), timestamp))
+    if before is not None:
+        started_at = pa.scalar(as_utc(before[0]), timestamp)
+        conditions.append(
+            (ds.field("started_at") < started_at)
+            | ((ds.field("started_at") == started_at) & (ds.field("id") < before[1]))
+        )
+    if job_name:
+        conditions.append(pc.match_substring(ds.field("job_name"), job_name, ignore_case=True))
+    if namespace:
+        conditions.append(ds.field("namespace") == namespace)
+    if endpoint_id:
+        conditions.append(ds.field("endpoint_id") == endpoint_id)
+    if status:
+        conditions.append(ds.field("status") == status.value)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _to_runs(tenant_id: str, table) -> Iterator[ArchivedRun]:
+    for batch in table.to_batches():
+        for row in batch.to_pylist():
+            row["status"] = JobStatus(row["status"])
+            yield ArchivedRun(tenant_id=tenant_id, **row)
+
+
+def find_runs(
+    tenant_id: str,
+    limit: int,
+    since: Optional[datetime] = None,
+    before: Optional[Tuple[datetime, int]] = None,
+    job_name: Optional[str] = None,
+    namespace: Optional[str] = None,
+    endpoint_id: Optional[int] = None,
+    status: Optional[JobStatus] = None,
+    with_output: bool = True
+) -> List[ArchivedRun]:
+    """
+    Archived runs matching the run list filters, newest first.
+
+    Months are scanned newest first and scanning stops once a month fills
+    the page, so recent pages only read recent files.
+
+    Args:
+        tenant_id: Tenant whose runs to read
+        limit: Maximum number of runs
+        since: Only runs that started at or after this time
+        before: Only runs sorting before this (started_at, id) key
+        job_name, namespace, endpoint_id, status: As in GET /runs
+        with_output: Read output and error_message (False leaves them None)
+
+    Returns:
+        Runs ordered by (started_at, id) descending
+    """
+    filesystem, root = _filesystem()
+    expression = _filter_expression(since, before, job_name, namespace, endpoint_id, status)
+    first_month = _month_key(since) if since is not None else None
+    last_month = _month_key(before[0]) if before is not None else None
+
+    columns = list(ARCHIVE_FIELDS if with_output else SUMMARY_FIELDS)
+
+    runs: List[ArchivedRun] = []
+    seen = set()
+    for month in _months(filesystem, root, tenant_id):
+        if last_month is not None and month > last_month:
+            continue
+        if first_month is not None and month < first_month:
+            break
+        table = _month_dataset(filesystem, root, tenant_id, month).to_table(filter=expression, columns=columns)
+        table = table.sort_by([("started_at", "descending"), ("id", "descending")])
+        for run in _to_runs(tenant_id, table):
+            if len(runs) >= limit:
+                break
+            if run.id not in seen:
+                seen.add(run.id)
+                runs.append(run)
+        if len(runs) >= limit:
+            break
+    return runs
+
+
+def iter_runs(
+    tenant_id: str,
+    since: Optional[datetime] = None,
+    job_name: Optional[str] = None,
+    namespace: Optional[str] = None,
+    endpoint_id: Optional[int] = None,
+    status: Optional[JobStatus] = None,
+    with_output: bool = True,
+    batch_size: int = 1000
+) -> Iterator[ArchivedRun]:
+    """
+    Stream every archived run matching the run list filters.
+
+    Unlike find_runs(), runs are not sorted: months come newest first,
+    but runs within a month are in file order. Only one record batch is
+    held in memory at a time (plus the ids seen in the current month, to
+    drop duplicates).
+    """
+    filesystem, root = _filesystem()
+    expression = _filter_expression(since, None, job_name, namespace, endpoint_id, status)
+    first_month = _month_key(since) if since is not None else None
+    columns = list(ARCHIVE_FIELDS if with_output else SUMMARY_FIELDS)
+
+    for month in _months(filesystem, root, tenant_id):
+        if first_month is not None and month < first_month:
+            break
+        seen = set()
+        dataset = _month_dataset(filesystem, root, tenant_id, month)
+        for batch in dataset.to_batches(filter=expression, columns=columns, batch_size=batch_size):
+            for run in _to_runs(tenant_id, pa.Table.from_batches([batch])):
+                if run.id not in seen:
+                    seen.add(run.id)
+                    yield run
+
+
+def count_runs(
+    tenant_id: str,
+    since: Optional[datetime] = None,
+    job_name: Optional[str] = None,
+    namespace: Optional[str] = None,
+    endpoint_id: Optional[int] = None,
+    status: Optional[JobStatus] = None,
+    exclude_ids: Iterable[int] = ()
+) -> int:
+    """
+    Number of distinct archived runs matching the run list filters.
+
+    Only the id column is read. A run archived twice is counted once (its
+    copies share a month), and exclude_ids (runs still in job_run, see
+    unarchived_run_ids()) are not counted.
+    """
+    filesystem, root = _filesystem()
+    expression = _filter_expression(since, None, job_name, namespace, endpoint_id, status)
+    exclude_ids = list(exclude_ids)
+    if exclude_ids:
+        excluded = ~ds.field("id").isin(exclude_ids)
+        expression = excluded if expression is None else expression & excluded
+    first_month = _month_key(since) if since is not None else None
+    total = 0
+    for month in _months(filesystem, root, tenant_id):
+        if first_month is not None and month < first_month:
+            break
+        ids = _month_dataset(filesystem, root, tenant_id, month).to_table(filter=expression, columns=["id"])
+        total += pc.count_distinct(ids.column("id")).as_py()
+    return total
+
+
+def unarchived_run_ids(query, now: Optional[datetime] = None) -> List[int]:
+    """
+    IDs of the runs of a JobRun query that are due for archiving.
+
+    They are still in job_run, but a pass may already have written them to
+    the archive (a run caught mid-archive), so readers merging both sources
+    drop these ids from the archive side.
+    """
+    return [run_id for (run_id,) in query.filter(JobRun.started_at < archive_cutoff(now)).with_entities(JobRun.id)]
+
+
+def get_archived_run(tenant_id: str, run_id: int) -> Optional[ArchivedRun]:
+    """Look up one archived run by id."""
+    filesystem, root = _filesystem()
+    for month in _months(filesystem, root, tenant_id):
+        table = _month_dataset(filesystem, root, tenant_id, month).to_table(filter=ds.field("id") == run_id)
+        if table.num_rows:
+            return next(_to_runs(tenant_id, table))
+    return None
+
+
+def archived_log_size(run: ArchivedRun) -> Optional[int]:
+    """Size of an archived run's uploaded log, or None if it had none."""
+    filesystem, root = _filesystem()
+    info = filesystem.get_file_info(_log_path(root, run.tenant_id, _month_key(run.started_at), run.id))
+    if info.type == pafs.FileType.NotFound:
+        return None
+    return info.size
+
+
+def iter_archived_log(run: ArchivedRun, start: int, end: int) -> Iterator[bytes]:
+    """Yield the bytes of an archived run's uploaded log from start to end (inclusive)."""
+    filesystem, root = _filesystem()
+    with filesystem.open_input_file(_log_path(root, run.tenant_id, _month_key(run.started_at), run.id)) as log:
+        log.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = log.read(min(LOG_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class RunArchiver:
+    """
+    Background task moving runs past run_archive_after_days to the archive.
+
+    Usage:
+        await archiver.start()  # runs once immediately, then every interval
+        ...
+        await archiver.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: int,
+        batch_size: int,
+        lock_timeout_ms: int
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self.lock_timeout_ms = lock_timeout_ms
+        self._task = None
+
+        self._archived = metrics.counter(
+            "crontopus_archive_runs_total",
+            "Runs moved from job_run to the Parquet archive"
+        )
+        self._pruned = metrics.counter(
+            "crontopus_archive_pruned_months_total",
+            "Archived tenant months deleted because retention expired every run in them"
+        )
+        self._last_pass = metrics.gauge(
+            "crontopus_archive_last_pass_timestamp_seconds",
+            "Unix time the last archive pass finished"
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the archive loop (does nothing when archiving is disabled)."""
+        if self.running or not archive_enabled():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the archive loop (an in-progress batch finishes in its thread)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                logger.error(f"Run archiving failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def run_once(self) -> Optional[int]:
+        """
+        Archive every tenant's old runs in a fresh session.
+
+        Each tenant's retention policies are applied first, and archived
+        months they no longer keep are pruned afterwards.
+
+        Returns:
+            Runs archived, or None if another worker holds the pass
+        """
+        before = archive_cutoff()
+        db = self.session_factory()
+        try:
+            with try_advisory_lock(db, ARCHIVE_LOCK_ID) as acquired:
+                if not acquired:
+                    return None
+                tenant_ids = [tenant_id for (tenant_id,) in db.query(Tenant.id).order_by(Tenant.id)]
+                db.commit()
+                archived = 0
+                for tenant_id in tenant_ids:
+                    apply_retention(db, self.batch_size, self.lock_timeout_ms, tenant_id=tenant_id)
+                    archived += archive_tenant_runs(
+                        db, tenant_id, before, self.batch_size, self.lock_timeout_ms,
+                        on_batch=self._archived.inc
+                    )
+                    self._prune(db, tenant_id)
+        finally:
+            db.close()
+
+        self._last_pass.set(time.time())
+        if archived:
+            logger.info(f"Archived {archived} runs that started before {before.isoformat()}")
+        return archived
+
+    def _prune(self, db: Session, tenant_id: str) -> None:
+        """Delete the tenant's archived months its retention policies no longer keep."""
+        policies = db.scalars(select(RunRetentionPolicy).where(RunRetentionPolicy.tenant_id == tenant_id)).all()
+        cutoff = archive_retention_cutoff(policies)
+        db.commit()
+        if cutoff is None:
+            return
+        pruned = prune_archive(tenant_id, cutoff)
+        if pruned:
+            self._pruned.inc(len(pruned))
+            note_runs_changed(db, [tenant_id])
+            db.commit()
+            logger.info(f"Pruned archived months {', '.join(pruned)} of tenant {tenant_id}")
+
+
+run_archiver = RunArchiver(
+    session_factory=SessionLocal,
+    interval_seconds=settings.run_archive_interval,
+    batch_size=settings.run_archive_batch_size,
+    lock_timeout_ms=settings.run_retention_lock_timeout_ms,
+)
@@ -0,0 +1,200 @@
+"""
+Bulk loading of job runs.
+
+Used for importing run history from other cron monitors and for large
+replays, where per-row INSERT overhead dominates. On PostgreSQL each batch
+is streamed with COPY FROM STDIN (CSV); other databases (SQLite in
+development) fall back to insert_runs(), which uses executemany.
+
+Output rows are copied into a temporary table together with their plain
+text and moved into job_run_output with one INSERT ... SELECT that
+computes the search vector (see services/run_search.py).
+
+Rows are consumed from an iterator one batch at a time and each batch is
+committed before the next is read, so loading millions of rows uses
+constant memory. A failed load leaves earlier batches committed.
+
+Bulk loading does not deduplicate idempotency keys.
+"""
+import enum
+import io
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import column, insert, select, table, text
+from sqlalchemy.orm import Session
+
+from crontopus_api.models import JobRun, JobRunOutput
+from crontopus_api.models.job_run_output import compress_text
+from crontopus_api.services.last_status import upsert_last_status
+from crontopus_api.services.rollups import upsert_rollups
+from crontopus_api.services.run_search import ERROR_PARAM, OUTPUT_PARAM, search_text, search_vector
+from crontopus_api.services.runs import OUTPUT_FIELDS, insert_runs
+from crontopus_api.services.view_cache import note_runs_changed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# job_run columns written by COPY (id is reserved up front so output rows can reference it)
+RUN_COLUMNS = [
+    "id", "tenant_id", "job_name", "namespace", "status",
+    "started_at", "finished_at", "duration", "exit_code",
+    "agent_id", "endpoint_id",
+]
+
+OUTPUT_COLUMNS = ["run_id", "output", "output_compression", "error_message", "error_compression"]
+
+# Staging table for output rows plus their plain text (dropped with the connection)
+OUTPUT_LOAD_TABLE = "job_run_output_load"
+OUTPUT_LOAD_COLUMNS = OUTPUT_COLUMNS + [OUTPUT_PARAM, ERROR_PARAM]
+
+
+def _csv_field(value: Any) -> str:
+    """Format a value for COPY ... (FORMAT csv), where an unquoted empty field is NULL."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        value = value.name
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, bytes):
+        value = "\\x" + value.hex()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _csv_line(values: Iterable[Any]) -> str:
+    return ",".join(_csv_field(value) for value in values) + "\n"
+
+
+def _copy(db: Session, table: str, columns: List[str], lines: Iterable[str]) -> None:
+    """Stream CSV lines into a table with COPY FROM STDIN on the session's connection."""
+    buffer = io.StringIO()
+    buffer.writelines(lines)
+    buffer.seek(0)
+    dbapi_connection = db.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+
+def _copy_outputs(db: Session, lines: List[str]) -> None:
+    """COPY output rows through the staging table, computing their search vectors."""
+    db.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS {OUTPUT_LOAD_TABLE} ("
+        "run_id integer, output bytea, output_compression varchar(16), "
+        "error_message bytea, error_compression varchar(16), "
+        f"{OUTPUT_PARAM} text, {ERROR_PARAM} text)"
+    ))
+    _copy(db, OUTPUT_LOAD_TABLE, OUTPUT_LOAD_COLUMNS, lines)
+
+    load = table(OUTPUT_LOAD_TABLE, *(column(name) for name in OUTPUT_LOAD_COLUMNS))
+    db.execute(insert(JobRunOutput).from_select(
+        OUTPUT_COLUMNS + ["search_vector"],
+        select(
+            *(load.c[name] for name in OUTPUT_COLUMNS),
+            search_vector(load.c[OUTPUT_PARAM], load.c[ERROR_PARAM])
+        )
+    ))
+    db.execute(text(f"TRUNCATE {OUTPUT_LOAD_TABLE}"))
+
+
+def _reserve_run_ids(db: Session, count: int) -> List[int]:
+    """Take count values from the job_run id sequence."""
+    result = db.execute(
+        text("SELECT nextval(pg_get_serial_sequence('job_run', 'id')) FROM generate_series(1, :count)"),
+        {"count": count}
+    )
+    return [row[0] for row in result]
+
+
+def copy_runs(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Write one batch of runs using the fastest path for the database.
+
+    Rows use the insert_runs() format (see the run_row_* builders).
+    The caller owns the transaction and is responsible for committing.
+
+    Returns:
+        Number of runs written
+    """
+    if not rows:
+        return 0
+
+    if db.get_bind().dialect.name != "postgresql":
+        insert_runs(db, rows)
+        return len(rows)
+
+    run_ids = _reserve_run_ids(db, len(rows))
+
+    # created_at/updated_at are left to their server defaults
+    _copy(db, JobRun.__tablename__, RUN_COLUMNS, (
+        _csv_line([run_id] + [row.get(column) for column in RUN_COLUMNS[1:]])
+        for run_id, row in zip(run_ids, rows)
+    ))
+
+    output_lines = []
+    for run_id, row in zip(run_ids, rows):
+        if all(row.get(field) is None for field in OUTPUT_FIELDS):
+            continue
+        output, output_compression = compress_text(row.get("output"))
+        error_message, error_compression = compress_text(row.get("error_message"))
+        output_lines.append(_csv_line([
+            run_id, output, output_compression, error_message, error_compression,
+            search_text(row.get("output")), search_text(row.get("error_message"))
+        ]))
+    if output_lines:
+        _copy_outputs(db, output_lines)
+
+    upsert_rollups(db, rows)
+    upsert_last_status(db, rows, run_ids)
+    note_runs_changed(db, {row["tenant_id"] for row in rows})
+
+    return len(rows)
+
+
+def _batches(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def bulk_load_runs(
+    db: Session,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Load runs from an iterable, committing after every batch.
+
+    Args:
+        db: Database session
+        rows: Run rows in the insert_runs() format; consumed lazily
+        batch_size: Rows per COPY (or executemany) and per commit
+
+    Returns:
+        Number of runs loaded
+    """
+    loaded = 0
+    for batch in _batches(rows, batch_size):
+        try:
+            loaded += copy_runs(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.error(f"Bulk load failed after {loaded} runs")
+            raise
+        logger.debug(f"Bulk loaded {loaded} runs")
+    return loaded
@@ -0,0 +1,113 @@
+"""
+In-process cache of endpoint metadata for agent-facing routes.
+
+Check-ins, heartbeats and job-instance reports only need an endpoint's
+tenant, token hash and status. Those rarely change, so they are cached by
+endpoint ID and routes that change them (enroll, update, revoke, heartbeat
+status changes) call invalidate_endpoint().
+
+The cache is per worker process; other workers pick up changes once their
+entry expires (endpoint_cache_ttl seconds).
+"""
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from crontopus_api.config import settings
+from crontopus_api.models import Endpoint, EndpointStatus
+from crontopus_api.utils.cache import TTLCache
+
+
+class EndpointInfo(NamedTuple):
+    """Cached subset of an endpoint row."""
+    id: int
+    tenant_id: str
+    name: str
+    token_hash: Optional[str]
+    status: EndpointStatus
+
+    @property
+    def is_revoked(self) -> bool:
+        return self.status == EndpointStatus.REVOKED
+
+
+_COLUMNS = (Endpoint.id, Endpoint.tenant_id, Endpoint.name, Endpoint.token_hash, Endpoint.status)
+
+_endpoints = TTLCache(
+    maxsize=settings.endpoint_cache_size,
+    ttl=settings.endpoint_cache_ttl,
+)
+
+
+async def get_endpoint_info(db: AsyncSession, endpoint_id: int) -> Optional[EndpointInfo]:
+    """
+    Get cached metadata for an endpoint, loading it on a miss.
+
+    Returns:
+        EndpointInfo, or None if the endpoint does not exist
+    """
+    info = _endpoints.get(endpoint_id)
+    if info is not None:
+        return info
+
+    result = await db.execute(select(*_COLUMNS).where(Endpoint.id == endpoint_id))
+    row = result.first()
+    if row is None:
+        return None
+
+    info = EndpointInfo(*row)
+    _endpoints.set(endpoint_id, info)
+    return info
+
+
+async def get_endpoint_infos(db: AsyncSession, endpoint_ids: Iterable[int]) -> Dict[int, EndpointInfo]:
+    """
+    Get cached metadata for many endpoints, loading all misses in one query.
+
+    Returns:
+        Mapping of endpoint ID to EndpointInfo (missing endpoints are omitted)
+    """
+    infos = {}
+    missing = []
+    for endpoint_id in set(endpoint_ids):
+        info = _endpoints.get(endpoint_id)
+        if info is None:
+            missing.append(endpoint_id)
+        else:
+            infos[endpoint_id] = info
+
+    if missing:
+        result = await db.execute(select(*_COLUMNS).where(Endpoint.id.in_(missing)))
+        for row in result:
+            info = EndpointInfo(*row)
+            _endpoints.set(info.id, info)
+            infos[info.id] = info
+
+    return infos
+
+
+def get_endpoint_info_sync(db: Session, endpoint_id: int) -> Optional[EndpointInfo]:
+    """Sync variant of get_endpoint_info() for routes on the sync session."""
+    info = _endpoints.get(endpoint_id)
+    if info is not None:
+        return info
+
+    row = db.execute(select(*_COLUMNS).where(Endpoint.id == endpoint_id)).first()
+    if row is None:
+        return None
+
+    info = EndpointInfo(*row)
+    _endpoints.set(endpoint_id, info)
+    return info
+
+
+def invalidate_endpoint(endpoint_id: int) -> None:
+    """Drop cached metadata for an endpoint."""
+    _endpoints.pop(endpoint_id)
+
+
+def clear_endpoint_cache() -> None:
+    """Drop all cached endpoint metadata."""
+    _endpoints.clear()
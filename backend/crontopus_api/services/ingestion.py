@@ -0,0 +1,241 @@
+"""
+Write-behind ingestion queue for job runs.
+
+In buffered ingestion mode, check-in routes validate the request, push the
+run row onto an in-process buffer and return 202 immediately. A background
+flusher group-commits buffered rows every flush interval, or sooner when
+enough rows have accumulated, so many check-ins share one transaction
+instead of each paying for its own commit.
+
+Trade-offs:
+- Buffered runs are lost if the worker is killed without a clean shutdown
+- Run IDs are only known after the flush, so clients get a provisional ID
+"""
+import asyncio
+import logging
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from crontopus_api.config import settings, SessionLocal
+from crontopus_api.services import metrics
+from crontopus_api.services.runs import insert_runs
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised when the ingestion buffer has reached its maximum size."""
+
+
+class PartialFlush(Exception):
+    """
+    Raised when a flush failed after committing part of its rows.
+
+    Attributes:
+        processed: Leading rows of the batch already committed or dropped
+    """
+
+    def __init__(self, processed: int):
+        super().__init__(f"Flush failed after {processed} rows")
+        self.processed = processed
+
+
+class RunIngestionQueue:
+    """
+    In-process buffer of job run rows with a group-committing flusher.
+
+    Usage:
+        await queue.start()
+        provisional_id = queue.enqueue(row)
+        ...
+        await queue.stop()  # drains remaining rows
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_interval_ms: int,
+        flush_max_rows: int,
+        max_size: int
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_rows = flush_max_rows
+        self.max_size = max_size
+        self._buffer: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        # Loop-bound primitives are created in start() on the serving loop
+        self._wakeup = None
+        self._flush_lock = None
+        self._task = None
+
+        self._flushed = metrics.counter(
+            "crontopus_ingestion_flushed_runs_total",
+            "Job runs written by the ingestion flusher"
+        )
+        self._dropped = metrics.counter(
+            "crontopus_ingestion_dropped_runs_total",
+            "Buffered job runs dropped because they could not be written"
+        )
+        self._flushes = metrics.counter(
+            "crontopus_ingestion_flushes_total",
+            "Group commits performed by the ingestion flusher"
+        )
+        metrics.gauge(
+            "crontopus_ingestion_queue_depth",
+            "Job runs waiting in the ingestion buffer",
+            callback=lambda: self.depth
+        )
+
+    @property
+    def depth(self) -> int:
+        """Number of buffered rows not yet written."""
+        return len(self._buffer)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def enqueue(self, row: Dict[str, Any]) -> str:
+        """
+        Buffer a job run row for the next group commit.
+
+        Returns:
+            Provisional ID identifying the buffered run
+
+        Raises:
+            QueueFull: If the buffer is full (caller should write synchronously)
+        """
+        if len(self._buffer) >= self.max_size:
+            raise QueueFull()
+        provisional_id = uuid.uuid4().hex
+        self._buffer.append((provisional_id, row))
+        if self._wakeup is not None and len(self._buffer) >= self.flush_max_rows:
+            self._wakeup.set()
+        return provisional_id
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Ingestion flusher started (interval={self.flush_interval * 1000:.0f}ms, "
+            f"max_rows={self.flush_max_rows})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain every buffered row."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            while self._buffer:
+                await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to drain ingestion buffer, {self.depth} runs lost: {e}")
+            self._dropped.inc(self.depth)
+            self._buffer.clear()
+            return
+        logger.info("Ingestion flusher stopped, buffer drained")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while self._buffer:
+                    await self.flush()
+                    if len(self._buffer) < self.flush_max_rows:
+                        break
+            except Exception as e:
+                logger.error(f"Ingestion flush failed: {e}", exc_info=True)
+
+    async def flush(self) -> int:
+        """
+        Write up to flush_max_rows buffered rows in one transaction.
+
+        Returns:
+            Number of rows written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            batch = []
+            while self._buffer and len(batch) < self.flush_max_rows:
+                batch.append(self._buffer.popleft())
+            if not batch:
+                return 0
+            try:
+                return await run_in_threadpool(self._write, [row for _, row in batch])
+            except PartialFlush as e:
+                # Committed rows must not be written again
+                self._buffer.extendleft(reversed(batch[e.processed:]))
+                raise
+            except Exception:
+                # Database unavailable: keep the rows for the next attempt
+                self._buffer.extendleft(reversed(batch))
+                raise
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Group-commit rows, isolating bad rows if the batch is rejected.
+
+        Raises:
+            PartialFlush: If writing rows individually failed partway for
+                another reason (e.g. the connection dropped)
+        """
+        db = self.session_factory()
+        try:
+            try:
+                insert_runs(db, rows)
+                db.commit()
+                written = len(rows)
+            except (DataError, IntegrityError) as e:
+                db.rollback()
+                logger.warning(f"Group commit of {len(rows)} runs failed, retrying individually: {e}")
+                written = 0
+                for processed, row in enumerate(rows):
+                    try:
+                        insert_runs(db, [row])
+                        db.commit()
+                        written += 1
+                    except (DataError, IntegrityError) as row_error:
+                        db.rollback()
+                        self._dropped.inc()
+                        logger.error(f"Dropping buffered run for job {row.get('job_name')}: {row_error}")
+                    except Exception as row_error:
+                        db.rollback()
+                        self._flushed.inc(written)
+                        raise PartialFlush(processed) from row_error
+            self._flushes.inc()
+            self._flushed.inc(written)
+            return written
+        finally:
+            db.close()
+
+
+ingestion_queue = RunIngestionQueue(
+    session_factory=SessionLocal,
+    flush_interval_ms=settings.ingestion_flush_interval_ms,
+    flush_max_rows=settings.ingestion_flush_max_rows,
+    max_size=settings.ingestion_queue_max_size,
+)
+
+
+def buffered_ingestion_enabled() -> bool:
+    """Whether check-ins should be written through the ingestion queue."""
+    return settings.ingestion_mode == "buffered" and ingestion_queue.running
@@ -0,0 +1,189 @@
+"""
+Latest run per job (job_last_status).
+
+insert_runs() and the bulk loader call upsert_last_status() with the runs
+they write, in the same transaction, so the table stays consistent with
+job_run without a background job. Runs are folded per key in Python
+first, in (started_at, id) order, then applied with INSERT ... ON
+CONFLICT DO UPDATE. The update only applies when the incoming run is
+newer than the stored one, so late historical runs (imports, replayed
+spools) never replace a newer status.
+
+Consecutive failures: FAILURE and TIMEOUT add one, SUCCESS resets the
+count, RUNNING and CANCELLED leave it unchanged. Runs older than the
+stored run are ignored: the stored (started_at, last_run_id) of the
+batch's keys is read (and locked) before folding, and older runs are
+dropped, so batches mixing old and new runs count only the new ones.
+
+rebuild_last_status() recomputes the table from job_run, for backfilling
+it on databases other than PostgreSQL (where the migration adding the
+table does) and for repairs (see scripts/rebuild_last_status.py).
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+
+from crontopus_api.models import JobLastStatus, JobRun, JobStatus
+from crontopus_api.services.rollups import REBUILD_CHUNK_SIZE, dialect_insert
+
+# Key columns of job_last_status
+KEY_COLUMNS = ("tenant_id", "namespace", "job_name", "endpoint_id")
+
+# Statuses counted as consecutive failures
+FAILURE_STATUSES = (JobStatus.FAILURE, JobStatus.TIMEOUT)
+
+
+def _as_utc(value: Optional[datetime]) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _key(row: Dict[str, Any]) -> Tuple:
+    return (row["tenant_id"], row.get("namespace") or "", row["job_name"], row.get("endpoint_id") or 0)
+
+
+def fold_runs(
+    rows: List[Dict[str, Any]],
+    run_ids: List[int],
+    stored: Optional[Dict[Tuple, Tuple[datetime, int]]] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Fold runs into one job_last_status row per key.
+
+    Args:
+        rows: Run rows in the insert_runs() format
+        run_ids: IDs of the inserted runs, in row order
+        stored: (started_at, last_run_id) of the stored row per key;
+            runs not newer than it are skipped
+
+    Returns:
+        (rows whose runs include a success, other rows), each sorted by
+        key. The first replace the stored consecutive_failures; the
+        others add to it.
+    """
+    stored = stored or {}
+    states: Dict[Tuple, Dict[str, Any]] = {}
+    runs = sorted(zip(run_ids, rows), key=lambda run: (_as_utc(run[1].get("started_at")), run[0]))
+    for run_id, row in runs:
+        key = _key(row)
+        if key in stored and (_as_utc(row.get("started_at")), run_id) <= stored[key]:
+            continue
+        state = states.get(key)
+        if state is None:
+            state = dict(zip(KEY_COLUMNS, key), consecutive_failures=0, reset=False)
+            states[key] = state
+
+        status = JobStatus(row["status"])
+        if status in FAILURE_STATUSES:
+            state["consecutive_failures"] += 1
+        elif status == JobStatus.SUCCESS:
+            state["consecutive_failures"] = 0
+            state["reset"] = True
+        state.update(
+            last_run_id=run_id,
+            status=status,
+            started_at=_as_utc(row.get("started_at")),
+            finished_at=row.get("finished_at")
+        )
+
+    reset_rows, continued_rows = [], []
+    for key in sorted(states):
+        state = states[key]
+        (reset_rows if state.pop("reset") else continued_rows).append(state)
+    return reset_rows, continued_rows
+
+
+def _stored_runs(db: Session, rows: List[Dict[str, Any]]) -> Dict[Tuple, Tuple[datetime, int]]:
+    """Lock and read (started_at, last_run_id) of the stored rows of the runs' keys."""
+    keys = sorted({_key(row) for row in rows})
+    if not keys:
+        return {}
+    key_columns = [getattr(JobLastStatus, column) for column in KEY_COLUMNS]
+    result = db.execute(
+        select(*key_columns, JobLastStatus.started_at, JobLastStatus.last_run_id)
+        .where(tuple_(*key_columns).in_(keys))
+        .order_by(*key_columns)
+        .with_for_update()
+    )
+    return {
+        tuple(row[:len(KEY_COLUMNS)]): (_as_utc(row.started_at), row.last_run_id)
+        for row in result
+    }
+
+
+def upsert_last_status(db: Session, rows: List[Dict[str, Any]], run_ids: List[int]) -> None:
+    """
+    Record newly inserted runs as their jobs' latest runs.
+
+    Must run in the transaction that inserts the runs. The caller is
+    responsible for committing.
+
+    Args:
+        db: Database session
+        rows: Newly inserted run rows in the insert_runs() format
+        run_ids: IDs of the inserted runs, in row order
+    """
+    reset_rows, continued_rows = fold_runs(rows, run_ids, _stored_runs(db, rows))
+    insert, _ = dialect_insert(db)
+    table = JobLastStatus.__table__
+
+    for values, reset in ((reset_rows, True), (continued_rows, False)):
+        if not values:
+            continue
+        statement = insert(table)
+        excluded = statement.excluded
+        set_ = {column: excluded[column] for column in ("last_run_id", "status", "started_at", "finished_at")}
+        set_["consecutive_failures"] = (
+            excluded.consecutive_failures if reset
+            else table.c.consecutive_failures + excluded.consecutive_failures
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(KEY_COLUMNS),
+                set_=set_,
+                where=tuple_(table.c.started_at, table.c.last_run_id) < tuple_(excluded.started_at, excluded.last_run_id)
+            ),
+            values
+        )
+
+
+def rebuild_last_status(db: Session, tenant_id: Optional[str] = None) -> int:
+    """
+    Recompute job_last_status from job_run.
+
+    Deletes the rows in scope and replays the matching runs oldest first
+    in the caller's transaction. The caller is responsible for committing.
+
+    Args:
+        db: Database session
+        tenant_id: Only rebuild this tenant (default: all tenants)
+
+    Returns:
+        Number of runs replayed
+    """
+    run_filters = []
+    status_filters = []
+    if tenant_id is not None:
+        run_filters.append(JobRun.tenant_id == tenant_id)
+        status_filters.append(JobLastStatus.tenant_id == tenant_id)
+    db.execute(delete(JobLastStatus).where(*status_filters))
+
+    columns = [
+        JobRun.id, JobRun.tenant_id, JobRun.namespace, JobRun.job_name, JobRun.endpoint_id,
+        JobRun.status, JobRun.started_at, JobRun.finished_at,
+    ]
+    result = db.execute(
+        select(*columns).where(*run_filters).order_by(JobRun.started_at, JobRun.id)
+        .execution_options(yield_per=REBUILD_CHUNK_SIZE)
+    )
+
+    replayed = 0
+    for chunk in result.mappings().partitions():
+        upsert_last_status(db, [dict(row) for row in chunk], [row["id"] for row in chunk])
+        replayed += len(chunk)
+    return replayed
@@ -0,0 +1,106 @@
+"""
+Minimal in-process metrics registry.
+
+Exposes counters and gauges in the Prometheus text format via GET /metrics.
+Values are per worker process; scrape each worker or aggregate downstream.
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    inner = ",".join(f'{name}="{value}"' for name, value in key)
+    return "{" + inner + "}"
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for key, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally computed on scrape."""
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, description)
+        self._callback = callback
+
+    def set(self, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def samples(self) -> List[Tuple[LabelKey, float]]:
+        if self._callback is not None:
+            return [((), self._callback())]
+        return super().samples()
+
+
+_registry: Dict[str, _Metric] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(metric: _Metric) -> _Metric:
+    with _registry_lock:
+        existing = _registry.get(metric.name)
+        if existing is not None:
+            return existing
+        _registry[metric.name] = metric
+        return metric
+
+
+def counter(name: str, description: str) -> Counter:
+    """Get or create a counter."""
+    return _register(Counter(name, description))
+
+
+def gauge(name: str, description: str, callback: Optional[Callable[[], float]] = None) -> Gauge:
+    """Get or create a gauge."""
+    return _register(Gauge(name, description, callback))
+
+
+def render_metrics() -> str:
+    """Render all registered metrics in the Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,318 @@
+"""
+Monthly range partitions of job_run (PostgreSQL).
+
+On PostgreSQL job_run is partitioned by started_at: one partition per
+calendar month (job_run_pYYYYMM, UTC bounds), a job_run_legacy partition
+holding history from before partitioning, and a job_run_default partition
+catching runs outside every monthly range. Time-windowed queries only
+scan the partitions their started_at range overlaps, and expiring a month
+of history is a DETACH + DROP instead of a row-by-row DELETE.
+
+A background task (PartitionMaintenance) creates partitions
+run_partition_months_ahead months in advance and, when
+run_partition_retention_months is set, drops partitions that have aged
+out. Other databases (SQLite in development) keep a plain job_run table
+and maintenance does nothing.
+
+Side tables (job_run_output, job_run_output_segment,
+checkin_idempotency_key) cannot have foreign keys to a partitioned table
+on id alone, so dropping a partition deletes their rows explicitly.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from crontopus_api.config import settings, SessionLocal
+from crontopus_api.services import metrics
+from crontopus_api.services.view_cache import ALL_TENANTS, note_runs_changed
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "job_run_p"
+DEFAULT_PARTITION = "job_run_default"
+
+# Tables holding per-run rows keyed by run_id
+RUN_SIDE_TABLES = ("job_run_output", "job_run_output_segment", "checkin_idempotency_key")
+
+# Advisory lock key serializing partition changes across workers
+MAINTENANCE_LOCK_ID = 7_412_031_916
+
+
+class Partition(NamedTuple):
+    """A job_run partition; None bounds are MINVALUE/MAXVALUE (or DEFAULT)."""
+    name: str
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+    is_default: bool
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant (UTC) of the month containing value."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether job_run is a partitioned table (PostgreSQL only)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('job_run'))"
+    )).scalar())
+
+
+def list_partitions(db: Session) -> List[Partition]:
+    """Partitions of job_run with their bounds, oldest first."""
+    rows = db.execute(text("""
+        SELECT c.relname AS name,
+               (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'FROM \\(''([^'']*)''\\)'))[1]::timestamptz AS lower,
+               (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \\(''([^'']*)''\\)'))[1]::timestamptz AS upper,
+               pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT' AS is_default
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('job_run')
+    """))
+    partitions = [Partition(row.name, row.lower, row.upper, row.is_default) for row in rows]
+    return sorted(partitions, key=lambda p: (p.is_default, p.lower or datetime.min.replace(tzinfo=timezone.utc)))
+
+
+def _overlaps(partition: Partition, lower: datetime, upper: datetime) -> bool:
+    if partition.is_default:
+        return False
+    return (partition.lower is None or partition.lower < upper) and (partition.upper is None or partition.upper > lower)
+
+
+def create_partition(db: Session, month: datetime) -> str:
+    """
+    Create the partition for one month.
+
+    Runs that landed in the default partition for that month are moved
+    into the new partition before it is attached. The caller is
+    responsible for committing.
+
+    Returns:
+        Name of the new partition
+    """
+    name = partition_name(month)
+    lower, upper = month, add_months(month, 1)
+    bounds = {"lower": lower, "upper": upper}
+
+    db.execute(text(f"CREATE TABLE {name} (LIKE job_run INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    if any(p.is_default for p in list_partitions(db)):
+        db.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE started_at >= :lower AND started_at < :upper
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """), bounds)
+    # Partition bounds must be literals; both come from month arithmetic
+    db.execute(text(
+        f"ALTER TABLE job_run ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    ))
+    return name
+
+
+def drop_partition(db: Session, partition: Partition) -> None:
+    """
+    Detach and drop a partition along with its runs' side table rows.
+
+    The caller is responsible for committing.
+    """
+    for table in RUN_SIDE_TABLES:
+        db.execute(text(f"DELETE FROM {table} WHERE run_id IN (SELECT id FROM {partition.name})"))
+    db.execute(text(f"ALTER TABLE job_run DETACH PARTITION {partition.name}"))
+    db.execute(text(f"DROP TABLE {partition.name}"))
+    note_runs_changed(db, ALL_TENANTS)
+
+
+def _lock(db: Session) -> None:
+    """Serialize partition changes across workers until the transaction ends."""
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_ID})
+
+
+def ensure_partitions(db: Session, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+    """
+    Create missing monthly partitions from the current month on.
+
+    Each partition is created in its own transaction, under an advisory
+    lock, so locks on job_run are held briefly and concurrent workers do
+    not race.
+
+    Returns:
+        Names of the partitions created
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        _lock(db)
+        if any(_overlaps(p, month, add_months(month, 1)) for p in list_partitions(db)):
+            db.rollback()
+            continue
+        created.append(create_partition(db, month))
+        db.commit()
+    return created
+
+
+def drop_partitions_before(db: Session, cutoff: datetime) -> List[str]:
+    """
+    Drop partitions whose whole range is older than cutoff.
+
+    The default partition is never dropped; its old runs are left to
+    row-level deletes. Each partition is dropped in its own transaction.
+
+    Returns:
+        Names of the partitions dropped
+    """
+    dropped = []
+    for candidate in list_partitions(db):
+        if candidate.is_default or candidate.upper is None or candidate.upper > cutoff:
+            continue
+        _lock(db)
+        if candidate not in list_partitions(db):
+            db.rollback()
+            continue
+        drop_partition(db, candidate)
+        db.commit()
+        dropped.append(candidate.name)
+    return dropped
+
+
+def maintain_partitions(
+    db: Session,
+    months_ahead: int,
+    retention_months: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Create upcoming partitions and drop expired ones.
+
+    Safe to run from every worker at once (see ensure_partitions()).
+
+    Args:
+        db: Database session
+        months_ahead: Months after the current one to create partitions for
+        retention_months: Drop partitions entirely older than this many
+            months before the current month (None keeps everything)
+        now: Current time (for tests)
+
+    Returns:
+        (created partition names, dropped partition names)
+    """
+    if not is_partitioned(db):
+        return [], []
+
+    try:
+        created = ensure_partitions(db, months_ahead, now)
+        dropped = []
+        if retention_months is not None:
+            cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+            dropped = drop_partitions_before(db, cutoff)
+    except Exception:
+        db.rollback()
+        raise
+    return created, dropped
+
+
+class PartitionMaintenance:
+    """
+    Background task running maintain_partitions() periodically.
+
+    Usage:
+        await maintenance.start()  # runs once immediately, then every interval
+        ...
+        await maintenance.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: int,
+        months_ahead: int,
+        retention_months: Optional[int]
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_seconds
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self._task = None
+
+        self._created = metrics.counter(
+            "crontopus_run_partitions_created_total",
+            "job_run partitions created by partition maintenance"
+        )
+        self._dropped = metrics.counter(
+            "crontopus_run_partitions_dropped_total",
+            "job_run partitions dropped by partition maintenance"
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the maintenance loop."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the maintenance loop (an in-progress run finishes in its thread)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def run_once(self) -> Tuple[List[str], List[str]]:
+        """Run maintenance in a fresh session."""
+        db = self.session_factory()
+        try:
+            created, dropped = maintain_partitions(db, self.months_ahead, self.retention_months)
+        finally:
+            db.close()
+        if created:
+            self._created.inc(len(created))
+            logger.info(f"Created job_run partitions: {', '.join(created)}")
+        if dropped:
+            self._dropped.inc(len(dropped))
+            logger.info(f"Dropped expired job_run partitions: {', '.join(dropped)}")
+        return created, dropped
+
+
+partition_maintenance = PartitionMaintenance(
+    session_factory=SessionLocal,
+    interval_seconds=settings.run_partition_maintenance_interval,
+    months_ahead=settings.run_partition_months_ahead,
+    retention_months=settings.run_partition_retention_months,
+)
@@ -0,0 +1,348 @@
+"""
+Run retention.
+
+Applies RunRetentionPolicy rows: deletes runs that started more than
+retention_days ago and runs beyond the newest keep_last of each job.
+
+Deletion never runs as one large statement. Each batch selects up to
+run_retention_batch_size run ids (oldest first through the
+(tenant_id, started_at, id) index for the age rule, by row_number() per
+job for keep-last-N), deletes their side table rows and then the runs by
+primary key, and commits. Check-ins therefore only ever wait on a single
+small batch, and on PostgreSQL every batch runs with a lock_timeout so
+retention backs off (and retries on the next pass) rather than queueing
+behind ingestion.
+
+Rollups are left alone: hourly aggregates outlive the raw runs they
+summarize. Archived runs are pruned by the archiver (see
+services/archive.py), which also applies a tenant's policies before
+archiving its runs.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from crontopus_api.config import settings, SessionLocal
+from crontopus_api.models import (
+    CheckinIdempotencyKey,
+    JobRun,
+    JobRunOutput,
+    JobRunOutputSegment,
+    RunRetentionPolicy,
+)
+from crontopus_api.services import metrics
+from crontopus_api.services.view_cache import note_runs_changed
+from crontopus_api.utils.locks import try_advisory_lock
+
+logger = logging.getLogger(__name__)
+
+# Rules a policy can apply, in the order they run
+RULE_AGE = "age"
+RULE_KEEP_LAST = "keep_last"
+
+# Advisory lock key ensuring one worker applies retention at a time
+RETENTION_LOCK_ID = 7_412_031_917
+
+# Called after each committed batch with (rule, runs deleted)
+BatchCallback = Callable[[str, int], None]
+
+
+def policy_scope(policy: RunRetentionPolicy, overridden_namespaces: List[str]) -> list:
+    """
+    Filters selecting the runs a policy governs.
+
+    A tenant-wide policy (namespace '') skips namespaces that have a
+    policy of their own.
+    """
+    conditions = [JobRun.tenant_id == policy.tenant_id]
+    if policy.namespace:
+        conditions.append(JobRun.namespace == policy.namespace)
+    elif overridden_namespaces:
+        conditions.append(or_(JobRun.namespace.is_(None), JobRun.namespace.notin_(overridden_namespaces)))
+    return conditions
+
+
+def expired_run_ids(db: Session, scope: list, cutoff: datetime, limit: int) -> List[int]:
+    """Oldest runs in scope that started before cutoff."""
+    return list(db.scalars(
+        select(JobRun.id)
+        .where(*scope, JobRun.started_at < cutoff)
+        .order_by(JobRun.started_at, JobRun.id)
+        .limit(limit)
+    ))
+
+
+def excess_run_ids(db: Session, scope: list, keep_last: int, limit: int) -> List[int]:
+    """Runs in scope beyond the newest keep_last of their job."""
+    ranked = select(
+        JobRun.id,
+        func.row_number().over(
+            partition_by=(JobRun.namespace, JobRun.job_name),
+            order_by=(JobRun.started_at.desc(), JobRun.id.desc())
+        ).label("rank")
+    ).where(*scope).subquery()
+    return list(db.scalars(select(ranked.c.id).where(ranked.c.rank > keep_last).limit(limit)))
+
+
+def delete_runs(db: Session, run_ids: List[int]) -> int:
+    """
+    Delete runs and their side table rows by id.
+
+    The caller is responsible for committing.
+
+    Returns:
+        Number of runs deleted
+    """
+    for model in (JobRunOutput, JobRunOutputSegment, CheckinIdempotencyKey):
+        db.execute(
+            delete(model).where(model.run_id.in_(run_ids)),
+            execution_options={"synchronize_session": False}
+        )
+    result = db.execute(
+        delete(JobRun).where(JobRun.id.in_(run_ids)),
+        execution_options={"synchronize_session": False}
+    )
+    return result.rowcount
+
+
+def set_batch_lock_timeout(db: Session, lock_timeout_ms: int) -> None:
+    """Bound how long a batch waits for locks held by ingestion (PostgreSQL)."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+
+
+def apply_policy(
+    db: Session,
+    policy: RunRetentionPolicy,
+    overridden_namespaces: List[str],
+    batch_size: int,
+    lock_timeout_ms: int,
+    batch_pause: float = 0.0,
+    now: Optional[datetime] = None,
+    on_batch: Optional[BatchCallback] = None
+) -> Dict[str, int]:
+    """
+    Delete the runs a policy no longer keeps, one committed batch at a time.
+
+    Args:
+        db: Database session
+        policy: Policy to apply
+        overridden_namespaces: Namespaces with their own policy (see policy_scope())
+        batch_size: Runs deleted per transaction
+        lock_timeout_ms: Lock wait limit per batch (PostgreSQL)
+        batch_pause: Seconds to sleep between batches
+        now: Current time (for tests)
+        on_batch: Called after each committed batch
+
+    Returns:
+        Runs deleted per rule
+
+    Raises:
+        OperationalError: A batch timed out waiting for a lock; earlier
+            batches stay committed
+    """
+    now = now or datetime.now(timezone.utc)
+    scope = policy_scope(policy, overridden_namespaces)
+
+    rules = []
+    if policy.retention_days is not None:
+        cutoff = now - timedelta(days=policy.retention_days)
+        rules.append((RULE_AGE, lambda: expired_run_ids(db, scope, cutoff, batch_size)))
+    if policy.keep_last is not None:
+        keep_last = policy.keep_last
+        rules.append((RULE_KEEP_LAST, lambda: excess_run_ids(db, scope, keep_last, batch_size)))
+
+    deleted = {RULE_AGE: 0, RULE_KEEP_LAST: 0}
+    for rule, next_batch in rules:
+        while True:
+            set_batch_lock_timeout(db, lock_timeout_ms)
+            run_ids = next_batch()
+            if not run_ids:
+                db.commit()
+                break
+            count = delete_runs(db, run_ids)
+            note_runs_changed(db, [policy.tenant_id])
+            db.commit()
+            deleted[rule] += count
+            if on_batch is not None:
+                on_batch(rule, count)
+            if len(run_ids) < batch_size:
+                break
+            if batch_pause:
+                time.sleep(batch_pause)
+
+    policy.last_applied_at = now
+    policy.last_deleted_count = sum(deleted.values())
+    db.commit()
+    return deleted
+
+
+def apply_retention(
+    db: Session,
+    batch_size: int,
+    lock_timeout_ms: int,
+    batch_pause: float = 0.0,
+    now: Optional[datetime] = None,
+    on_batch: Optional[BatchCallback] = None,
+    tenant_id: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Apply every tenant's retention policies.
+
+    A policy whose batch hits the lock timeout is skipped until the next
+    pass; the remaining policies still run.
+
+    Args:
+        tenant_id: Only apply this tenant's policies (default: all tenants)
+
+    Returns:
+        Runs deleted per rule across all policies
+    """
+    tenant_filters = []
+    if tenant_id is not None:
+        tenant_filters.append(RunRetentionPolicy.tenant_id == tenant_id)
+    policies = db.scalars(
+        select(RunRetentionPolicy).where(*tenant_filters)
+        .order_by(RunRetentionPolicy.tenant_id, RunRetentionPolicy.namespace)
+    ).all()
+    overridden = defaultdict(list)
+    for policy in policies:
+        if policy.namespace:
+            overridden[policy.tenant_id].append(policy.namespace)
+
+    totals = {RULE_AGE: 0, RULE_KEEP_LAST: 0}
+    for policy in policies:
+        tenant_id, namespace = policy.tenant_id, policy.namespace
+        try:
+            deleted = apply_policy(
+                db, policy, overridden[tenant_id], batch_size, lock_timeout_ms,
+                batch_pause=batch_pause, now=now, on_batch=on_batch
+            )
+        except OperationalError as e:
+            db.rollback()
+            logger.warning(f"Retention for {tenant_id}/{namespace or '*'} deferred: {e.orig}")
+            continue
+        for rule, count in deleted.items():
+            totals[rule] += count
+    return totals
+
+
+class RunRetention:
+    """
+    Background task running apply_retention() periodically.
+
+    Usage:
+        await retention.start()  # runs once immediately, then every interval
+        ...
+        await retention.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: int,
+        batch_size: int,
+        batch_pause_ms: int,
+        lock_timeout_ms: int
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause_ms / 1000
+        self.lock_timeout_ms = lock_timeout_ms
+        self._task = None
+
+        self._deleted = metrics.counter(
+            "crontopus_retention_runs_deleted_total",
+            "Runs deleted by retention policies"
+        )
+        self._batches = metrics.counter(
+            "crontopus_retention_batches_total",
+            "Retention delete batches committed"
+        )
+        self._last_pass = metrics.gauge(
+            "crontopus_retention_last_pass_timestamp_seconds",
+            "Unix time the last retention pass finished"
+        )
+        self._last_duration = metrics.gauge(
+            "crontopus_retention_last_pass_duration_seconds",
+            "Duration of the last retention pass"
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the retention loop."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the retention loop (an in-progress pass finishes its current policy in its thread)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                logger.error(f"Run retention failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def _record_batch(self, rule: str, count: int) -> None:
+        self._deleted.inc(count, labels={"rule": rule})
+        self._batches.inc(labels={"rule": rule})
+
+    def run_once(self) -> Optional[Dict[str, int]]:
+        """
+        Run one retention pass in a fresh session.
+
+        Returns:
+            Runs deleted per rule, or None if another worker holds the pass
+        """
+        started = time.monotonic()
+        db = self.session_factory()
+        try:
+            with try_advisory_lock(db, RETENTION_LOCK_ID) as acquired:
+                if not acquired:
+                    return None
+                deleted = apply_retention(
+                    db, self.batch_size, self.lock_timeout_ms,
+                    batch_pause=self.batch_pause, on_batch=self._record_batch
+                )
+        finally:
+            db.close()
+
+        self._last_pass.set(time.time())
+        self._last_duration.set(time.monotonic() - started)
+        if any(deleted.values()):
+            logger.info(
+                f"Retention deleted {deleted[RULE_AGE]} expired and "
+                f"{deleted[RULE_KEEP_LAST]} excess runs"
+            )
+        return deleted
+
+
+run_retention = RunRetention(
+    session_factory=SessionLocal,
+    interval_seconds=settings.run_retention_interval,
+    batch_size=settings.run_retention_batch_size,
+    batch_pause_ms=settings.run_retention_batch_pause_ms,
+    lock_timeout_ms=settings.run_retention_lock_timeout_ms,
+)
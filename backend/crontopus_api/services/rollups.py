@@ -0,0 +1,565 @@
+"""
+Hourly job run rollups.
+
+Check-ins do not touch the rollup tables: insert_runs() calls
+queue_rollups() to append one job_run_rollup_pending row per run, in the
+run's transaction. Upserting the rollups inline cost a check-in two more
+statements on contended rows and roughly halved sync check-in throughput
+on PostgreSQL. RollupCompactor instead folds queued runs into the rollups
+every run_rollup_compaction_interval seconds with compact_rollups(), so
+rollup-backed views (days > 1) trail check-ins by about that long. The
+bulk loader, which writes thousands of runs per transaction, still calls
+upsert_rollups() directly.
+
+upsert_rollups() aggregates runs per rollup key in Python first, then
+applies them with one INSERT ... ON CONFLICT DO UPDATE per table that
+adds to the existing counters.
+
+Rollups of any set of hours merge by addition. histogram_percentiles()
+estimates duration percentiles from the merged duration buckets.
+
+rebuild_rollups() recomputes rollups from job_run, for repairing them
+after runs were written outside insert_runs() (see
+scripts/rebuild_rollups.py). It only rebuilds hours for which job_run
+still holds every run, so rollups outlive deleted runs.
+"""
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from crontopus_api.config import settings, SessionLocal
+from crontopus_api.models import JobRun, JobRunRollupDuration, JobRunRollupHourly, JobRunRollupPending, JobStatus
+from crontopus_api.services import metrics
+from crontopus_api.services.view_cache import note_runs_changed
+from crontopus_api.utils.locks import try_advisory_lock
+
+logger = logging.getLogger(__name__)
+
+# Rollup rows key columns
+KEY_COLUMNS = ("tenant_id", "namespace", "job_name", "endpoint_id", "hour")
+
+# Status -> counter column on JobRunRollupHourly
+STATUS_COLUMNS = {status: f"{status.value}_count" for status in JobStatus}
+
+# Duration buckets grow by this factor, so a bucket's upper bound is within
+# ~10% of any duration in it
+DURATION_BUCKET_GROWTH = 1.1
+
+RollupKey = Tuple[str, str, str, int, datetime]
+
+# Runs of one job: (tenant_id, namespace, job_name)
+JOB_KEY_COLUMNS = ("tenant_id", "namespace", "job_name")
+JobKey = Tuple[str, str, str]
+
+REBUILD_CHUNK_SIZE = 10000
+
+# Advisory lock key held while folding queued runs into the rollups;
+# rebuild_rollups() callers hold it too
+ROLLUP_COMPACTION_LOCK_ID = 7_412_031_921
+
+
+def rollup_hour(started_at: Optional[datetime]) -> datetime:
+    """Truncate a start time to its UTC hour (naive times are taken as UTC)."""
+    if started_at is None:
+        started_at = datetime.now(timezone.utc)
+    elif started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    else:
+        started_at = started_at.astimezone(timezone.utc)
+    return started_at.replace(minute=0, second=0, microsecond=0)
+
+
+def duration_bucket(duration: int) -> int:
+    """
+    Histogram bucket for a duration in seconds.
+
+    Bucket 0 holds durations <= 0; bucket b >= 1 holds durations in
+    (g^(b-2), g^(b-1)] where g is DURATION_BUCKET_GROWTH.
+    """
+    if duration <= 0:
+        return 0
+    return 1 + math.ceil(math.log(duration) / math.log(DURATION_BUCKET_GROWTH) - 1e-9)
+
+
+def duration_bucket_upper_bound(bucket: int) -> float:
+    """Largest duration (seconds) that falls into a bucket."""
+    if bucket <= 0:
+        return 0.0
+    return DURATION_BUCKET_GROWTH ** (bucket - 1)
+
+
+def histogram_percentiles(buckets: Iterable[Tuple[int, int]], quantiles: Sequence[float]) -> List[float]:
+    """
+    Estimate duration percentiles from (merged) histogram buckets.
+
+    Each percentile is the upper bound of the bucket holding its
+    nearest-rank duration, so it overestimates by at most
+    DURATION_BUCKET_GROWTH; callers may clamp it to the exact min/max.
+
+    Args:
+        buckets: (bucket, count) pairs sorted by bucket
+        quantiles: Quantiles between 0 and 1, ascending
+
+    Returns:
+        One duration (seconds) per quantile, or [] without any durations
+    """
+    buckets = list(buckets)
+    total = sum(count for _, count in buckets)
+    if total == 0:
+        return []
+
+    estimates = []
+    seen = 0
+    remaining = iter(buckets)
+    for quantile in quantiles:
+        rank = max(1, math.ceil(quantile * total))
+        while seen < rank:
+            bucket, count = next(remaining)
+            seen += count
+        estimates.append(duration_bucket_upper_bound(bucket))
+    return estimates
+
+
+def _rollup_key(row: Dict[str, Any]) -> RollupKey:
+    return (
+        row["tenant_id"],
+        row.get("namespace") or "",
+        row["job_name"],
+        row.get("endpoint_id") or 0,
+        rollup_hour(row.get("started_at")),
+    )
+
+
+def aggregate_runs(
+    rows: Iterable[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Aggregate run rows into rollup and duration bucket rows.
+
+    Args:
+        rows: Run rows in the insert_runs() format (only key columns,
+            status, started_at and duration are read)
+
+    Returns:
+        (rollup rows, duration bucket rows), each with unique keys and
+        sorted by key so concurrent upserts lock rows in the same order
+    """
+    rollups: Dict[RollupKey, Dict[str, Any]] = {}
+    buckets: Dict[Tuple[RollupKey, int], int] = {}
+
+    for row in rows:
+        key = _rollup_key(row)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = dict(zip(KEY_COLUMNS, key))
+            rollup.update({column: 0 for column in STATUS_COLUMNS.values()})
+            rollup.update(
+                run_count=0, duration_count=0, duration_sum=0, duration_sum_squares=0,
+                duration_min=None, duration_max=None
+            )
+            rollups[key] = rollup
+
+        rollup["run_count"] += 1
+        rollup[STATUS_COLUMNS[JobStatus(row["status"])]] += 1
+
+        duration = row.get("duration")
+        if duration is not None:
+            rollup["duration_count"] += 1
+            rollup["duration_sum"] += duration
+            rollup["duration_sum_squares"] += duration * duration
+            if rollup["duration_min"] is None or duration < rollup["duration_min"]:
+                rollup["duration_min"] = duration
+            if rollup["duration_max"] is None or duration > rollup["duration_max"]:
+                rollup["duration_max"] = duration
+            bucket_key = (key, duration_bucket(duration))
+            buckets[bucket_key] = buckets.get(bucket_key, 0) + 1
+
+    rollup_rows = [rollups[key] for key in sorted(rollups)]
+    bucket_rows = [
+        {**dict(zip(KEY_COLUMNS, key)), "bucket": bucket, "count": buckets[(key, bucket)]}
+        for key, bucket in sorted(buckets)
+    ]
+    return rollup_rows, bucket_rows
+
+
+def dialect_insert(db: Session):
+    """INSERT construct with ON CONFLICT support for the session's database."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Run rollups are not supported on {dialect}")
+    return insert, dialect
+
+
+def upsert_rollups(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Add runs to their hourly rollups.
+
+    Must run in the transaction that inserts the runs (bulk loader) or
+    removes them from the queue (compact_rollups()). The caller is
+    responsible for committing.
+
+    Args:
+        db: Database session
+        rows: Run rows in the insert_runs() format
+    """
+    rollup_rows, bucket_rows = aggregate_runs(rows)
+    if not rollup_rows:
+        return
+
+    insert, dialect = dialect_insert(db)
+    # Scalar min()/max() take two arguments on SQLite; PostgreSQL has least()/greatest()
+    least = func.least if dialect == "postgresql" else func.min
+    greatest = func.greatest if dialect == "postgresql" else func.max
+
+    table = JobRunRollupHourly.__table__
+    statement = insert(table)
+    excluded = statement.excluded
+    counters = ["run_count", "duration_count", "duration_sum", "duration_sum_squares"] + list(STATUS_COLUMNS.values())
+    set_ = {column: table.c[column] + excluded[column] for column in counters}
+    set_["duration_min"] = least(
+        func.coalesce(table.c.duration_min, excluded.duration_min),
+        func.coalesce(excluded.duration_min, table.c.duration_min)
+    )
+    set_["duration_max"] = greatest(
+        func.coalesce(table.c.duration_max, excluded.duration_max),
+        func.coalesce(excluded.duration_max, table.c.duration_max)
+    )
+    db.execute(statement.on_conflict_do_update(index_elements=list(KEY_COLUMNS), set_=set_), rollup_rows)
+
+    if bucket_rows:
+        table = JobRunRollupDuration.__table__
+        statement = insert(table)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(KEY_COLUMNS) + ["bucket"],
+                set_={"count": table.c["count"] + statement.excluded["count"]}
+            ),
+            bucket_rows
+        )
+
+
+def queue_rollups(db: Session, rows: List[Dict[str, Any]], run_ids: List[int]) -> None:
+    """
+    Queue newly inserted runs for the rollup compactor.
+
+    Must run in the transaction that inserts the runs. The caller is
+    responsible for committing.
+
+    Args:
+        db: Database session
+        rows: Newly inserted run rows in the insert_runs() format
+        run_ids: IDs of the inserted runs, in the same order
+    """
+    if not rows:
+        return
+    db.execute(insert(JobRunRollupPending), [
+        {
+            **dict(zip(KEY_COLUMNS, _rollup_key(row))),
+            "run_id": run_id,
+            "status": JobStatus(row["status"]),
+            "duration": row.get("duration"),
+        }
+        for run_id, row in zip(run_ids, rows)
+    ])
+
+
+def compact_rollups(db: Session, batch_size: int) -> int:
+    """
+    Fold queued runs into their rollups, oldest first.
+
+    Each batch is removed from the queue and added to the rollups in one
+    transaction, so every run is counted exactly once. Commits after
+    every batch; stops at the first partial batch. Callers hold
+    ROLLUP_COMPACTION_LOCK_ID (see RollupCompactor).
+
+    Args:
+        db: Database session
+        batch_size: Queued runs folded per transaction
+
+    Returns:
+        Number of runs folded into the rollups
+    """
+    pending = JobRunRollupPending
+    compacted = 0
+    while True:
+        batch = select(pending.id).order_by(pending.id).limit(batch_size)
+        rows = db.execute(
+            delete(pending).where(pending.id.in_(batch)).returning(
+                pending.tenant_id, pending.namespace, pending.job_name, pending.endpoint_id,
+                pending.hour.label("started_at"), pending.status, pending.duration
+            ),
+            execution_options={"synchronize_session": False}
+        ).mappings().all()
+        if not rows:
+            db.commit()
+            break
+        upsert_rollups(db, [dict(row) for row in rows])
+        note_runs_changed(db, {row["tenant_id"] for row in rows})
+        db.commit()
+        compacted += len(rows)
+        if len(rows) < batch_size:
+            break
+    return compacted
+
+
+class RollupCompactor:
+    """
+    Background task running compact_rollups() periodically.
+
+    Usage:
+        await rollup_compactor.start()  # runs once immediately, then every interval
+        ...
+        await rollup_compactor.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: int,
+        batch_size: int
+    ):
+        self.session_factory = session_factory
+        self.interval = interval_seconds
+        self.batch_size = batch_size
+        self._task = None
+
+        self._compacted = metrics.counter(
+            "crontopus_rollup_runs_compacted_total",
+            "Queued runs folded into the hourly rollups"
+        )
+        self._last_pass = metrics.gauge(
+            "crontopus_rollup_compaction_last_pass_timestamp_seconds",
+            "Unix time the last rollup compaction pass finished"
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the compaction loop."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the compaction loop (queued runs wait for the next worker to start)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.run_once)
+            except Exception as e:
+                logger.error(f"Rollup compaction failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def run_once(self) -> Optional[int]:
+        """
+        Run one compaction pass in a fresh session.
+
+        Returns:
+            Runs folded into the rollups, or None if another worker (or a
+            rebuild) holds the compaction lock
+        """
+        db = self.session_factory()
+        try:
+            with try_advisory_lock(db, ROLLUP_COMPACTION_LOCK_ID) as acquired:
+                if not acquired:
+                    return None
+                compacted = compact_rollups(db, self.batch_size)
+        finally:
+            db.close()
+
+        self._compacted.inc(compacted)
+        self._last_pass.set(time.time())
+        return compacted
+
+
+def _job_key(tenant_id: str, namespace: Optional[str], job_name: str) -> JobKey:
+    return (tenant_id, namespace or "", job_name)
+
+
+def _delete_job_rollups(db: Session, rows: List[Dict[str, Any]], exact_hour: bool) -> None:
+    """Delete the rollups of each row's job at row['hour'] (exact_hour) or from it on."""
+    if not rows:
+        return
+    for model in (JobRunRollupHourly, JobRunRollupDuration):
+        table = model.__table__
+        hour = bindparam("b_hour")
+        db.execute(
+            table.delete().where(
+                table.c.tenant_id == bindparam("b_tenant_id"),
+                table.c.namespace == bindparam("b_namespace"),
+                table.c.job_name == bindparam("b_job_name"),
+                table.c.hour == hour if exact_hour else table.c.hour >= hour,
+            ),
+            [
+                {"b_tenant_id": row["tenant_id"], "b_namespace": row["namespace"],
+                 "b_job_name": row["job_name"], "b_hour": row["hour"]}
+                for row in rows
+            ]
+        )
+
+
+def _dequeue(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Remove counted runs from the compaction queue."""
+    pending_ids = [row["pending_id"] for row in rows if row["pending_id"] is not None]
+    if pending_ids:
+        db.execute(
+            delete(JobRunRollupPending).where(JobRunRollupPending.id.in_(pending_ids)),
+            execution_options={"synchronize_session": False}
+        )
+
+
+def rebuild_rollups(
+    db: Session,
+    tenant_id: Optional[str] = None,
+    since: Optional[datetime] = None
+) -> int:
+    """
+    Recompute rollups from job_run, where job_run still has every run.
+
+    Retention, archiving and dropped partitions delete runs oldest first,
+    per job or across the board, while rollups keep the hours they
+    summarized. So for each job only hours after its oldest remaining run
+    are rebuilt, plus that run's hour if its rollup does not count more
+    runs than job_run has left in it. Older rollups, and those of jobs
+    without runs, are kept.
+
+    Queued runs that are counted are removed from the queue; the others,
+    including check-ins committed during the rebuild, stay queued for
+    the compactor. Callers must hold ROLLUP_COMPACTION_LOCK_ID (see
+    advisory_lock()) so the compactor does not fold them meanwhile.
+    Rebuilds run in the caller's transaction; the caller is responsible
+    for committing.
+
+    Args:
+        db: Database session
+        tenant_id: Only rebuild this tenant (default: all tenants)
+        since: Only rebuild hours from this time on (default: every
+            complete hour)
+
+    Returns:
+        Number of runs aggregated
+    """
+    tenant_filters = [JobRun.tenant_id == tenant_id] if tenant_id is not None else []
+    since_hour = rollup_hour(since) if since is not None else None
+
+    # Oldest remaining run of each job
+    first_hours: Dict[JobKey, datetime] = {}
+    oldest_runs = db.execute(
+        select(JobRun.tenant_id, JobRun.namespace, JobRun.job_name, func.min(JobRun.started_at))
+        .where(*tenant_filters)
+        .group_by(JobRun.tenant_id, JobRun.namespace, JobRun.job_name)
+    )
+    for run_tenant_id, namespace, job_name, first_started_at in oldest_runs:
+        key = _job_key(run_tenant_id, namespace, job_name)
+        hour = rollup_hour(first_started_at)
+        if key not in first_hours or hour < first_hours[key]:
+            first_hours[key] = hour
+
+    # First hour rebuilt per job, and first hours that may be incomplete
+    start_hours: Dict[JobKey, datetime] = {}
+    checked_hours: Dict[JobKey, datetime] = {}
+    for key, first_hour in first_hours.items():
+        if since_hour is not None and since_hour > first_hour:
+            start_hours[key] = since_hour
+        else:
+            start_hours[key] = first_hour + timedelta(hours=1)
+            checked_hours[key] = first_hour
+
+    _delete_job_rollups(db, [
+        {**dict(zip(JOB_KEY_COLUMNS, key)), "hour": hour} for key, hour in start_hours.items()
+    ], exact_hour=False)
+
+    columns = [
+        JobRun.tenant_id, JobRun.namespace, JobRun.job_name, JobRun.endpoint_id,
+        JobRun.status, JobRun.started_at, JobRun.duration,
+        JobRunRollupPending.id.label("pending_id"),
+    ]
+    run_filters = list(tenant_filters)
+    if since_hour is not None:
+        run_filters.append(JobRun.started_at >= since_hour)
+    # Queued runs are read in the same snapshot so each is counted once
+    result = db.execute(
+        select(*columns)
+        .outerjoin(JobRunRollupPending, JobRunRollupPending.run_id == JobRun.id)
+        .where(*run_filters)
+        .execution_options(yield_per=REBUILD_CHUNK_SIZE)
+    )
+
+    aggregated = 0
+    first_hour_rows: Dict[JobKey, List[Dict[str, Any]]] = {}
+    for chunk in result.mappings().partitions():
+        rows = []
+        for row in chunk:
+            key = _job_key(row["tenant_id"], row["namespace"], row["job_name"])
+            start_hour = start_hours.get(key)
+            if start_hour is None:
+                continue  # Job's first run arrived during the rebuild
+            hour = rollup_hour(row["started_at"])
+            if hour >= start_hour:
+                rows.append(dict(row))
+            elif hour == checked_hours.get(key):
+                first_hour_rows.setdefault(key, []).append(dict(row))
+        upsert_rollups(db, rows)
+        _dequeue(db, rows)
+        aggregated += len(rows)
+
+    # Rebuild first hours unless their rollups count runs that are gone
+    if checked_hours:
+        rollup_counts = dict(
+            ((row.tenant_id, row.namespace, row.job_name, rollup_hour(row.hour)), row.run_count)
+            for row in db.execute(
+                select(
+                    JobRunRollupHourly.tenant_id, JobRunRollupHourly.namespace,
+                    JobRunRollupHourly.job_name, JobRunRollupHourly.hour,
+                    func.sum(JobRunRollupHourly.run_count).label("run_count")
+                ).where(
+                    *([JobRunRollupHourly.tenant_id == tenant_id] if tenant_id is not None else []),
+                    JobRunRollupHourly.hour.in_(set(checked_hours.values()))
+                ).group_by(
+                    JobRunRollupHourly.tenant_id, JobRunRollupHourly.namespace,
+                    JobRunRollupHourly.job_name, JobRunRollupHourly.hour
+                )
+            )
+        )
+        complete = []
+        for key, hour in checked_hours.items():
+            rows = first_hour_rows.get(key, [])
+            if rollup_counts.get((*key, hour), 0) <= len(rows):
+                complete.append((key, hour, rows))
+
+        _delete_job_rollups(db, [
+            {**dict(zip(JOB_KEY_COLUMNS, key)), "hour": hour} for key, hour, _ in complete
+        ], exact_hour=True)
+        rows = [row for _, _, job_rows in complete for row in job_rows]
+        upsert_rollups(db, rows)
+        _dequeue(db, rows)
+        aggregated += len(rows)
+    return aggregated
+
+
+rollup_compactor = RollupCompactor(
+    session_factory=SessionLocal,
+    interval_seconds=settings.run_rollup_compaction_interval,
+    batch_size=settings.run_rollup_compaction_batch_size,
+)
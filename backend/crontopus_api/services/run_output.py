@@ -0,0 +1,156 @@
+"""
+Uploaded run logs.
+
+Agents stream long logs to POST /runs/{id}/output. The body is cut into
+fixed-size segments as it arrives, and each segment is compressed and
+inserted before the next one is read, so memory use is bounded by the
+segment size rather than the log size. Reads work the same way in reverse:
+only the segments overlapping the requested byte range are loaded, one at
+a time.
+"""
+from typing import AsyncIterator, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crontopus_api.config import settings
+from crontopus_api.models import JobRunOutputSegment
+from crontopus_api.models.job_run_output import compress_bytes, decompress_bytes
+
+
+class OutputTooLarge(Exception):
+    """Raised when an upload would exceed run_output_max_bytes."""
+
+
+class InvalidRange(Exception):
+    """Raised when a Range header cannot be satisfied."""
+
+
+async def output_size(db: AsyncSession, run_id: int) -> int:
+    """Total uncompressed size of a run's uploaded log, in bytes."""
+    result = await db.execute(
+        select(func.coalesce(func.sum(JobRunOutputSegment.byte_length), 0))
+        .where(JobRunOutputSegment.run_id == run_id)
+    )
+    return int(result.scalar_one())
+
+
+async def append_output(db: AsyncSession, run_id: int, chunks: AsyncIterator[bytes]) -> Tuple[int, int]:
+    """
+    Append streamed bytes to a run's log as compressed segments.
+
+    Segments are inserted as they fill up; the caller commits once the
+    stream is complete so a failed upload leaves no partial data.
+
+    Args:
+        db: Database session
+        run_id: Run to append to
+        chunks: Request body chunks
+
+    Returns:
+        Tuple of (bytes received, new total log size)
+
+    Raises:
+        OutputTooLarge: If the log would exceed run_output_max_bytes
+    """
+    segment_size = settings.run_output_segment_size
+    offset = await output_size(db, run_id)
+    received = 0
+    buffer = bytearray()
+
+    async def write_segment(data: bytes) -> None:
+        nonlocal offset
+        stored, compression = compress_bytes(data)
+        await db.execute(insert(JobRunOutputSegment).values(
+            run_id=run_id,
+            byte_offset=offset,
+            byte_length=len(data),
+            data=stored,
+            compression=compression
+        ))
+        offset += len(data)
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        received += len(chunk)
+        if offset + len(buffer) + len(chunk) > settings.run_output_max_bytes:
+            raise OutputTooLarge()
+        buffer.extend(chunk)
+        while len(buffer) >= segment_size:
+            await write_segment(bytes(buffer[:segment_size]))
+            del buffer[:segment_size]
+
+    if buffer:
+        await write_segment(bytes(buffer))
+
+    return received, offset
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=" Range header.
+
+    Supports "bytes=start-end", "bytes=start-" and "bytes=-suffix".
+    Multiple ranges are not supported and are served as the full log.
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the full log
+
+    Raises:
+        InvalidRange: If the range is malformed or outside the log
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        raise InvalidRange()
+    try:
+        if first == "":
+            # Suffix range: last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise InvalidRange()
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        raise InvalidRange()
+
+    if start >= size or end < start:
+        raise InvalidRange()
+    return start, min(end, size - 1)
+
+
+async def iter_output(db: AsyncSession, run_id: int, start: int, end: int) -> AsyncIterator[bytes]:
+    """
+    Yield the bytes of a run's log from start to end (inclusive).
+
+    Only segment offsets are loaded up front; segment data is fetched and
+    decompressed one segment at a time.
+    """
+    result = await db.execute(
+        select(JobRunOutputSegment.byte_offset, JobRunOutputSegment.byte_length)
+        .where(
+            JobRunOutputSegment.run_id == run_id,
+            JobRunOutputSegment.byte_offset <= end,
+            JobRunOutputSegment.byte_offset + JobRunOutputSegment.byte_length > start
+        )
+        .order_by(JobRunOutputSegment.byte_offset)
+    )
+    segments = result.all()
+
+    for byte_offset, byte_length in segments:
+        result = await db.execute(
+            select(JobRunOutputSegment.data, JobRunOutputSegment.compression).where(
+                JobRunOutputSegment.run_id == run_id,
+                JobRunOutputSegment.byte_offset == byte_offset
+            )
+        )
+        stored, compression = result.one()
+        data = decompress_bytes(stored, compression)
+        yield data[max(start - byte_offset, 0):min(end + 1 - byte_offset, byte_length)]
@@ -0,0 +1,151 @@
+"""
+Full-text search over run output.
+
+Output is stored zlib-compressed (see models/job_run_output.py), so the
+database cannot derive a search document from it. Instead, writers pass
+the plain text alongside the compressed columns and PostgreSQL computes
+job_run_output.search_vector in the same INSERT (see output_insert()),
+so the GIN index is maintained row by row as runs arrive.
+
+Error messages are weighted above output so that runs that failed with
+the searched words rank first. The 'simple' configuration is used
+because logs are not natural language: words are lowercased but not
+stemmed and no stop words are dropped.
+
+Other databases have no search_vector; there, search_runs() matches the
+words of the query against decompressed output in Python, which is only
+meant for development.
+
+Only output and error messages sent with a check-in or import are
+searchable, not logs uploaded to POST /runs/{id}/output, and archived
+runs are not searched.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, bindparam, desc, func, insert, literal_column
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.dml import Insert
+
+from crontopus_api.models import JobRun, JobRunOutput
+
+# Text search configuration (changing it requires rebuilding search_vector)
+SEARCH_CONFIG = "simple"
+
+# The configuration and weights are inlined as untyped SQL literals: asyncpg
+# sends string parameters as varchar, which matches neither regconfig nor
+# setweight()'s "char"
+_CONFIG = literal_column(f"'{SEARCH_CONFIG}'")
+_ERROR_WEIGHT = literal_column("'A'")
+_OUTPUT_WEIGHT = literal_column("'B'")
+
+# Characters of output and of error message indexed per run; longer text
+# would approach PostgreSQL's 1 MB tsvector limit
+SEARCH_MAX_CHARS = 100_000
+
+# Bind parameters carrying the plain text of output_insert() rows
+OUTPUT_PARAM = "search_output"
+ERROR_PARAM = "search_error"
+
+SNIPPET_CHARS = 200
+
+
+def supports_search_vector(db: Session) -> bool:
+    """Whether the database computes and indexes search_vector."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_text(text: Optional[str]) -> Optional[str]:
+    """Clip text to the indexed length and drop NULs (invalid in PostgreSQL text)."""
+    if text is None:
+        return None
+    return text[:SEARCH_MAX_CHARS].replace("\x00", "")
+
+
+def search_vector(output: ColumnElement, error_message: ColumnElement) -> ColumnElement:
+    """tsvector of a run's output (weight B) and error message (weight A)."""
+    def weighted(text: ColumnElement, weight: ColumnElement) -> ColumnElement:
+        return func.setweight(func.to_tsvector(_CONFIG, func.coalesce(text, "")), weight)
+    return weighted(error_message, _ERROR_WEIGHT).op("||")(weighted(output, _OUTPUT_WEIGHT))
+
+
+def output_insert(db: Session) -> Insert:
+    """
+    INSERT for job_run_output rows that also fills search_vector.
+
+    On PostgreSQL every parameter row must also carry the plain text as
+    OUTPUT_PARAM and ERROR_PARAM (see search_params()).
+    """
+    statement = insert(JobRunOutput)
+    if supports_search_vector(db):
+        statement = statement.values(search_vector=search_vector(
+            bindparam(OUTPUT_PARAM), bindparam(ERROR_PARAM)
+        ))
+    return statement
+
+
+def search_params(db: Session, output: Optional[str], error_message: Optional[str]) -> Dict[str, Any]:
+    """Extra parameters of an output_insert() row (none outside PostgreSQL)."""
+    if not supports_search_vector(db):
+        return {}
+    return {OUTPUT_PARAM: search_text(output), ERROR_PARAM: search_text(error_message)}
+
+
+def _query_words(q: str) -> List[str]:
+    return [word.lower() for word in re.findall(r"\w+", q)]
+
+
+def snippet(text: Optional[str], q: str) -> Optional[str]:
+    """The part of text around the first word of q found in it, or None."""
+    if not text:
+        return None
+    lowered = text.lower()
+    positions = [lowered.find(word) for word in _query_words(q)]
+    positions = [position for position in positions if position >= 0]
+    if not positions:
+        return None
+    start = max(min(positions) - SNIPPET_CHARS // 4, 0)
+    end = start + SNIPPET_CHARS
+    return ("..." if start else "") + text[start:end].strip() + ("..." if end < len(text) else "")
+
+
+def search_runs(db: Session, query: Query, q: str, limit: int, offset: int) -> List[Tuple[JobRun, float]]:
+    """
+    Rank a filtered run query by how well each run's output matches q.
+
+    Args:
+        db: Database session
+        query: Tenant-scoped JobRun query with the caller's filters applied
+        q: Search query in websearch syntax ("quoted phrases", or, -word)
+        limit: Maximum number of runs to return
+        offset: Number of runs to skip
+
+    Returns:
+        (run, rank) pairs, best match first
+    """
+    if supports_search_vector(db):
+        tsquery = func.websearch_to_tsquery(_CONFIG, q)
+        rank = func.ts_rank(JobRunOutput.search_vector, tsquery, type_=Float)
+        rows = query.join(
+            JobRunOutput, JobRunOutput.run_id == JobRun.id
+        ).filter(
+            JobRunOutput.search_vector.op("@@")(tsquery)
+        ).add_columns(rank.label("rank")).order_by(
+            desc("rank"), JobRun.started_at.desc(), JobRun.id.desc()
+        ).offset(offset).limit(limit).all()
+        return [(run, rank) for run, rank in rows]
+
+    # Development fallback: every word must occur; rank by occurrences
+    words = _query_words(q)
+    if not words:
+        return []
+    matches = []
+    for run in query.join(JobRunOutput, JobRunOutput.run_id == JobRun.id):
+        error_text = (run.error_message or "").lower()
+        output_text = (run.output or "").lower()
+        if all(word in error_text or word in output_text for word in words):
+            rank = sum(2 * error_text.count(word) + output_text.count(word) for word in words)
+            matches.append((run, float(rank)))
+    matches.sort(key=lambda match: (match[1], match[0].started_at, match[0].id), reverse=True)
+    return matches[offset:offset + limit]
@@ -0,0 +1,209 @@
+"""
+Job run ingestion.
+
+Every check-in path builds plain row dicts and writes them through
+insert_runs(), so single check-ins, batches and replays share one
+multi-row INSERT ... RETURNING code path.
+
+Row dicts carry output and error_message alongside the job_run columns;
+insert_runs() moves them into the compressed job_run_output side table
+(and, on PostgreSQL, into its search vector, see services/run_search.py).
+
+Every inserted run is also queued for its hourly rollup (see
+services/rollups.py) and recorded as its job's latest run when it is the
+newest (see services/last_status.py), in the same transaction. Cached
+run views of the tenants involved are invalidated when it commits (see
+services/view_cache.py).
+
+Agent check-in rows may also carry an idempotency_key. Rows whose key was
+already recorded for the same endpoint are not inserted again; the
+original run ID is returned instead.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from crontopus_api.models import JobRun, JobRunOutput, CheckinIdempotencyKey
+from crontopus_api.schemas.checkin import AgentCheckinRequest, CheckinRequest, RunImportRecord
+from crontopus_api.services.last_status import upsert_last_status
+from crontopus_api.services.rollups import queue_rollups
+from crontopus_api.services.run_search import output_insert, search_params
+from crontopus_api.services.view_cache import note_runs_changed
+
+# Row keys stored in job_run_output rather than job_run
+OUTPUT_FIELDS = ("output", "error_message")
+
+# Row keys that are not job_run columns
+SIDE_FIELDS = OUTPUT_FIELDS + ("idempotency_key",)
+
+IdempotencyKey = Tuple[int, str]  # (endpoint_id, key)
+
+
+def run_row_from_agent_checkin(
+    checkin: AgentCheckinRequest,
+    tenant_id: str,
+    now: datetime
+) -> Dict[str, Any]:
+    """Build a job_run row from an agent callback check-in."""
+    return {
+        "tenant_id": tenant_id,
+        "job_name": checkin.job_name,
+        "namespace": checkin.namespace,
+        "status": checkin.to_job_status(),
+        "started_at": now,
+        "finished_at": now,
+        "duration": checkin.duration,
+        "output": checkin.output,
+        "error_message": checkin.error_message,
+        "exit_code": checkin.exit_code,
+        "agent_id": None,
+        "endpoint_id": checkin.endpoint_id,
+        "idempotency_key": checkin.idempotency_key,
+    }
+
+
+def run_row_from_checkin(checkin: CheckinRequest) -> Dict[str, Any]:
+    """Build a job_run row from a legacy check-in."""
+    return {
+        "tenant_id": checkin.tenant,
+        "job_name": checkin.job_name,
+        "namespace": None,
+        "status": checkin.status,
+        "started_at": checkin.started_at,
+        "finished_at": checkin.finished_at,
+        "duration": checkin.duration,
+        "output": checkin.output,
+        "error_message": checkin.error_message,
+        "exit_code": checkin.exit_code,
+        "agent_id": checkin.agent_id,
+        "endpoint_id": None,
+    }
+
+
+def run_row_from_import(record: RunImportRecord, tenant_id: str) -> Dict[str, Any]:
+    """Build a job_run row from a bulk import record."""
+    return {
+        "tenant_id": tenant_id,
+        "job_name": record.job_name,
+        "namespace": record.namespace,
+        "status": record.status,
+        "started_at": record.started_at,
+        "finished_at": record.finished_at,
+        "duration": record.duration,
+        "output": record.output,
+        "error_message": record.error_message,
+        "exit_code": record.exit_code,
+        "agent_id": record.agent_id,
+        "endpoint_id": record.endpoint_id,
+    }
+
+
+def _idempotency_key(row: Dict[str, Any]) -> Optional[IdempotencyKey]:
+    key = row.get("idempotency_key")
+    if key is None or row.get("endpoint_id") is None:
+        return None
+    return row["endpoint_id"], key
+
+
+def find_idempotent_runs(db: Session, rows: List[Dict[str, Any]]) -> Dict[IdempotencyKey, int]:
+    """
+    Look up runs already recorded for the rows' idempotency keys.
+
+    Returns:
+        Mapping of (endpoint_id, key) to the original run ID
+    """
+    keys = {key for key in map(_idempotency_key, rows) if key is not None}
+    if not keys:
+        return {}
+
+    result = db.execute(
+        select(
+            CheckinIdempotencyKey.endpoint_id,
+            CheckinIdempotencyKey.key,
+            CheckinIdempotencyKey.run_id
+        ).where(
+            tuple_(CheckinIdempotencyKey.endpoint_id, CheckinIdempotencyKey.key).in_(list(keys))
+        )
+    )
+    return {(row.endpoint_id, row.key): row.run_id for row in result}
+
+
+def insert_runs(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert job runs with a single multi-row INSERT ... RETURNING.
+
+    Rows must share the same keys (use the run_row_* builders).
+    Output and error messages are compressed into job_run_output, the
+    runs are queued for their hourly rollups and job_last_status is updated.
+    Rows whose idempotency key is already recorded (or repeated earlier in
+    rows) are skipped and resolve to the original run ID.
+    The caller owns the transaction and is responsible for committing.
+
+    Args:
+        db: Database session
+        rows: Job run column values
+
+    Returns:
+        Run IDs in the same order as rows
+
+    Raises:
+        IntegrityError: If a concurrent transaction recorded one of the
+            idempotency keys first (roll back and retry to resolve it)
+    """
+    if not rows:
+        return []
+
+    # Resolve replays against recorded keys and earlier rows in this batch
+    known = find_idempotent_runs(db, rows)
+    pending: Dict[IdempotencyKey, int] = {}  # key -> index into new_rows
+    new_rows = []
+    positions = []  # per row: ("run", run_id) or ("new", index)
+    for row in rows:
+        key = _idempotency_key(row)
+        if key in known:
+            positions.append(("run", known[key]))
+        elif key in pending:
+            positions.append(("new", pending[key]))
+        else:
+            if key is not None:
+                pending[key] = len(new_rows)
+            positions.append(("new", len(new_rows)))
+            new_rows.append(row)
+
+    run_ids = []
+    if new_rows:
+        run_rows = [
+            {key: value for key, value in row.items() if key not in SIDE_FIELDS}
+            for row in new_rows
+        ]
+        result = db.execute(
+            insert(JobRun).returning(JobRun.id, sort_by_parameter_order=True),
+            run_rows
+        )
+        run_ids = [row.id for row in result]
+
+        output_rows = [
+            {
+                **JobRunOutput.values_for(run_id, row.get("output"), row.get("error_message")),
+                **search_params(db, row.get("output"), row.get("error_message"))
+            }
+            for run_id, row in zip(run_ids, new_rows)
+            if row.get("output") is not None or row.get("error_message") is not None
+        ]
+        if output_rows:
+            db.execute(output_insert(db), output_rows)
+
+        key_rows = [
+            {"endpoint_id": key[0], "key": key[1], "run_id": run_ids[index]}
+            for key, index in pending.items()
+        ]
+        if key_rows:
+            db.execute(insert(CheckinIdempotencyKey), key_rows)
+
+        queue_rollups(db, new_rows, run_ids)
+        upsert_last_status(db, new_rows, run_ids)
+        note_runs_changed(db, {row["tenant_id"] for row in new_rows})
+
+    return [value if kind == "run" else run_ids[value] for kind, value in positions]
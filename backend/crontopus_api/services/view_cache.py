@@ -0,0 +1,167 @@
+"""
+Conditional GET and payload caching for run history views.
+
+Dashboards poll /runs, /runs/by-job and /runs/by-endpoint every few
+seconds, and most polls see no new runs. Each tenant has a high-water
+mark made of:
+
+- the highest latest-run id in job_last_status (one row per job, so
+  cheap to read), re-read at most every run_view_watermark_ttl seconds
+- the time of the last change committed by this worker. Writers call
+  note_runs_changed() in their transaction, and the mark moves when the
+  transaction commits, so a payload is never cached from data that has
+  not been committed yet.
+
+A view's weak ETag hashes the mark, the request's path and query string
+and the current run_view_cache_ttl time slot. The slot rolls relative
+windows ('days') forward even when no runs arrive. A matching
+If-None-Match gets 304 Not Modified. Otherwise a payload cached under
+the same ETag is served without querying the database.
+
+Marks are per worker process. Changes committed by other workers become
+visible within run_view_watermark_ttl seconds (new runs), or within
+run_view_cache_ttl seconds for changes that do not advance the mark
+(deleted or back-dated runs, runs written outside insert_runs(), runs
+folded into the rollups by another worker's compactor).
+"""
+import hashlib
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from crontopus_api.config import settings
+from crontopus_api.models import JobLastStatus
+from crontopus_api.utils.cache import TTLCache
+
+# Session.info key collecting tenants changed by the current transaction
+_PENDING_KEY = "run_views_changed"
+ALL_TENANTS = None
+
+_max_run_ids = TTLCache(maxsize=settings.run_view_cache_size, ttl=settings.run_view_watermark_ttl)
+_payloads = TTLCache(maxsize=settings.run_view_cache_size, ttl=settings.run_view_cache_ttl)
+
+_lock = threading.Lock()
+_changed_at: Dict[str, int] = {}  # tenant -> time.time_ns() of the last local change
+_generation = 0  # bumped by changes to every tenant
+
+
+def note_runs_changed(db: Session, tenant_ids: Optional[Iterable[str]] = ALL_TENANTS) -> None:
+    """
+    Mark tenants' run views as changed once db's transaction commits.
+
+    Args:
+        db: Session of the transaction making the change
+        tenant_ids: Changed tenants (ALL_TENANTS for every tenant)
+    """
+    pending = db.info.setdefault(_PENDING_KEY, set())
+    if tenant_ids is ALL_TENANTS:
+        pending.add(ALL_TENANTS)
+    else:
+        pending.update(tenant_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    global _generation
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    now = time.time_ns()
+    with _lock:
+        if ALL_TENANTS in pending:
+            _generation += 1
+            _max_run_ids.clear()
+        for tenant_id in pending - {ALL_TENANTS}:
+            _changed_at[tenant_id] = now
+            _max_run_ids.pop(tenant_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _max_run_id(db: Session, tenant_id: str) -> int:
+    max_run_id = _max_run_ids.get(tenant_id)
+    if max_run_id is None:
+        max_run_id = db.query(func.max(JobLastStatus.last_run_id)).filter(
+            JobLastStatus.tenant_id == tenant_id
+        ).scalar() or 0
+        _max_run_ids.set(tenant_id, max_run_id)
+    return max_run_id
+
+
+def _view_key(request: Request) -> str:
+    return f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+
+
+def run_view_etag(db: Session, tenant_id: str, request: Request) -> str:
+    """Weak ETag of a tenant's run view for this request."""
+    with _lock:
+        changed_at = _changed_at.get(tenant_id, 0)
+        generation = _generation
+    time_slot = int(time.time() // settings.run_view_cache_ttl)
+    mark = f"{tenant_id}|{_max_run_id(db, tenant_id)}|{changed_at}|{generation}|{time_slot}|{_view_key(request)}"
+    return f'W/"{hashlib.sha1(mark.encode("utf-8")).hexdigest()[:24]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _headers(etag: str) -> Dict[str, str]:
+    # Browsers keep the response but revalidate it on every poll
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def cached_run_view(request: Request, tenant_id: str, etag: str) -> Optional[Response]:
+    """
+    Answer a run view request without computing it, if possible.
+
+    Returns:
+        304 if If-None-Match matches, the cached payload if one was stored
+        under the same ETag, otherwise None
+    """
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(etag))
+
+    cached = _payloads.get((tenant_id, _view_key(request)))
+    if cached is not None and cached[0] == etag:
+        return Response(content=cached[1], media_type="application/json", headers=_headers(etag))
+    return None
+
+
+def cache_run_view(request: Request, tenant_id: str, etag: str, payload: BaseModel) -> Response:
+    """Serialize a run view, cache it under its ETag and return it."""
+    body = payload.model_dump_json().encode("utf-8")
+    _payloads.set((tenant_id, _view_key(request)), (etag, body))
+    return Response(content=body, media_type="application/json", headers=_headers(etag))
+
+
+def clear_run_view_cache() -> None:
+    """Forget all marks and cached payloads (used by tests)."""
+    global _generation
+    with _lock:
+        _changed_at.clear()
+        _generation += 1
+    _max_run_ids.clear()
+    _payloads.clear()
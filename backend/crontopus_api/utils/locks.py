@@ -0,0 +1,60 @@
+"""
+Cross-worker locks for background tasks.
+
+Every API worker runs the same background tasks. Tasks that must not run
+concurrently take a PostgreSQL advisory lock for the whole pass.
+Maintenance scripts that must exclude a task wait for its lock.
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+@contextmanager
+def try_advisory_lock(db: Session, key: int) -> Iterator[bool]:
+    """
+    Hold a session advisory lock without blocking (PostgreSQL).
+
+    The lock lives on a dedicated connection, so the session can commit
+    as often as it likes while the lock is held. Yields whether the lock
+    was acquired; other databases always get it.
+    """
+    engine = db.get_bind()
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    with engine.connect() as connection:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        connection.commit()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                connection.commit()
+
+
+@contextmanager
+def advisory_lock(db: Session, key: int) -> Iterator[None]:
+    """
+    Hold a session advisory lock, waiting for it if needed (PostgreSQL).
+
+    Like try_advisory_lock(), the lock lives on a dedicated connection.
+    Other databases have no concurrent workers to exclude.
+    """
+    engine = db.get_bind()
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        connection.commit()
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+            connection.commit()
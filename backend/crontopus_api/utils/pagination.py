@@ -0,0 +1,39 @@
+"""
+Keyset pagination cursors.
+
+A cursor records the sort key of the last row on a page. The next page
+continues strictly after that key, so every page costs the same index
+range scan, however deep it is (no OFFSET).
+
+Cursors are opaque to clients: URL-safe base64 of a small JSON document.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(started_at: datetime, run_id: int) -> str:
+    """Encode the (started_at, id) sort key of the last row on a page."""
+    payload = json.dumps({"s": started_at.isoformat(), "i": run_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor created by encode_cursor().
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["s"]), int(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(str(e))
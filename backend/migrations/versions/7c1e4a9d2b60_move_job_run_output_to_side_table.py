@@ -0,0 +1,136 @@
+"""move_job_run_output_to_side_table
+
+Revision ID: 7c1e4a9d2b60
+Revises: 35469b0f8595
+Create Date: 2026-10-16 09:12:41.503118
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4a9d2b60'
+down_revision: Union[str, None] = '35469b0f8595'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+job_run = sa.table(
+    'job_run',
+    sa.column('id', sa.Integer),
+    sa.column('output', sa.Text),
+    sa.column('error_message', sa.Text),
+)
+
+job_run_output = sa.table(
+    'job_run_output',
+    sa.column('run_id', sa.Integer),
+    sa.column('output', sa.LargeBinary),
+    sa.column('output_compression', sa.String),
+    sa.column('error_message', sa.LargeBinary),
+    sa.column('error_compression', sa.String),
+)
+
+
+def _compress(text):
+    # Frozen copy of crontopus_api.models.job_run_output.compress_text
+    if text is None:
+        return None, 'none'
+    raw = text.encode('utf-8')
+    compressed = zlib.compress(raw)
+    if len(compressed) < len(raw):
+        return compressed, 'zlib'
+    return raw, 'none'
+
+
+def _decompress(data, compression):
+    if data is None:
+        return None
+    if compression == 'zlib':
+        data = zlib.decompress(data)
+    return data.decode('utf-8', errors='replace')
+
+
+def upgrade() -> None:
+    # Create job_run_output table
+    op.create_table('job_run_output',
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('output', sa.LargeBinary(), nullable=True),
+        sa.Column('output_compression', sa.String(length=16), nullable=False),
+        sa.Column('error_message', sa.LargeBinary(), nullable=True),
+        sa.Column('error_compression', sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['job_run.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('run_id')
+    )
+
+    # Copy existing output in batches, compressing as we go
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(job_run.c.id, job_run.c.output, job_run.c.error_message)
+            .where(
+                job_run.c.id > last_id,
+                sa.or_(job_run.c.output.isnot(None), job_run.c.error_message.isnot(None))
+            )
+            .order_by(job_run.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        values = []
+        for row in rows:
+            output, output_compression = _compress(row.output)
+            error_message, error_compression = _compress(row.error_message)
+            values.append({
+                'run_id': row.id,
+                'output': output,
+                'output_compression': output_compression,
+                'error_message': error_message,
+                'error_compression': error_compression,
+            })
+        conn.execute(job_run_output.insert(), values)
+        last_id = rows[-1].id
+
+    # Drop the inline columns
+    with op.batch_alter_table('job_run') as batch_op:
+        batch_op.drop_column('error_message')
+        batch_op.drop_column('output')
+
+
+def downgrade() -> None:
+    # Restore the inline columns
+    with op.batch_alter_table('job_run') as batch_op:
+        batch_op.add_column(sa.Column('output', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('error_message', sa.Text(), nullable=True))
+
+    # Copy output back in batches
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(job_run_output)
+            .where(job_run_output.c.run_id > last_id)
+            .order_by(job_run_output.c.run_id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            conn.execute(
+                job_run.update()
+                .where(job_run.c.id == row.run_id)
+                .values(
+                    output=_decompress(row.output, row.output_compression),
+                    error_message=_decompress(row.error_message, row.error_compression),
+                )
+            )
+        last_id = rows[-1].run_id
+
+    # Drop table
+    op.drop_table('job_run_output')
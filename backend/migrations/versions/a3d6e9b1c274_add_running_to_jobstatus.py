@@ -0,0 +1,32 @@
+"""add_running_to_jobstatus
+
+Revision ID: a3d6e9b1c274
+Revises: f4b9d2e7a305
+Create Date: 2026-10-17 09:41:27.206583
+
+ca0898ff5097 created the jobstatus enum without RUNNING, although
+JobStatus has it: running check-ins, and queries comparing job_run.status
+to RUNNING (such as GET /runs/histogram), failed on migrated databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d6e9b1c274'
+down_revision: Union[str, None] = 'f4b9d2e7a305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # New enum values cannot be used in the transaction that adds them
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE jobstatus ADD VALUE IF NOT EXISTS 'RUNNING' BEFORE 'SUCCESS'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop enum values; RUNNING is left in place
+    pass
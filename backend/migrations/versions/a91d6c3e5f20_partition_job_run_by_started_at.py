@@ -0,0 +1,167 @@
+"""partition_job_run_by_started_at
+
+Revision ID: a91d6c3e5f20
+Revises: f2c7d4a9e613
+Create Date: 2026-10-16 17:24:08.551903
+
+Converts job_run into a table range partitioned by started_at (PostgreSQL
+only; other databases keep the plain table).
+
+No rows are copied: the existing table is attached as the job_run_legacy
+partition covering everything before the first monthly partition, and its
+indexes are attached to the new parent's indexes instead of being rebuilt.
+The only full scans are building the (id, started_at) primary key index
+(concurrently) and checking the partition bound. Monthly partitions are
+created for the months after it, plus a default partition.
+services/partitions.py keeps creating monthly partitions ahead of time
+after that.
+
+Foreign keys from job_run_output, job_run_output_segment and
+checkin_idempotency_key to job_run are dropped: a partitioned table's
+unique keys must include started_at, so job_run.id alone cannot be
+referenced. job_run's own foreign key to endpoint (fk_job_run_endpoint_id,
+ON DELETE SET NULL) is recreated on the new parent before the legacy
+table is attached, so attaching adopts the legacy table's constraint
+instead of validating it again.
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91d6c3e5f20'
+down_revision: Union[str, None] = 'f2c7d4a9e613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SIDE_TABLES = ['job_run_output', 'job_run_output_segment', 'checkin_idempotency_key']
+
+# Secondary indexes on job_run (name -> definition)
+INDEXES = {
+    'ix_job_run_tenant_started_id': '(tenant_id, started_at DESC, id DESC)',
+    'ix_job_run_tenant_namespace_job_started': '(tenant_id, namespace, job_name, started_at)',
+    'ix_job_run_endpoint_started': '(endpoint_id, started_at)',
+    'ix_job_run_job_name_trgm': 'USING gin (job_name gin_trgm_ops)',
+    'ix_job_run_status': '(status)',
+    'ix_job_run_agent_id': '(agent_id)',
+}
+
+# Monthly partitions created past the current month
+MONTHS_AHEAD = 3
+
+ENDPOINT_FK = 'fk_job_run_endpoint_id'
+
+
+def _create_endpoint_fk(table: str) -> None:
+    op.create_foreign_key(ENDPOINT_FK, table, 'endpoint', ['endpoint_id'], ['id'], ondelete='SET NULL')
+
+
+def _month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        # Partitioning is PostgreSQL-only
+        return
+
+    # The legacy partition ends at the first month boundary after every existing run
+    current_month = _month_start(datetime.now(timezone.utc))
+    latest = conn.execute(sa.text('SELECT max(started_at) FROM job_run')).scalar()
+    legacy_upper = _add_months(current_month, 1)
+    if latest is not None:
+        legacy_upper = max(legacy_upper, _add_months(_month_start(latest), 1))
+
+    # Primary key index for the partition, built without blocking check-ins
+    with op.get_context().autocommit_block():
+        op.execute('CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS job_run_legacy_pkey ON job_run (id, started_at)')
+
+    # Drop foreign keys to job_run.id
+    for table in SIDE_TABLES:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_run_id_fkey')
+
+    # Turn the existing table into the legacy partition
+    op.execute('ALTER TABLE job_run DROP CONSTRAINT job_run_pkey')
+    op.execute('ALTER TABLE job_run ADD CONSTRAINT job_run_legacy_pkey PRIMARY KEY USING INDEX job_run_legacy_pkey')
+    op.execute('ALTER TABLE job_run RENAME TO job_run_legacy')
+    for name in INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name.replace("ix_job_run_", "job_run_legacy_")}')
+    # Proves the partition bound so ATTACH does not scan the table again
+    op.execute(
+        "ALTER TABLE job_run_legacy ADD CONSTRAINT job_run_legacy_bound "
+        f"CHECK (started_at < '{legacy_upper.isoformat()}')"
+    )
+
+    # Create the partitioned parent with the same columns and defaults
+    op.execute('CREATE TABLE job_run (LIKE job_run_legacy INCLUDING DEFAULTS) PARTITION BY RANGE (started_at)')
+    op.execute('ALTER TABLE job_run ADD CONSTRAINT job_run_pkey PRIMARY KEY (id, started_at)')
+    op.execute('ALTER SEQUENCE job_run_id_seq OWNED BY job_run.id')
+    for name, definition in INDEXES.items():
+        op.execute(f'CREATE INDEX {name} ON job_run {definition}')
+
+    # The endpoint foreign key may be missing (c9854406760d skips it when
+    # runs reference deleted endpoints): clear those references, as
+    # ON DELETE SET NULL would have, and add it to the legacy table first
+    has_endpoint_fk = conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_constraint "
+        "WHERE conname = :name AND conrelid = 'job_run_legacy'::regclass)"
+    ), {'name': ENDPOINT_FK}).scalar()
+    if not has_endpoint_fk:
+        op.execute(
+            'UPDATE job_run_legacy SET endpoint_id = NULL '
+            'WHERE endpoint_id IS NOT NULL AND endpoint_id NOT IN (SELECT id FROM endpoint)'
+        )
+        _create_endpoint_fk('job_run_legacy')
+    _create_endpoint_fk('job_run')
+
+    # Attaching reuses the legacy table's matching indexes
+    op.execute(
+        "ALTER TABLE job_run ATTACH PARTITION job_run_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{legacy_upper.isoformat()}')"
+    )
+    op.execute('ALTER TABLE job_run_legacy DROP CONSTRAINT job_run_legacy_bound')
+
+    # Monthly partitions up to MONTHS_AHEAD, and a default for anything outside them
+    month = legacy_upper
+    while month <= _add_months(current_month, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE job_run_p{month:%Y%m} PARTITION OF job_run "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute('CREATE TABLE job_run_default PARTITION OF job_run DEFAULT')
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+
+    # Copy every partition back into a plain table
+    op.execute('CREATE TABLE job_run_unpartitioned (LIKE job_run INCLUDING DEFAULTS)')
+    op.execute('INSERT INTO job_run_unpartitioned SELECT * FROM job_run')
+    op.execute('ALTER SEQUENCE job_run_id_seq OWNED BY NONE')
+    op.execute('DROP TABLE job_run')
+    op.execute('ALTER TABLE job_run_unpartitioned RENAME TO job_run')
+    op.execute('ALTER TABLE job_run ADD CONSTRAINT job_run_pkey PRIMARY KEY (id)')
+    op.execute('ALTER SEQUENCE job_run_id_seq OWNED BY job_run.id')
+    for name, definition in INDEXES.items():
+        op.execute(f'CREATE INDEX {name} ON job_run {definition}')
+    _create_endpoint_fk('job_run')
+
+    # Restore foreign keys (side rows of dropped partitions have no run left)
+    for table in SIDE_TABLES:
+        op.execute(f'DELETE FROM {table} WHERE run_id NOT IN (SELECT id FROM job_run)')
+        op.create_foreign_key(f'{table}_run_id_fkey', table, 'job_run', ['run_id'], ['id'], ondelete='CASCADE')
@@ -0,0 +1,49 @@
+"""add_run_retention_policy
+
+Revision ID: b5e8f1c2d407
+Revises: a91d6c3e5f20
+Create Date: 2026-10-16 18:41:52.207316
+
+Also indexes checkin_idempotency_key.run_id, which retention uses to
+delete the keys of deleted runs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8f1c2d407'
+down_revision: Union[str, None] = 'a91d6c3e5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create run_retention_policy table
+    op.create_table('run_retention_policy',
+        sa.Column('namespace', sa.String(length=255), nullable=False),
+        sa.Column('retention_days', sa.Integer(), nullable=True),
+        sa.Column('keep_last', sa.Integer(), nullable=True),
+        sa.Column('last_applied_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_deleted_count', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'namespace', name='uq_run_retention_policy_tenant_namespace')
+    )
+    op.create_index(op.f('ix_run_retention_policy_id'), 'run_retention_policy', ['id'], unique=False)
+    op.create_index(op.f('ix_run_retention_policy_tenant_id'), 'run_retention_policy', ['tenant_id'], unique=False)
+
+    # Index idempotency keys by run
+    op.create_index(op.f('ix_checkin_idempotency_key_run_id'), 'checkin_idempotency_key', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_checkin_idempotency_key_run_id'), table_name='checkin_idempotency_key')
+    op.drop_index(op.f('ix_run_retention_policy_tenant_id'), table_name='run_retention_policy')
+    op.drop_index(op.f('ix_run_retention_policy_id'), table_name='run_retention_policy')
+    op.drop_table('run_retention_policy')
@@ -0,0 +1,36 @@
+"""add_job_run_output_segment_table
+
+Revision ID: b83f0d5e1a27
+Revises: 7c1e4a9d2b60
+Create Date: 2026-10-16 11:04:17.228391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f0d5e1a27'
+down_revision: Union[str, None] = '7c1e4a9d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create job_run_output_segment table
+    op.create_table('job_run_output_segment',
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+        sa.Column('byte_length', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('compression', sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['job_run.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('run_id', 'byte_offset')
+    )
+
+
+def downgrade() -> None:
+    # Drop table
+    op.drop_table('job_run_output_segment')
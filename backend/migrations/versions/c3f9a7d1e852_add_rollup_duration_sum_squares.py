@@ -0,0 +1,58 @@
+"""add_rollup_duration_sum_squares
+
+Revision ID: c3f9a7d1e852
+Revises: b5e8f1c2d407
+Create Date: 2026-10-16 20:24:37.518904
+
+Existing rollup rows are backfilled from job_run where it still has
+every run with a duration of the row's hour (the counts match); rows of
+hours whose runs were deleted stay NULL, so the standard deviation of
+windows covering them is unknown rather than understated. The backfill
+runs on PostgreSQL only.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a7d1e852'
+down_revision: Union[str, None] = 'b5e8f1c2d407'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job_run_rollup_hourly', sa.Column('duration_sum_squares', sa.BigInteger(), nullable=True))
+
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute("UPDATE job_run_rollup_hourly SET duration_sum_squares = 0 WHERE duration_count = 0")
+        op.execute("""
+            UPDATE job_run_rollup_hourly AS rollup
+            SET duration_sum_squares = runs.sum_squares
+            FROM (
+                SELECT
+                    tenant_id,
+                    coalesce(namespace, '') AS namespace,
+                    job_name,
+                    coalesce(endpoint_id, 0) AS endpoint_id,
+                    date_trunc('hour', started_at, 'UTC') AS hour,
+                    count(*) AS duration_count,
+                    sum(duration::bigint * duration) AS sum_squares
+                FROM job_run
+                WHERE duration IS NOT NULL
+                GROUP BY 1, 2, 3, 4, 5
+            ) AS runs
+            WHERE rollup.tenant_id = runs.tenant_id
+              AND rollup.namespace = runs.namespace
+              AND rollup.job_name = runs.job_name
+              AND rollup.endpoint_id = runs.endpoint_id
+              AND rollup.hour = runs.hour
+              AND rollup.duration_count = runs.duration_count
+        """)
+
+
+def downgrade() -> None:
+    op.drop_column('job_run_rollup_hourly', 'duration_sum_squares')
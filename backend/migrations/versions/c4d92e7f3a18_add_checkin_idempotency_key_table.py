@@ -0,0 +1,35 @@
+"""add_checkin_idempotency_key_table
+
+Revision ID: c4d92e7f3a18
+Revises: b83f0d5e1a27
+Create Date: 2026-10-16 13:27:52.614820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d92e7f3a18'
+down_revision: Union[str, None] = 'b83f0d5e1a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create checkin_idempotency_key table
+    op.create_table('checkin_idempotency_key',
+        sa.Column('endpoint_id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['job_run.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('endpoint_id', 'key')
+    )
+
+
+def downgrade() -> None:
+    # Drop table
+    op.drop_table('checkin_idempotency_key')
@@ -0,0 +1,87 @@
+"""add_job_last_status
+
+Revision ID: d8b2e6f4a190
+Revises: c3f9a7d1e852
+Create Date: 2026-10-16 20:58:03.664120
+
+On PostgreSQL the table is backfilled from job_run here. Elsewhere it
+starts empty; backfill it with scripts/rebuild_last_status.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b2e6f4a190'
+down_revision: Union[str, None] = 'c3f9a7d1e852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Latest run per key, with the FAILURE/TIMEOUT runs since the key's last
+# SUCCESS (frozen copy of crontopus_api.services.last_status semantics)
+BACKFILL_SQL = """
+    WITH runs AS (
+        SELECT id, tenant_id, coalesce(namespace, '') AS namespace, job_name,
+               coalesce(endpoint_id, 0) AS endpoint_id, status, started_at, finished_at
+        FROM job_run
+    ), last_success AS (
+        SELECT DISTINCT ON (tenant_id, namespace, job_name, endpoint_id)
+               tenant_id, namespace, job_name, endpoint_id, started_at, id
+        FROM runs
+        WHERE status = 'SUCCESS'
+        ORDER BY tenant_id, namespace, job_name, endpoint_id, started_at DESC, id DESC
+    ), failures AS (
+        SELECT runs.tenant_id, runs.namespace, runs.job_name, runs.endpoint_id,
+               count(*) AS consecutive_failures
+        FROM runs
+        LEFT JOIN last_success USING (tenant_id, namespace, job_name, endpoint_id)
+        WHERE runs.status IN ('FAILURE', 'TIMEOUT')
+          AND (last_success.id IS NULL
+               OR (runs.started_at, runs.id) > (last_success.started_at, last_success.id))
+        GROUP BY runs.tenant_id, runs.namespace, runs.job_name, runs.endpoint_id
+    )
+    INSERT INTO job_last_status (
+        tenant_id, namespace, job_name, endpoint_id, last_run_id,
+        status, started_at, finished_at, consecutive_failures
+    )
+    SELECT DISTINCT ON (runs.tenant_id, runs.namespace, runs.job_name, runs.endpoint_id)
+           runs.tenant_id, runs.namespace, runs.job_name, runs.endpoint_id, runs.id,
+           runs.status, runs.started_at, runs.finished_at,
+           coalesce(failures.consecutive_failures, 0)
+    FROM runs
+    LEFT JOIN failures USING (tenant_id, namespace, job_name, endpoint_id)
+    ORDER BY runs.tenant_id, runs.namespace, runs.job_name, runs.endpoint_id,
+             runs.started_at DESC, runs.id DESC
+"""
+
+
+def upgrade() -> None:
+    # Reuse job_run's enum type
+    job_status = postgresql.ENUM('RUNNING', 'SUCCESS', 'FAILURE', 'TIMEOUT', 'CANCELLED', name='jobstatus', create_type=False)
+    
+    # Create job_last_status table
+    op.create_table('job_last_status',
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('namespace', sa.String(length=255), nullable=False),
+        sa.Column('job_name', sa.String(length=255), nullable=False),
+        sa.Column('endpoint_id', sa.Integer(), nullable=False),
+        sa.Column('last_run_id', sa.Integer(), nullable=False),
+        sa.Column('status', job_status, nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('consecutive_failures', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tenant_id', 'namespace', 'job_name', 'endpoint_id')
+    )
+    op.create_index('ix_job_last_status_tenant_status', 'job_last_status', ['tenant_id', 'status'], unique=False)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    # Drop table
+    op.drop_index('ix_job_last_status_tenant_status', table_name='job_last_status')
+    op.drop_table('job_last_status')
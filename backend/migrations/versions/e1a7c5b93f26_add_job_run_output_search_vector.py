@@ -0,0 +1,105 @@
+"""add_job_run_output_search_vector
+
+Revision ID: e1a7c5b93f26
+Revises: d8b2e6f4a190
+Create Date: 2026-10-16 21:47:19.208533
+
+Adds the full-text search vector of run output. Output is compressed,
+so on PostgreSQL existing rows are backfilled here in batches by
+decompressing them in Python. The GIN index is built CONCURRENTLY
+afterwards so check-ins are not blocked while it builds.
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c5b93f26'
+down_revision: Union[str, None] = 'd8b2e6f4a190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copies of crontopus_api.services.run_search constants
+SEARCH_CONFIG = 'simple'
+SEARCH_MAX_CHARS = 100000
+
+job_run_output = sa.table(
+    'job_run_output',
+    sa.column('run_id', sa.Integer),
+    sa.column('output', sa.LargeBinary),
+    sa.column('output_compression', sa.String),
+    sa.column('error_message', sa.LargeBinary),
+    sa.column('error_compression', sa.String),
+    sa.column('search_vector', postgresql.TSVECTOR),
+)
+
+
+def _search_text(data, compression):
+    if data is None:
+        return None
+    if compression == 'zlib':
+        data = zlib.decompress(data)
+    return data.decode('utf-8', errors='replace')[:SEARCH_MAX_CHARS].replace('\x00', '')
+
+
+def _search_vector(output, error_message):
+    # Frozen copy of crontopus_api.services.run_search.search_vector
+    def weighted(text, weight):
+        return sa.func.setweight(sa.func.to_tsvector(SEARCH_CONFIG, sa.func.coalesce(text, '')), weight)
+    return weighted(error_message, 'A').op('||')(weighted(output, 'B'))
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('job_run_output') as batch_op:
+        batch_op.add_column(sa.Column('search_vector', sa.Text().with_variant(postgresql.TSVECTOR(), 'postgresql'), nullable=True))
+
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        # Backfill existing output in batches
+        update = job_run_output.update().where(
+            job_run_output.c.run_id == sa.bindparam('b_run_id')
+        ).values(
+            search_vector=_search_vector(sa.bindparam('b_output'), sa.bindparam('b_error'))
+        )
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                sa.select(job_run_output)
+                .where(job_run_output.c.run_id > last_id)
+                .order_by(job_run_output.c.run_id)
+                .limit(BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            conn.execute(update, [
+                {
+                    'b_run_id': row.run_id,
+                    'b_output': _search_text(row.output, row.output_compression),
+                    'b_error': _search_text(row.error_message, row.error_compression),
+                }
+                for row in rows
+            ])
+            last_id = rows[-1].run_id
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_run_output_search', 'job_run_output',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_job_run_output_search', table_name='job_run_output', postgresql_concurrently=True)
+
+    with op.batch_alter_table('job_run_output') as batch_op:
+        batch_op.drop_column('search_vector')
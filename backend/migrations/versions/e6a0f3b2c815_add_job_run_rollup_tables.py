@@ -0,0 +1,105 @@
+"""add_job_run_rollup_tables
+
+Revision ID: e6a0f3b2c815
+Revises: c4d92e7f3a18
+Create Date: 2026-10-16 15:02:11.384027
+
+On PostgreSQL the rollups are backfilled from job_run here, so views
+reading them cover existing history. Elsewhere they start empty;
+backfill them with scripts/rebuild_rollups.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a0f3b2c815'
+down_revision: Union[str, None] = 'c4d92e7f3a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of crontopus_api.services.rollups.aggregate_runs(). Statuses
+# are compared as text: jobstatus has no RUNNING value yet (see a3d6e9b1c274)
+ROLLUP_BACKFILL_SQL = """
+    INSERT INTO job_run_rollup_hourly (
+        tenant_id, namespace, job_name, endpoint_id, hour, run_count,
+        running_count, success_count, failure_count, timeout_count, cancelled_count,
+        duration_count, duration_sum, duration_min, duration_max
+    )
+    SELECT tenant_id, coalesce(namespace, ''), job_name, coalesce(endpoint_id, 0),
+           date_trunc('hour', started_at, 'UTC'), count(*),
+           count(*) FILTER (WHERE status::text = 'RUNNING'),
+           count(*) FILTER (WHERE status::text = 'SUCCESS'),
+           count(*) FILTER (WHERE status::text = 'FAILURE'),
+           count(*) FILTER (WHERE status::text = 'TIMEOUT'),
+           count(*) FILTER (WHERE status::text = 'CANCELLED'),
+           count(duration), coalesce(sum(duration), 0), min(duration), max(duration)
+    FROM job_run
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+# Frozen copy of crontopus_api.services.rollups.duration_bucket()
+DURATION_BACKFILL_SQL = """
+    INSERT INTO job_run_rollup_duration (
+        tenant_id, namespace, job_name, endpoint_id, hour, bucket, count
+    )
+    SELECT tenant_id, coalesce(namespace, ''), job_name, coalesce(endpoint_id, 0),
+           date_trunc('hour', started_at, 'UTC'),
+           CASE WHEN duration <= 0 THEN 0
+                ELSE 1 + ceil(ln(duration::float8) / ln(1.1::float8) - 1e-9)::integer
+           END,
+           count(*)
+    FROM job_run
+    WHERE duration IS NOT NULL
+    GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+
+def upgrade() -> None:
+    # Create job_run_rollup_hourly table
+    op.create_table('job_run_rollup_hourly',
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('namespace', sa.String(length=255), nullable=False),
+        sa.Column('job_name', sa.String(length=255), nullable=False),
+        sa.Column('endpoint_id', sa.Integer(), nullable=False),
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('run_count', sa.Integer(), nullable=False),
+        sa.Column('running_count', sa.Integer(), nullable=False),
+        sa.Column('success_count', sa.Integer(), nullable=False),
+        sa.Column('failure_count', sa.Integer(), nullable=False),
+        sa.Column('timeout_count', sa.Integer(), nullable=False),
+        sa.Column('cancelled_count', sa.Integer(), nullable=False),
+        sa.Column('duration_count', sa.Integer(), nullable=False),
+        sa.Column('duration_sum', sa.BigInteger(), nullable=False),
+        sa.Column('duration_min', sa.Integer(), nullable=True),
+        sa.Column('duration_max', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('tenant_id', 'namespace', 'job_name', 'endpoint_id', 'hour')
+    )
+    op.create_index('ix_job_run_rollup_hourly_tenant_hour', 'job_run_rollup_hourly', ['tenant_id', 'hour'], unique=False)
+    
+    # Create job_run_rollup_duration table
+    op.create_table('job_run_rollup_duration',
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('namespace', sa.String(length=255), nullable=False),
+        sa.Column('job_name', sa.String(length=255), nullable=False),
+        sa.Column('endpoint_id', sa.Integer(), nullable=False),
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('bucket', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tenant_id', 'namespace', 'job_name', 'endpoint_id', 'hour', 'bucket')
+    )
+    op.create_index('ix_job_run_rollup_duration_tenant_hour', 'job_run_rollup_duration', ['tenant_id', 'hour'], unique=False)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(ROLLUP_BACKFILL_SQL)
+        op.execute(DURATION_BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    # Drop tables
+    op.drop_index('ix_job_run_rollup_duration_tenant_hour', table_name='job_run_rollup_duration')
+    op.drop_table('job_run_rollup_duration')
+    op.drop_index('ix_job_run_rollup_hourly_tenant_hour', table_name='job_run_rollup_hourly')
+    op.drop_table('job_run_rollup_hourly')
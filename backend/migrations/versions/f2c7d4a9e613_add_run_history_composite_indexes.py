@@ -0,0 +1,88 @@
+"""add_run_history_composite_indexes
+
+Revision ID: f2c7d4a9e613
+Revises: e6a0f3b2c815
+Create Date: 2026-10-16 16:10:42.902311
+
+Replaces the single-column job_run indexes with composite indexes that
+match the run history queries, and adds a pg_trgm GIN index for
+substring job name filters. On PostgreSQL the indexes are built
+CONCURRENTLY so check-ins are not blocked while they build.
+
+Use benchmarks/query_plans.py to compare plans before and after.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7d4a9e613'
+down_revision: Union[str, None] = 'e6a0f3b2c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column indexes made redundant by the primary key and the composite indexes
+REDUNDANT_INDEXES = {
+    'ix_job_run_id': ['id'],
+    'ix_job_run_tenant_id': ['tenant_id'],
+    'ix_job_run_endpoint_id': ['endpoint_id'],
+    'ix_job_run_namespace': ['namespace'],
+    'ix_job_run_job_name': ['job_name'],
+}
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    
+    if postgresql:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_run_tenant_started_id', 'job_run',
+            ['tenant_id', sa.text('started_at DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_job_run_tenant_namespace_job_started', 'job_run',
+            ['tenant_id', 'namespace', 'job_name', 'started_at'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_job_run_endpoint_started', 'job_run',
+            ['endpoint_id', 'started_at'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_job_run_job_name_trgm', 'job_run',
+            ['job_name'],
+            postgresql_using='gin',
+            postgresql_ops={'job_name': 'gin_trgm_ops'},
+            postgresql_concurrently=True
+        )
+        
+        # Drop redundant indexes only once their replacements exist
+        for name in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name='job_run', postgresql_concurrently=True)
+    
+    if postgresql:
+        op.execute('ANALYZE job_run')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Recreate single-column indexes
+        for name, columns in REDUNDANT_INDEXES.items():
+            op.create_index(name, 'job_run', columns, unique=False, postgresql_concurrently=True)
+        
+        # Drop composite and trigram indexes
+        op.drop_index('ix_job_run_job_name_trgm', table_name='job_run', postgresql_concurrently=True)
+        op.drop_index('ix_job_run_endpoint_started', table_name='job_run', postgresql_concurrently=True)
+        op.drop_index('ix_job_run_tenant_namespace_job_started', table_name='job_run', postgresql_concurrently=True)
+        op.drop_index('ix_job_run_tenant_started_id', table_name='job_run', postgresql_concurrently=True)
+    
+    # pg_trgm is left installed; other databases on the server may use it
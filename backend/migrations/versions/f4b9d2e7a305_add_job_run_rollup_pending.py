@@ -0,0 +1,48 @@
+"""add_job_run_rollup_pending
+
+Revision ID: f4b9d2e7a305
+Revises: e1a7c5b93f26
+Create Date: 2026-10-16 23:12:41.530917
+
+Queue of runs waiting to be added to the hourly rollups. Runs inserted
+before this revision were added to the rollups directly, so the queue
+starts empty.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b9d2e7a305'
+down_revision: Union[str, None] = 'e1a7c5b93f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reuse job_run's enum type
+    job_status = postgresql.ENUM('RUNNING', 'SUCCESS', 'FAILURE', 'TIMEOUT', 'CANCELLED', name='jobstatus', create_type=False)
+    
+    # Create job_run_rollup_pending table
+    op.create_table('job_run_rollup_pending',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.String(), nullable=False),
+        sa.Column('namespace', sa.String(length=255), nullable=False),
+        sa.Column('job_name', sa.String(length=255), nullable=False),
+        sa.Column('endpoint_id', sa.Integer(), nullable=False),
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', job_status, nullable=False),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_run_rollup_pending_run_id', 'job_run_rollup_pending', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop table
+    op.drop_index('ix_job_run_rollup_pending_run_id', table_name='job_run_rollup_pending')
+    op.drop_table('job_run_rollup_pending')
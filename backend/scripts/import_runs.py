@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Bulk Run Import Script for Crontopus
+
+Loads job run history from a newline-delimited JSON file (one run per
+line, same fields as POST /api/runs/import) straight into the database.
+Uses COPY on PostgreSQL and streams the file, so multi-million row
+imports run in constant memory.
+
+Usage:
+    python scripts/import_runs.py --tenant acme runs.ndjson
+    zcat runs.ndjson.gz | python scripts/import_runs.py --tenant acme -
+    python scripts/import_runs.py --tenant acme --dry-run runs.ndjson  # Validate only
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, TextIO
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import ValidationError
+from crontopus_api.config import SessionLocal
+from crontopus_api.models import Tenant
+from crontopus_api.schemas.checkin import RunImportRecord
+from crontopus_api.services.bulk_load import DEFAULT_BATCH_SIZE, bulk_load_runs
+from crontopus_api.services.runs import run_row_from_import
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class ImportStats:
+    """Counters shared between the reader and the summary."""
+
+    def __init__(self):
+        self.read = 0
+        self.rejected = 0
+
+
+def read_rows(source: TextIO, tenant_id: str, stats: ImportStats) -> Iterator[Dict]:
+    """Yield run rows from NDJSON lines, skipping (and logging) invalid ones."""
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        stats.read += 1
+        try:
+            record = RunImportRecord.model_validate_json(line)
+        except ValidationError as e:
+            stats.rejected += 1
+            logger.warning(f"Line {line_number}: {e.errors()[0]['msg']}")
+            continue
+        yield run_row_from_import(record, tenant_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import job runs from NDJSON")
+    parser.add_argument("file", help="NDJSON file to import ('-' for stdin)")
+    parser.add_argument("--tenant", required=True, help="Tenant ID to import into")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per COPY and commit")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the file without writing")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    stats = ImportStats()
+    db = SessionLocal()
+    started = time.monotonic()
+
+    try:
+        if not db.get(Tenant, args.tenant):
+            logger.error(f"Tenant {args.tenant} not found")
+            return 1
+
+        rows = read_rows(source, args.tenant, stats)
+        if args.dry_run:
+            imported = sum(1 for _ in rows)
+            logger.info(f"Dry run: {imported} valid runs, {stats.rejected} rejected")
+            return 0
+
+        imported = bulk_load_runs(db, rows, batch_size=args.batch_size)
+    finally:
+        db.close()
+        if source is not sys.stdin:
+            source.close()
+
+    elapsed = time.monotonic() - started
+    rate = imported / elapsed if elapsed else 0
+    logger.info(
+        f"Imported {imported} runs into {args.tenant} in {elapsed:.1f}s "
+        f"({rate:.0f} runs/s), {stats.rejected} rejected"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
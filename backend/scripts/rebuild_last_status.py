@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Latest Run Status Rebuild Script for Crontopus
+
+Recomputes job_last_status, the latest run of every job, from job_run.
+On PostgreSQL the migration adding the table backfills it; elsewhere run
+this once after upgrading. Also use it to repair the table after runs
+were changed directly in the database.
+
+Usage:
+    python scripts/rebuild_last_status.py                  # All tenants
+    python scripts/rebuild_last_status.py --tenant acme    # One tenant
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crontopus_api.config import SessionLocal
+from crontopus_api.models import Tenant
+from crontopus_api.services.last_status import rebuild_last_status
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild job_last_status from job_run")
+    parser.add_argument("--tenant", help="Only rebuild this tenant (default: all tenants)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    started = time.monotonic()
+
+    try:
+        if args.tenant:
+            if not db.get(Tenant, args.tenant):
+                logger.error(f"Tenant {args.tenant} not found")
+                return 1
+            tenant_ids = [args.tenant]
+        else:
+            tenant_ids = [tenant_id for (tenant_id,) in db.query(Tenant.id).order_by(Tenant.id)]
+
+        # One transaction per tenant keeps locks on job_last_status short
+        total = 0
+        for tenant_id in tenant_ids:
+            try:
+                replayed = rebuild_last_status(db, tenant_id=tenant_id)
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.error(f"Rebuild failed for tenant {tenant_id}")
+                raise
+            logger.info(f"Rebuilt latest run status for {tenant_id} from {replayed} runs")
+            total += replayed
+    finally:
+        db.close()
+
+    elapsed = time.monotonic() - started
+    logger.info(f"Rebuilt latest run status for {len(tenant_ids)} tenants from {total} runs in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Run Rollup Rebuild Script for Crontopus
+
+Recomputes the hourly run rollups (job_run_rollup_hourly and
+job_run_rollup_duration) from job_run, to repair them after runs were
+changed directly in the database.
+
+Rollups outlive the runs they summarize (retention, archiving and
+dropped partitions leave them alone), so only hours for which job_run
+still holds every run of a job are rebuilt: those after the job's oldest
+remaining run. Older rollups are kept as they are. Use --days to limit
+the rebuild to recent hours.
+
+The rollup compactor is paused while the script runs; check-ins keep
+being queued and are folded in once it finishes.
+
+Usage:
+    python scripts/rebuild_rollups.py                  # All tenants, every complete hour
+    python scripts/rebuild_rollups.py --tenant acme    # One tenant
+    python scripts/rebuild_rollups.py --days 2         # Only the last two days
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crontopus_api.config import SessionLocal
+from crontopus_api.models import Tenant
+from crontopus_api.services.rollups import ROLLUP_COMPACTION_LOCK_ID, rebuild_rollups
+from crontopus_api.utils.locks import advisory_lock
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild hourly run rollups from job_run")
+    parser.add_argument("--tenant", help="Only rebuild this tenant (default: all tenants)")
+    parser.add_argument("--days", type=int, help="Only rebuild the last N days (default: every complete hour)")
+    args = parser.parse_args()
+
+    since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+    db = SessionLocal()
+    started = time.monotonic()
+
+    try:
+        if args.tenant:
+            if not db.get(Tenant, args.tenant):
+                logger.error(f"Tenant {args.tenant} not found")
+                return 1
+            tenant_ids = [args.tenant]
+        else:
+            tenant_ids = [tenant_id for (tenant_id,) in db.query(Tenant.id).order_by(Tenant.id)]
+
+        # One transaction per tenant keeps locks on the rollup rows short
+        total = 0
+        with advisory_lock(db, ROLLUP_COMPACTION_LOCK_ID):
+            for tenant_id in tenant_ids:
+                try:
+                    aggregated = rebuild_rollups(db, tenant_id=tenant_id, since=since)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    logger.error(f"Rebuild failed for tenant {tenant_id}")
+                    raise
+                logger.info(f"Rebuilt rollups for {tenant_id} from {aggregated} runs")
+                total += aggregated
+    finally:
+        db.close()
+
+    elapsed = time.monotonic() - started
+    logger.info(f"Rebuilt rollups for {len(tenant_ids)} tenants from {total} runs in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
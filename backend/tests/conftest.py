@@ -4,20 +4,41 @@ Pytest configuration and shared fixtures.
 import pytest
 import os
 import time
+import uuid
+from pathlib import Path
+from unittest import mock
+from alembic import command
+from alembic.config import Config as AlembicConfig
 from fastapi import Request, Response
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from testcontainers.postgres import PostgresContainer
 from testcontainers.redis import RedisContainer
 import redis.asyncio as aioredis
 from fastapi_limiter import FastAPILimiter
 
 from crontopus_api.main import app
-from crontopus_api.config import get_db, Base
+from crontopus_api.config import get_db, get_async_db, Base, settings, _async_engine_config
 from crontopus_api.models import Tenant, User
 from crontopus_api.security.jwt import create_access_token
 from crontopus_api.security.password import get_password_hash
+from crontopus_api.security.endpoint_tokens import clear_endpoint_token_cache
+from crontopus_api.services.endpoint_cache import clear_endpoint_cache
+from crontopus_api.services.view_cache import clear_run_view_cache
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def upgrade_database(url: str, revision: str = "head"):
+    """Run the Alembic migrations on a database up to revision."""
+    config = AlembicConfig()
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    # migrations/env.py reads the database URL from settings
+    with mock.patch.object(settings, "database_url", url):
+        command.upgrade(config, revision)
 
 @pytest.fixture(scope="session")
 def postgres_container():
@@ -84,11 +105,104 @@ def client(db):
     def override_get_db():
         yield db
     
+    async def override_get_async_db():
+        # Async routes run on the same session so they share the test transaction
+        yield AsyncSession(sync_session_class=lambda **kwargs: db)
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Cached run views would outlive the previous test's rolled-back data
+    clear_run_view_cache()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="function")
+def live_database_url(postgres_container, request):
+    """
+    URL of a scratch database with the full schema, dropped after the test.
+    
+    Unlike the db fixture, data is really committed, so the app can be
+    run on its own engines (see live_client). The schema comes from
+    create_all(), or from the Alembic migrations for tests marked
+    migrated_schema (up to the marker's revision, default head).
+    """
+    url = make_url(postgres_container.get_connection_url())
+    name = f"live_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f"CREATE DATABASE {name}"))
+    
+    live_url = url.set(database=name).render_as_string(hide_password=False)
+    marker = request.node.get_closest_marker("migrated_schema")
+    if marker:
+        upgrade_database(live_url, marker.kwargs.get("revision", "head"))
+    else:
+        engine = create_engine(live_url, poolclass=NullPool)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+    
+    yield live_url
+    
+    with admin.connect() as conn:
+        conn.execute(text(f"DROP DATABASE {name} WITH (FORCE)"))
+    admin.dispose()
+
+@pytest.fixture(scope="function")
+def upgrade_live_database(live_database_url):
+    """Continue the migrations of a migrated_schema(revision=...) live database."""
+    return lambda revision="head": upgrade_database(live_database_url, revision)
+
+@pytest.fixture(scope="function")
+def live_db(live_database_url):
+    """Session on the live_database_url database (commits are real)."""
+    engine = create_engine(live_database_url, poolclass=NullPool)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    
+    yield session
+    
+    session.close()
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def live_client(live_database_url):
+    """
+    Test client whose routes use real engines on live_database_url.
+    
+    The client fixture runs async routes on the sync test session, so
+    only this client exercises the asyncpg driver of get_async_db.
+    Connections are not pooled: asyncpg connections are bound to the
+    event loop of the TestClient that opened them.
+    """
+    engine = create_engine(live_database_url, poolclass=NullPool)
+    async_url, async_connect_args = _async_engine_config(live_database_url)
+    async_engine = create_async_engine(async_url, connect_args=async_connect_args, poolclass=NullPool)
+    LiveSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    LiveAsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    
+    def override_get_db():
+        db = LiveSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    async def override_get_async_db():
+        async with LiveAsyncSessionLocal() as db:
+            yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    clear_run_view_cache()
+    clear_endpoint_token_cache()
+    clear_endpoint_cache()
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+    engine.dispose()
+
 @pytest.fixture(autouse=True)
 def disable_rate_limiting(request):
     """Disable rate limiting for all tests except those explicitly testing it."""
@@ -175,3 +289,24 @@ def auth_headers(test_user):
         "tenant_id": test_user.tenant_id
     })
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def live_auth_headers(live_db):
+    """Create the test tenant and user on the live database and return their auth headers."""
+    live_db.add(Tenant(id="test-tenant", name="Test Tenant", is_active=True))
+    user = User(
+        email="test@example.com",
+        username="testuser",
+        hashed_password=get_password_hash("testpassword"),
+        tenant_id="test-tenant",
+        is_active=True
+    )
+    live_db.add(user)
+    live_db.commit()
+    token = create_access_token({
+        "sub": str(user.id),
+        "user_id": user.id,
+        "tenant_id": user.tenant_id
+    })
+    return {"Authorization": f"Bearer {token}"}
@@ -1,11 +1,22 @@
 """
 Tests for check-in and run history endpoints.
 """
+import json
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
 
-from crontopus_api.models import JobRun, JobStatus, Tenant
+from crontopus_api.config import settings
+from crontopus_api.models import JobLastStatus, JobRun, JobRunOutputSegment, JobRunRollupHourly, JobRunRollupPending, JobStatus, RunRetentionPolicy, Tenant, Endpoint, EndpointStatus
+from crontopus_api.security import endpoint_tokens
 from crontopus_api.security.jwt import create_access_token
+from crontopus_api.security.password import get_password_hash
+from crontopus_api.services.endpoint_cache import clear_endpoint_cache
+from crontopus_api.services import ingestion
+from crontopus_api.services.ingestion import PartialFlush, RunIngestionQueue, QueueFull
+from crontopus_api.services.last_status import upsert_last_status
+from crontopus_api.services.rollups import compact_rollups, rebuild_rollups
 
 
 class TestCheckIn:
@@ -92,6 +103,237 @@ class TestCheckIn:
         assert response.status_code == 422
 
 
+class TestAgentCheckIn:
+    """Tests for POST /api/runs/check-in endpoint."""
+    
+    @pytest.fixture
+    def endpoint(self, db, test_tenant):
+        """Create an enrolled endpoint with a known token."""
+        endpoint = Endpoint(
+            tenant_id=test_tenant.id,
+            name="test-endpoint",
+            hostname="test-host",
+            token_hash=get_password_hash("endpoint-token"),
+            status=EndpointStatus.ACTIVE
+        )
+        db.add(endpoint)
+        db.commit()
+        db.refresh(endpoint)
+        endpoint_tokens.clear_endpoint_token_cache()
+        clear_endpoint_cache()
+        return endpoint
+    
+    @pytest.fixture
+    def verify_calls(self, monkeypatch):
+        """Count bcrypt verifications performed for endpoint tokens."""
+        calls = []
+        original = endpoint_tokens.verify_password
+        
+        def counting_verify(plain, hashed):
+            calls.append(plain)
+            return original(plain, hashed)
+        
+        monkeypatch.setattr(endpoint_tokens, "verify_password", counting_verify)
+        return calls
+    
+    def _checkin(self, client, endpoint_id, token):
+        return client.post(
+            "/api/runs/check-in",
+            json={
+                "endpoint_id": endpoint_id,
+                "job_name": "backup-db",
+                "namespace": "production",
+                "status": "success"
+            },
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    
+    def test_token_verified_once(self, client, endpoint, verify_calls):
+        """Test that repeated check-ins only run bcrypt once."""
+        for _ in range(3):
+            response = self._checkin(client, endpoint.id, "endpoint-token")
+            assert response.status_code == 201
+        
+        assert len(verify_calls) == 1
+    
+    def test_invalid_token_not_cached(self, client, endpoint, verify_calls):
+        """Test that invalid tokens are rejected every time."""
+        for _ in range(2):
+            response = self._checkin(client, endpoint.id, "wrong-token")
+            assert response.status_code == 401
+        
+        assert len(verify_calls) == 2
+    
+    def test_revoked_endpoint_rejected(self, client, auth_headers, endpoint, verify_calls):
+        """Test that revoking an endpoint invalidates its cached metadata."""
+        assert self._checkin(client, endpoint.id, "endpoint-token").status_code == 201
+        
+        response = client.delete(f"/api/endpoints/{endpoint.id}", headers=auth_headers)
+        assert response.status_code == 200
+        
+        response = self._checkin(client, endpoint.id, "endpoint-token")
+        assert response.status_code == 403
+        assert len(verify_calls) == 1
+    
+    def test_revoked_endpoint_heartbeat_rejected(self, client, auth_headers, endpoint):
+        """Test that revoked endpoints cannot send heartbeats."""
+        response = client.post(f"/api/endpoints/{endpoint.id}/heartbeat", json={})
+        assert response.status_code == 200
+        
+        client.delete(f"/api/endpoints/{endpoint.id}", headers=auth_headers)
+        
+        response = client.post(f"/api/endpoints/{endpoint.id}/heartbeat", json={})
+        assert response.status_code == 403
+    
+    def test_batch_checkin(self, client, db, endpoint):
+        """Test batched check-ins report per-item results."""
+        item = {"endpoint_id": endpoint.id, "namespace": "production", "status": "success"}
+        response = client.post(
+            "/api/runs/check-in/batch",
+            json={"checkins": [
+                {**item, "job_name": "job-a"},
+                {**item, "job_name": "job-b", "endpoint_id": 99999},
+                {**item, "job_name": "job-c"},
+            ]},
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["accepted"] == 2
+        assert data["rejected"] == 1
+        assert [r["status_code"] for r in data["results"]] == [201, 404, 201]
+        
+        run_ids = [data["results"][0]["run_id"], data["results"][2]["run_id"]]
+        runs = db.query(JobRun).filter(JobRun.id.in_(run_ids)).order_by(JobRun.id).all()
+        assert [run.job_name for run in runs] == ["job-a", "job-c"]
+    
+    def test_batch_checkin_rejects_unauthorized_endpoint(self, client, endpoint):
+        """Test that a bad token only rejects that endpoint's items."""
+        response = client.post(
+            "/api/runs/check-in/batch",
+            json={
+                "checkins": [{"endpoint_id": endpoint.id, "job_name": "job-a", "namespace": "production", "status": "success"}],
+                "endpoint_tokens": {str(endpoint.id): "wrong-token"}
+            },
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["accepted"] == 0
+        assert data["results"][0]["status_code"] == 401
+    
+    def test_idempotent_checkin_replay(self, client, db, endpoint):
+        """Test that a retried check-in returns the original run."""
+        headers = {"Authorization": "Bearer endpoint-token", "Idempotency-Key": "run-42"}
+        body = {"endpoint_id": endpoint.id, "job_name": "backup-db", "namespace": "production", "status": "success"}
+        
+        first = client.post("/api/runs/check-in", json=body, headers=headers)
+        retry = client.post("/api/runs/check-in", json=body, headers=headers)
+        
+        assert first.status_code == 201
+        assert retry.status_code == 201
+        assert retry.json()["run_id"] == first.json()["run_id"]
+        assert db.query(JobRun).filter(JobRun.endpoint_id == endpoint.id).count() == 1
+    
+    def test_idempotent_batch_replay(self, client, db, endpoint):
+        """Test that resending a keyed batch records no duplicates."""
+        item = {"endpoint_id": endpoint.id, "namespace": "production", "status": "success"}
+        batch = {"checkins": [
+            {**item, "job_name": "job-a"},
+            {**item, "job_name": "job-b", "idempotency_key": "b-1"},
+            {**item, "job_name": "job-b", "idempotency_key": "b-1"},
+        ]}
+        headers = {"Authorization": "Bearer endpoint-token", "Idempotency-Key": "batch-7"}
+        
+        first = client.post("/api/runs/check-in/batch", json=batch, headers=headers).json()
+        retry = client.post("/api/runs/check-in/batch", json=batch, headers=headers).json()
+        
+        run_ids = [r["run_id"] for r in first["results"]]
+        assert run_ids[1] == run_ids[2]
+        assert [r["run_id"] for r in retry["results"]] == run_ids
+        assert db.query(JobRun).filter(JobRun.endpoint_id == endpoint.id).count() == 2
+    
+    def test_upload_run_output(self, client, auth_headers, endpoint, monkeypatch):
+        """Test that uploaded output is appended and served with ranges."""
+        monkeypatch.setattr(settings, "run_output_segment_size", 1000)
+        run_id = self._checkin(client, endpoint.id, "endpoint-token").json()["run_id"]
+        log = b"".join(f"line {i}\n".encode() for i in range(1000))
+        
+        for part in (log[:5000], log[5000:]):
+            response = client.post(
+                f"/api/runs/{run_id}/output",
+                content=part,
+                headers={"Authorization": "Bearer endpoint-token"}
+            )
+            assert response.status_code == 200
+        assert response.json()["size"] == len(log)
+        
+        response = client.get(f"/api/runs/{run_id}/output", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.content == log
+        
+        response = client.get(
+            f"/api/runs/{run_id}/output",
+            headers={**auth_headers, "Range": "bytes=4990-5009"}
+        )
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 4990-5009/{len(log)}"
+        assert response.content == log[4990:5010]
+        
+        response = client.get(
+            f"/api/runs/{run_id}/output",
+            headers={**auth_headers, "Range": f"bytes={len(log)}-"}
+        )
+        assert response.status_code == 416
+    
+    def test_archived_run_output(self, client, db, test_tenant, auth_headers, endpoint, tmp_path, monkeypatch):
+        """Test that uploaded logs are archived with their run and still served with ranges."""
+        pytest.importorskip("pyarrow")
+        from crontopus_api.services import archive
+        monkeypatch.setattr(settings, "run_archive_uri", str(tmp_path))
+        monkeypatch.setattr(settings, "run_output_segment_size", 1000)
+        run_id = self._checkin(client, endpoint.id, "endpoint-token").json()["run_id"]
+        log = b"".join(f"line {i}\n".encode() for i in range(1000))
+        response = client.post(
+            f"/api/runs/{run_id}/output",
+            content=log,
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+        assert response.status_code == 200
+        
+        before = datetime.now(timezone.utc) + timedelta(minutes=1)
+        assert archive.archive_tenant_runs(db, test_tenant.id, before, 100, 1000) == 1
+        assert db.query(JobRunOutputSegment).filter_by(run_id=run_id).count() == 0
+        
+        response = client.get(f"/api/runs/{run_id}/output", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.content == log
+        
+        response = client.get(
+            f"/api/runs/{run_id}/output",
+            headers={**auth_headers, "Range": "bytes=4990-5009"}
+        )
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 4990-5009/{len(log)}"
+        assert response.content == log[4990:5010]
+    
+    def test_upload_run_output_requires_endpoint_token(self, client, endpoint):
+        """Test that only the run's endpoint can upload output."""
+        run_id = self._checkin(client, endpoint.id, "endpoint-token").json()["run_id"]
+        
+        response = client.post(f"/api/runs/{run_id}/output", content=b"log")
+        assert response.status_code == 401
+        
+        response = client.post(
+            f"/api/runs/{run_id}/output",
+            content=b"log",
+            headers={"Authorization": "Bearer wrong-token"}
+        )
+        assert response.status_code == 401
+
+
 class TestRunHistory:
     """Tests for run history endpoints."""
     
@@ -124,7 +366,7 @@ class TestRunHistory:
     
     def test_list_all_runs(self, client, auth_headers, sample_runs):
         """Test listing all runs for tenant."""
-        response = client.get("/api/runs", headers=auth_headers)
+        response = client.get("/api/runs?count=exact", headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json()
@@ -132,14 +374,14 @@ class TestRunHistory:
         assert "runs" in data
         assert "total" in data
         assert data["total"] == 10
-        assert data["page"] == 1
+        assert "page" not in data
         assert data["page_size"] == 100  # Default limit is 100
         assert len(data["runs"]) == 10
     
     def test_list_runs_limit(self, client, auth_headers, sample_runs):
         """Test limiting run list size."""
         response = client.get(
-            "/api/runs?limit=5",
+            "/api/runs?limit=5&count=exact",
             headers=auth_headers
         )
         
@@ -148,13 +390,95 @@ class TestRunHistory:
         
         assert len(data["runs"]) == 5
         assert data["total"] == 10
-        assert data["page"] == 1
         assert data["page_size"] == 5
     
+    def test_list_runs_without_count(self, client, auth_headers, sample_runs):
+        """Test that totals are skipped by default."""
+        response = client.get("/api/runs?limit=5", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["total"] is None
+        assert data["count_strategy"] == "none"
+        assert data["has_more"] is True
+    
+    def test_list_runs_estimated_count(self, client, auth_headers, sample_runs):
+        """Test that estimated totals report their strategy."""
+        response = client.get("/api/runs?count=estimated", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["count_strategy"] == "estimated"
+        assert data["total"] >= 0
+        assert data["has_more"] is False
+    
+    def test_list_runs_cursor_pagination(self, client, auth_headers, sample_runs):
+        """Test walking the run list with next_cursor."""
+        seen = []
+        cursor = None
+        for _ in range(4):
+            params = {"limit": 4}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/runs", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(run["id"] for run in data["runs"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        # Newest first, every run exactly once
+        assert seen == [run.id for run in sample_runs]
+        assert cursor is None
+    
+    def test_list_runs_summary_view(self, client, auth_headers, sample_runs):
+        """Test that the default summary view leaves out output and error_message."""
+        response = client.get("/api/runs", headers=auth_headers)
+        
+        assert response.status_code == 200
+        runs = response.json()["runs"]
+        assert [run["id"] for run in runs] == [run.id for run in sample_runs]
+        assert all("output" not in run and "error_message" not in run for run in runs)
+        assert runs[0]["job_name"] == "job-0"
+        
+        # The full view includes output
+        response = client.get("/api/runs?limit=1&view=full", headers=auth_headers)
+        assert response.json()["runs"][0]["output"] == "Output for run 0"
+    
+    def test_export_runs(self, client, auth_headers, sample_runs):
+        """Test that /runs/export streams every matching run as NDJSON or CSV."""
+        run_ids = [run.id for run in sample_runs]
+        
+        response = client.get("/api/runs/export", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+        runs = [json.loads(line) for line in response.text.splitlines()]
+        assert [run["id"] for run in runs] == run_ids
+        assert runs[0]["output"] == "Output for run 0"
+        
+        response = client.get("/api/runs/export?format=csv&view=summary&job_name=job-0", headers=auth_headers)
+        
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0].split(",")[:3] == ["id", "tenant_id", "job_name"]
+        assert "output" not in lines[0]
+        assert [int(line.split(",")[0]) for line in lines[1:]] == run_ids[::3]
+    
+    def test_list_runs_invalid_cursor(self, client, auth_headers):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/api/runs?cursor=not-a-cursor", headers=auth_headers)
+        
+        assert response.status_code == 400
+    
     def test_filter_runs_by_job_name(self, client, auth_headers, sample_runs):
         """Test filtering runs by job name."""
         response = client.get(
-            "/api/runs?job_name=job-0",
+            "/api/runs?job_name=job-0&count=exact",
             headers=auth_headers
         )
         
@@ -169,7 +493,7 @@ class TestRunHistory:
     def test_filter_runs_by_status(self, client, auth_headers, sample_runs):
         """Test filtering runs by status."""
         response = client.get(
-            "/api/runs?status=success",
+            "/api/runs?status=success&count=exact",
             headers=auth_headers
         )
         
@@ -240,3 +564,628 @@ class TestRunHistory:
         
         # HTTPBearer returns 403 when no credentials provided
         assert response.status_code == 403
+    
+    def test_runs_by_endpoint(self, client, db, test_tenant, auth_headers):
+        """Test per-endpoint aggregation, including endpoints without runs."""
+        busy = Endpoint(tenant_id=test_tenant.id, name="busy", hostname="h1", platform="linux", machine_id="m1", version="1.0", token_hash="x")
+        quiet = Endpoint(tenant_id=test_tenant.id, name="quiet", hostname="h2", platform="linux", machine_id="m2", version="1.0", token_hash="x")
+        idle = Endpoint(tenant_id=test_tenant.id, name="idle", hostname="h3", platform="linux", machine_id="m3", version="1.0", token_hash="x")
+        db.add_all([busy, quiet, idle])
+        db.commit()
+        
+        now = datetime.utcnow()
+        for i, status in enumerate([JobStatus.SUCCESS, JobStatus.SUCCESS, JobStatus.FAILURE]):
+            db.add(JobRun(tenant_id=test_tenant.id, job_name="job", status=status,
+                          started_at=now - timedelta(minutes=i), endpoint_id=busy.id))
+        db.add(JobRun(tenant_id=test_tenant.id, job_name="job", status=JobStatus.SUCCESS,
+                      started_at=now, endpoint_id=quiet.id))
+        # Outside the window
+        db.add(JobRun(tenant_id=test_tenant.id, job_name="job", status=JobStatus.FAILURE,
+                      started_at=now - timedelta(days=30), endpoint_id=quiet.id))
+        db.commit()
+        # Runs added through the ORM bypass insert_runs(), so build their rollups
+        rebuild_rollups(db)
+        db.commit()
+        
+        response = client.get("/api/runs/by-endpoint", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert [(e["name"], e["run_count"], e["success_count"], e["failure_count"], e["health"])
+                for e in data["endpoints"]] == [
+            ("busy", 3, 2, 1, "warning"),
+            ("quiet", 1, 1, 0, "healthy"),
+            ("idle", 0, 0, 0, "warning"),
+        ]
+        
+        # Sorted and paginated in SQL; total still counts every endpoint
+        response = client.get(
+            "/api/runs/by-endpoint?sort=name&order=asc&limit=1&offset=1",
+            headers=auth_headers
+        )
+        data = response.json()
+        assert [e["name"] for e in data["endpoints"]] == ["idle"]
+        assert data["total"] == 3
+        
+        # Single-day windows scan job_run directly
+        response = client.get("/api/runs/by-endpoint?days=1", headers=auth_headers)
+        assert [(e["name"], e["run_count"]) for e in response.json()["endpoints"]] == [
+            ("busy", 3), ("quiet", 1), ("idle", 0)
+        ]
+    
+    def test_runs_by_job_uses_rollups(self, client, db, test_tenant, auth_headers):
+        """Test that check-ins maintain the hourly rollups read by /runs/by-job."""
+        for i, status in enumerate(["success", "success", "failure"]):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": "backup",
+                "status": status,
+                "started_at": (datetime.utcnow() - timedelta(hours=i)).isoformat(),
+                "duration": 10 * (i + 1)
+            })
+            assert response.status_code == 201
+        
+        # Check-ins only queue their runs until the compactor folds them in
+        assert db.query(JobRunRollupHourly).filter_by(tenant_id=test_tenant.id).count() == 0
+        assert db.query(JobRunRollupPending).filter_by(tenant_id=test_tenant.id).count() == 3
+        assert compact_rollups(db, batch_size=2) == 3
+        assert db.query(JobRunRollupPending).count() == 0
+        
+        rollups = db.query(JobRunRollupHourly).filter_by(tenant_id=test_tenant.id, job_name="backup").all()
+        assert sum(r.run_count for r in rollups) == 3
+        assert sum(r.duration_sum for r in rollups) == 60
+        
+        response = client.get("/api/runs/by-job?days=7", headers=auth_headers)
+        
+        assert response.status_code == 200
+        job = response.json()["jobs"][0]
+        assert (job["job_name"], job["namespace"]) == ("backup", "default")
+        assert (job["run_count"], job["success_count"], job["failure_count"]) == (3, 2, 1)
+        
+        response = client.get("/api/runs/by-job?days=7&status=failure", headers=auth_headers)
+        job = response.json()["jobs"][0]
+        assert (job["run_count"], job["success_count"], job["failure_count"]) == (1, 0, 1)
+    
+    def test_rebuild_rollups_counts_queued_runs_once(self, client, db, test_tenant, auth_headers):
+        """Test that rebuilding rollups dequeues the runs it counts and leaves the rest to the compactor."""
+        now = datetime.now(timezone.utc)
+        for i in range(3):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": "backup",
+                "status": "success",
+                "started_at": (now - timedelta(hours=i)).isoformat()
+            })
+            assert response.status_code == 201
+        
+        # Only the current hour is rebuilt; older queued runs stay queued
+        assert rebuild_rollups(db, tenant_id=test_tenant.id, since=now) == 1
+        db.commit()
+        assert db.query(JobRunRollupPending).filter_by(tenant_id=test_tenant.id).count() == 2
+        
+        assert compact_rollups(db, batch_size=100) == 2
+        total = db.query(func.sum(JobRunRollupHourly.run_count)).filter_by(tenant_id=test_tenant.id).scalar()
+        assert total == 3
+    
+    def test_duration_stats(self, client, db, test_tenant, auth_headers):
+        """Test duration percentiles: exact for a day, from rollup histograms for longer windows."""
+        for i in range(10):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": "backup",
+                "status": "success",
+                "started_at": (datetime.utcnow() - timedelta(minutes=i)).isoformat(),
+                "duration": 10 * (i + 1)
+            })
+            assert response.status_code == 201
+        compact_rollups(db, batch_size=100)
+        
+        response = client.get("/api/runs/stats/durations?days=1", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["approximate"] is False
+        job = data["jobs"][0]
+        assert (job["job_name"], job["run_count"], job["min"], job["max"]) == ("backup", 10, 10, 100)
+        assert job["mean"] == pytest.approx(55)
+        assert job["stddev"] == pytest.approx(28.7228, abs=1e-3)
+        assert (job["p50"], job["p90"]) == (pytest.approx(55), pytest.approx(91))
+        
+        response = client.get("/api/runs/stats/durations?days=7", headers=auth_headers)
+        
+        data = response.json()
+        assert data["approximate"] is True
+        job = data["jobs"][0]
+        assert job["mean"] == pytest.approx(55)
+        assert job["stddev"] == pytest.approx(28.7228, abs=1e-3)
+        # Nearest-rank percentiles, overestimated by at most one bucket (10%)
+        assert 50 <= job["p50"] <= 55
+        assert job["p99"] == 100
+        
+        # Hours rolled up before sums of squares were recorded have no stddev
+        db.query(JobRunRollupHourly).filter_by(tenant_id=test_tenant.id).update({"duration_sum_squares": None})
+        db.commit()
+        job = client.get("/api/runs/stats/durations?days=7", headers=auth_headers).json()["jobs"][0]
+        assert job["mean"] == pytest.approx(55)
+        assert job["stddev"] is None
+    
+    def test_runs_histogram(self, client, db, test_tenant, auth_headers):
+        """Test run counts per bucket, from job_run and from the rollups."""
+        for i, status in enumerate(["success", "failure", "timeout", "success"]):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": "backup",
+                "status": status,
+                "started_at": (datetime.utcnow() - timedelta(hours=i)).isoformat()
+            })
+            assert response.status_code == 201
+        compact_rollups(db, batch_size=100)
+        
+        response = client.get("/api/runs/histogram?bucket=5m", headers=auth_headers)
+        
+        assert response.status_code == 200
+        buckets = response.json()["buckets"]
+        assert len(buckets) == 289  # 24 hours plus the partial bucket at the window start
+        assert sum(b["run_count"] for b in buckets) == 4
+        assert [b["failure_count"] for b in buckets if b["run_count"]] == [0, 0, 1, 0]
+        
+        # Day buckets over two days come from the rollups
+        response = client.get("/api/runs/histogram?bucket=1d&days=2&status=success", headers=auth_headers)
+        buckets = response.json()["buckets"]
+        assert sum(b["success_count"] for b in buckets) == 2
+        assert sum(b["run_count"] for b in buckets) == 2
+        assert sum(b["timeout_count"] for b in buckets) == 0
+        
+        response = client.get("/api/runs/histogram?bucket=5m&days=60", headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_latest_runs(self, client, test_tenant, auth_headers):
+        """Test that check-ins keep the latest run and failure streak of each job."""
+        def checkin(job_name, status, minutes_ago):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": job_name,
+                "status": status,
+                "started_at": (datetime.utcnow() - timedelta(minutes=minutes_ago)).isoformat()
+            })
+            assert response.status_code == 201
+            return response.json()["run_id"]
+        
+        checkin("backup", "success", 40)
+        checkin("backup", "failure", 30)
+        last_run_id = checkin("backup", "timeout", 20)
+        checkin("backup", "success", 90)  # arrives late; older than the latest run
+        checkin("sync", "failure", 10)
+        checkin("sync", "success", 5)
+        
+        response = client.get("/api/runs/latest", headers=auth_headers)
+        
+        assert response.status_code == 200
+        jobs = {job["job_name"]: job for job in response.json()["jobs"]}
+        assert (jobs["backup"]["last_run_id"], jobs["backup"]["status"]) == (last_run_id, "timeout")
+        assert jobs["backup"]["consecutive_failures"] == 2
+        assert (jobs["sync"]["status"], jobs["sync"]["consecutive_failures"]) == ("success", 0)
+        
+        response = client.get("/api/runs/latest?status=timeout", headers=auth_headers)
+        assert [job["job_name"] for job in response.json()["jobs"]] == ["backup"]
+    
+    def test_latest_runs_mixed_replay(self, db, test_tenant):
+        """Test that a replayed batch mixing older and newer runs only counts the newer failures."""
+        base = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        
+        def replay(job_name, runs):
+            rows = [
+                {"tenant_id": test_tenant.id, "job_name": job_name, "status": status, "started_at": base + timedelta(minutes=minute)}
+                for _, status, minute in runs
+            ]
+            upsert_last_status(db, rows, [run_id for run_id, _, _ in runs])
+            db.commit()
+            return db.query(JobLastStatus).filter_by(tenant_id=test_tenant.id, job_name=job_name).one()
+        
+        replay("backup", [(1, JobStatus.SUCCESS, 10)])
+        latest = replay("backup", [(2, JobStatus.FAILURE, 5), (3, JobStatus.FAILURE, 20)])
+        assert (latest.last_run_id, latest.consecutive_failures) == (3, 1)
+        
+        replay("sync", [(4, JobStatus.FAILURE, 0), (5, JobStatus.FAILURE, 2), (6, JobStatus.FAILURE, 10)])
+        latest = replay("sync", [(7, JobStatus.SUCCESS, 5), (8, JobStatus.FAILURE, 20)])
+        assert (latest.last_run_id, latest.consecutive_failures) == (8, 4)
+    
+    def test_runs_conditional_get(self, client, db, test_tenant, auth_headers):
+        """Test that run views answer a matching If-None-Match with 304 until a new check-in."""
+        def checkin(job_name):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": job_name,
+                "status": "success",
+                "started_at": datetime.utcnow().isoformat()
+            })
+            assert response.status_code == 201
+            compact_rollups(db, batch_size=100)
+        
+        checkin("backup")
+        
+        for path in ["/api/runs?view=summary", "/api/runs/by-job", "/api/runs/by-endpoint"]:
+            response = client.get(path, headers=auth_headers)
+            assert response.status_code == 200
+            etag = response.headers["etag"]
+            assert etag.startswith('W/"')
+            
+            cached = client.get(path, headers=auth_headers)
+            assert (cached.headers["etag"], cached.json()) == (etag, response.json())
+            
+            response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+            assert response.content == b""
+        
+        etag = client.get("/api/runs/by-job", headers=auth_headers).headers["etag"]
+        checkin("sync")
+        response = client.get("/api/runs/by-job", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert {job["job_name"] for job in response.json()["jobs"]} == {"backup", "sync"}
+    
+    def test_search_runs(self, client, test_tenant, auth_headers):
+        """Test that output search ranks error message matches first and applies run filters."""
+        def checkin(job_name, status, output, error_message=None):
+            response = client.post("/api/checkins", json={
+                "tenant": test_tenant.id,
+                "job_name": job_name,
+                "status": status,
+                "output": output,
+                "error_message": error_message,
+                "started_at": datetime.utcnow().isoformat()
+            })
+            assert response.status_code == 201
+            return response.json()["run_id"]
+        
+        failed_id = checkin("backup", "failure", "writing archive\nerror: disk full", "disk full")
+        succeeded_id = checkin("backup", "success", "disk usage 40%, full backup done")
+        checkin("sync", "success", "synced 10 files")
+        
+        response = client.get("/api/runs/search", params={"q": "disk full"}, headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [run["id"] for run in data["runs"]] == [failed_id, succeeded_id]
+        assert data["runs"][0]["rank"] > data["runs"][1]["rank"]
+        assert data["runs"][0]["snippet"] == "disk full"
+        assert "output" not in data["runs"][0]
+        assert data["has_more"] is False
+        
+        response = client.get("/api/runs/search", params={"q": "disk full", "status": "success"}, headers=auth_headers)
+        assert [run["id"] for run in response.json()["runs"]] == [succeeded_id]
+        
+        response = client.get("/api/runs/search", params={"q": "disk", "limit": 1}, headers=auth_headers)
+        assert response.json()["has_more"] is True
+    
+    def test_runs_fall_back_to_archive(self, client, db, test_tenant, auth_headers, tmp_path, monkeypatch):
+        """Test that archived runs are still listed and retrievable."""
+        pytest.importorskip("pyarrow")
+        from crontopus_api.services import archive
+        monkeypatch.setattr(settings, "run_archive_uri", str(tmp_path))
+        
+        now = datetime.now(timezone.utc)
+        runs = []
+        for days_ago in [1, 2, 120, 200, 201]:
+            run = JobRun(
+                tenant_id=test_tenant.id,
+                job_name=f"job-{days_ago}",
+                status=JobStatus.SUCCESS,
+                started_at=now - timedelta(days=days_ago),
+                duration=days_ago
+            )
+            run.output = f"output {days_ago}"
+            db.add(run)
+            runs.append(run)
+        db.commit()
+        archived_id = runs[3].id
+        
+        archived = archive.archive_tenant_runs(db, test_tenant.id, archive.archive_cutoff(), 2, 1000)
+        assert archived == 3
+        assert db.query(JobRun).filter_by(tenant_id=test_tenant.id).count() == 2
+        
+        # Pages continue from job_run into the archive
+        durations = []
+        params = {"limit": 2, "count": "exact"}
+        while True:
+            data = client.get("/api/runs", params=params, headers=auth_headers).json()
+            assert data["total"] == 5
+            durations += [run["duration"] for run in data["runs"]]
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+        assert durations == [1, 2, 120, 200, 201]
+        
+        # Windows within hot retention skip the archive
+        data = client.get("/api/runs?days=30", headers=auth_headers).json()
+        assert [run["duration"] for run in data["runs"]] == [1, 2]
+        
+        data = client.get("/api/runs?job_name=JOB-20", headers=auth_headers).json()
+        assert [run["duration"] for run in data["runs"]] == [200, 201]
+        
+        response = client.get(f"/api/runs/{archived_id}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["output"] == "output 200"
+
+    
+    def test_run_caught_mid_archive_listed_once(self, client, db, test_tenant, auth_headers, tmp_path, monkeypatch):
+        """Test that a run both archived and still in job_run is listed and counted once."""
+        pytest.importorskip("pyarrow")
+        from crontopus_api.services import archive
+        monkeypatch.setattr(settings, "run_archive_uri", str(tmp_path))
+        run = JobRun(
+            tenant_id=test_tenant.id,
+            job_name="backup",
+            status=JobStatus.SUCCESS,
+            started_at=datetime.now(timezone.utc) - timedelta(days=200)
+        )
+        db.add(run)
+        db.commit()
+        
+        # The archive file is written, then deleting the run fails
+        def failing_delete(session, run_ids):
+            raise RuntimeError("lock timeout")
+        monkeypatch.setattr(archive, "delete_runs", failing_delete)
+        with pytest.raises(RuntimeError):
+            archive.archive_tenant_runs(db, test_tenant.id, archive.archive_cutoff(), 10, 1000)
+        assert archive.find_runs(test_tenant.id, 10)[0].id == run.id
+        
+        data = client.get("/api/runs?count=exact", headers=auth_headers).json()
+        
+        assert [r["id"] for r in data["runs"]] == [run.id]
+        assert data["total"] == 1
+    
+    def test_archive_pruned_by_retention(self, client, db, test_tenant, auth_headers, tmp_path, monkeypatch):
+        """Test that archived months expired by the tenant's retention policies are deleted."""
+        pytest.importorskip("pyarrow")
+        from crontopus_api.services import archive
+        monkeypatch.setattr(settings, "run_archive_uri", str(tmp_path))
+        now = datetime.now(timezone.utc)
+        for days_ago in [100, 200]:
+            db.add(JobRun(
+                tenant_id=test_tenant.id,
+                job_name=f"job-{days_ago}",
+                status=JobStatus.SUCCESS,
+                started_at=now - timedelta(days=days_ago),
+                duration=days_ago
+            ))
+        db.commit()
+        assert archive.archive_tenant_runs(db, test_tenant.id, archive.archive_cutoff(), 10, 1000) == 2
+        
+        tenant_policy = RunRetentionPolicy(tenant_id=test_tenant.id, namespace="", retention_days=150)
+        namespace_policy = RunRetentionPolicy(tenant_id=test_tenant.id, namespace="adhoc", keep_last=5)
+        assert archive.archive_retention_cutoff([namespace_policy], now) is None
+        assert archive.archive_retention_cutoff([tenant_policy, namespace_policy], now) is None
+        cutoff = archive.archive_retention_cutoff([tenant_policy], now)
+        assert cutoff == now - timedelta(days=150)
+        
+        assert archive.prune_archive(test_tenant.id, cutoff) == [archive._month_key(now - timedelta(days=200))]
+        
+        data = client.get("/api/runs", headers=auth_headers).json()
+        assert [run["duration"] for run in data["runs"]] == [100]
+
+class TestRunImport:
+    """Tests for POST /api/runs/import endpoint."""
+    
+    def test_import_runs(self, client, db, test_user, auth_headers):
+        """Test that NDJSON runs are bulk loaded with their output."""
+        test_user.role = "admin"
+        db.commit()
+        lines = [
+            json.dumps({
+                "job_name": f"imported-{i}",
+                "namespace": "legacy",
+                "status": "failure" if i % 2 else "success",
+                "started_at": "2024-01-15T10:00:00",
+                "output": f"output {i}" if i % 3 == 0 else None,
+                "error_message": 'quoted "error", with comma' if i % 2 else None,
+            })
+            for i in range(50)
+        ]
+        lines.insert(10, '{"job_name": "missing-fields"}')
+        
+        response = client.post(
+            "/api/runs/import",
+            content="\n".join(lines).encode(),
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 50
+        assert data["rejected"] == 1
+        assert data["errors"][0]["line"] == 11
+        
+        runs = db.query(JobRun).filter(JobRun.namespace == "legacy").all()
+        assert len(runs) == 50
+        by_name = {run.job_name: run for run in runs}
+        assert by_name["imported-3"].output == "output 3"
+        assert by_name["imported-3"].error_message == 'quoted "error", with comma'
+        assert by_name["imported-4"].status == JobStatus.SUCCESS
+    
+    def test_import_requires_admin(self, client, auth_headers):
+        """Test that non-admin users cannot import runs."""
+        response = client.post(
+            "/api/runs/import",
+            content=b'{"job_name": "x", "status": "success", "started_at": "2024-01-15T10:00:00"}',
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 403
+
+
+class TestBufferedIngestion:
+    """Tests for the write-behind ingestion queue."""
+    
+    def _row(self, tenant_id, job_name):
+        return {
+            "tenant_id": tenant_id,
+            "job_name": job_name,
+            "namespace": "production",
+            "status": JobStatus.SUCCESS,
+            "started_at": datetime.utcnow(),
+            "finished_at": datetime.utcnow(),
+            "duration": 1,
+            "output": None,
+            "error_message": None,
+            "exit_code": 0,
+            "agent_id": None,
+            "endpoint_id": None,
+        }
+    
+    async def test_stop_drains_buffer(self, db, test_tenant):
+        """Test that stopping the queue group-commits every buffered run."""
+        queue = RunIngestionQueue(
+            session_factory=lambda: db,
+            flush_interval_ms=60000,
+            flush_max_rows=2,
+            max_size=10
+        )
+        await queue.start()
+        for i in range(5):
+            queue.enqueue(self._row(test_tenant.id, f"buffered-{i}"))
+        
+        await queue.stop()
+        
+        assert queue.depth == 0
+        count = db.query(JobRun).filter(JobRun.job_name.like("buffered-%")).count()
+        assert count == 5
+    
+    async def test_partial_flush_requeues_uncommitted_rows(self, live_db, monkeypatch):
+        """Test that a flush failing partway through the per-row retry only requeues unwritten rows."""
+        # Real commits and rollbacks: the db fixture's outer transaction would not survive them
+        calls = []
+        original = ingestion.insert_runs
+        
+        def flaky_insert_runs(session, rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise IntegrityError("INSERT", {}, Exception("duplicate key"))
+            if len(calls) == 3:
+                raise OperationalError("INSERT", {}, Exception("connection lost"))
+            return original(session, rows)
+        
+        monkeypatch.setattr(ingestion, "insert_runs", flaky_insert_runs)
+        queue = RunIngestionQueue(
+            session_factory=lambda: live_db,
+            flush_interval_ms=60000,
+            flush_max_rows=10,
+            max_size=10
+        )
+        for i in range(3):
+            queue.enqueue(self._row("test-tenant", f"buffered-{i}"))
+        
+        with pytest.raises(PartialFlush):
+            await queue.flush()
+        assert queue.depth == 2
+        
+        assert await queue.flush() == 2
+        names = [run.job_name for run in live_db.query(JobRun).filter(JobRun.job_name.like("buffered-%"))]
+        assert sorted(names) == ["buffered-0", "buffered-1", "buffered-2"]
+    
+    def test_enqueue_rejects_when_full(self, test_tenant):
+        """Test that a full buffer raises QueueFull."""
+        queue = RunIngestionQueue(
+            session_factory=lambda: None,
+            flush_interval_ms=200,
+            flush_max_rows=10,
+            max_size=1
+        )
+        queue.enqueue(self._row(test_tenant.id, "first"))
+        
+        with pytest.raises(QueueFull):
+            queue.enqueue(self._row(test_tenant.id, "second"))
+
+
+class TestAsyncEngine:
+    """Tests that run check-ins and listings on the real asyncpg engine."""
+    
+    @pytest.fixture
+    def live_endpoint(self, live_db, live_auth_headers):
+        """Create an enrolled endpoint with a known token on the live database."""
+        endpoint = Endpoint(
+            tenant_id="test-tenant",
+            name="test-endpoint",
+            hostname="test-host",
+            token_hash=get_password_hash("endpoint-token"),
+            status=EndpointStatus.ACTIVE
+        )
+        live_db.add(endpoint)
+        live_db.commit()
+        return endpoint.id
+    
+    def _checkin(self, live_client, endpoint_id, **fields):
+        return live_client.post(
+            "/api/runs/check-in",
+            json={"endpoint_id": endpoint_id, "job_name": "backup-db", "namespace": "production", "status": "success", **fields},
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+    
+    def test_agent_checkin(self, live_client, live_db, live_endpoint):
+        """Test that an agent check-in is committed through asyncpg."""
+        response = self._checkin(live_client, live_endpoint, duration=12)
+        
+        assert response.status_code == 201
+        run = live_db.get(JobRun, response.json()["run_id"])
+        assert (run.namespace, run.endpoint_id, run.duration) == ("production", live_endpoint, 12)
+        
+        response = live_client.post(
+            "/api/runs/check-in/batch",
+            json={"checkins": [
+                {"endpoint_id": live_endpoint, "job_name": f"job-{i}", "namespace": "production", "status": "failure"}
+                for i in range(3)
+            ]},
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+        assert response.status_code == 200
+        assert response.json()["accepted"] == 3
+        assert live_db.query(JobRun).count() == 4
+    
+    def test_list_runs(self, live_client, live_endpoint, live_auth_headers):
+        """Test that runs checked in through asyncpg are listed and their logs served."""
+        run_ids = [self._checkin(live_client, live_endpoint).json()["run_id"] for _ in range(3)]
+        
+        response = live_client.get("/api/runs?limit=2", headers=live_auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [run["id"] for run in data["runs"]] == run_ids[:0:-1]
+        response = live_client.get(f"/api/runs?limit=2&cursor={data['next_cursor']}", headers=live_auth_headers)
+        assert [run["id"] for run in response.json()["runs"]] == run_ids[:1]
+        
+        response = live_client.post(
+            f"/api/runs/{run_ids[0]}/output",
+            content=b"log line\n",
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+        assert response.status_code == 200
+        response = live_client.get(f"/api/runs/{run_ids[0]}/output", headers=live_auth_headers)
+        assert response.status_code == 200
+        assert response.content == b"log line\n"
+    
+    def test_checkin_with_output_is_searchable(self, live_client, live_endpoint, live_auth_headers):
+        """Test that output sent with a check-in is indexed for search through asyncpg."""
+        response = self._checkin(
+            live_client, live_endpoint, status="failure",
+            output="writing archive\nerror: disk full", error_message="disk full"
+        )
+        assert response.status_code == 201
+        failed_id = response.json()["run_id"]
+        
+        response = live_client.post(
+            "/api/runs/check-in/batch",
+            json={"checkins": [{
+                "endpoint_id": live_endpoint, "job_name": "backup-db", "namespace": "production",
+                "status": "success", "output": "disk usage 40%, full backup done"
+            }]},
+            headers={"Authorization": "Bearer endpoint-token"}
+        )
+        assert response.json()["accepted"] == 1
+        succeeded_id = response.json()["results"][0]["run_id"]
+        
+        response = live_client.get("/api/runs/search", params={"q": "disk full"}, headers=live_auth_headers)
+        
+        assert response.status_code == 200
+        assert [run["id"] for run in response.json()["runs"]] == [failed_id, succeeded_id]
@@ -0,0 +1,67 @@
+"""
+Tests for run history on a schema built by the Alembic migrations.
+
+The other tests build the schema with create_all(), which follows the
+models rather than the migrations.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.mark.migrated_schema
+def test_runs_histogram(live_client, live_auth_headers):
+    """Test that the job_run histogram counts every status, including running."""
+    for i, status in enumerate(["running", "success", "failure", "success"]):
+        response = live_client.post("/api/checkins", json={
+            "tenant": "test-tenant",
+            "job_name": "backup",
+            "status": status,
+            "started_at": (datetime.utcnow() - timedelta(hours=i)).isoformat()
+        })
+        assert response.status_code == 201
+
+    response = live_client.get("/api/runs/histogram", headers=live_auth_headers)
+
+    assert response.status_code == 200
+    buckets = response.json()["buckets"]
+    assert sum(b["run_count"] for b in buckets) == 4
+    assert sum(b["running_count"] for b in buckets) == 1
+    assert sum(b["success_count"] for b in buckets) == 2
+
+    response = live_client.get("/api/runs/histogram?bucket=5m", headers=live_auth_headers)
+    assert response.status_code == 200
+    assert sum(b["failure_count"] for b in response.json()["buckets"]) == 1
+
+
+@pytest.mark.migrated_schema(revision="c4d92e7f3a18")
+def test_rollups_backfilled(live_db, upgrade_live_database, request):
+    """Test that the rollup migration aggregates existing runs, so long windows cover them."""
+    started_at = datetime.now(timezone.utc) - timedelta(days=3)
+    for i in range(10):
+        live_db.execute(text("""
+            INSERT INTO job_run (tenant_id, namespace, job_name, status, started_at, duration)
+            VALUES ('test-tenant', 'production', 'backup', :status, :started_at, :duration)
+        """), {
+            "status": "FAILURE" if i == 0 else "SUCCESS",
+            "started_at": started_at + timedelta(hours=i),
+            "duration": 10 * (i + 1)
+        })
+    live_db.commit()
+
+    upgrade_live_database()
+    live_client = request.getfixturevalue("live_client")
+    live_auth_headers = request.getfixturevalue("live_auth_headers")
+
+    response = live_client.get("/api/runs/by-job?days=7", headers=live_auth_headers)
+
+    assert response.status_code == 200
+    job = response.json()["jobs"][0]
+    assert (job["run_count"], job["success_count"], job["failure_count"]) == (10, 9, 1)
+
+    response = live_client.get("/api/runs/stats/durations?days=7", headers=live_auth_headers)
+    job = response.json()["jobs"][0]
+    assert (job["run_count"], job["min"], job["max"]) == (10, 10, 100)
+    assert job["stddev"] == pytest.approx(28.7228, abs=1e-3)
+    assert job["p99"] == 100
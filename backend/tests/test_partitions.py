@@ -0,0 +1,153 @@
+"""
+Tests for monthly job_run partitions.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from crontopus_api.config import Base
+from crontopus_api.models import CheckinIdempotencyKey, JobRun, JobRunOutput, JobRunOutputSegment, JobStatus
+from crontopus_api.services.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_partition,
+    drop_partitions_before,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+)
+
+
+def _utc(year, month, day=1, hour=0):
+    return datetime(year, month, day, hour, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def partitioned_db(postgres_container):
+    """
+    Session on a scratch database whose job_run is partitioned like the
+    migration leaves it (without the legacy partition).
+    
+    Partition maintenance commits, so it cannot share the rolled-back
+    test transaction of the db fixture.
+    """
+    url = make_url(postgres_container.get_connection_url())
+    name = f"partitions_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f"CREATE DATABASE {name}"))
+    
+    engine = create_engine(url.set(database=name))
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE job_run RENAME TO job_run_plain"))
+        conn.execute(text(
+            "CREATE TABLE job_run (LIKE job_run_plain INCLUDING DEFAULTS) PARTITION BY RANGE (started_at)"
+        ))
+        conn.execute(text("ALTER TABLE job_run ADD PRIMARY KEY (id, started_at)"))
+        conn.execute(text("ALTER SEQUENCE job_run_id_seq OWNED BY job_run.id"))
+        conn.execute(text("DROP TABLE job_run_plain"))
+        conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF job_run DEFAULT"))
+    
+    session = sessionmaker(bind=engine)()
+    yield session
+    
+    session.close()
+    engine.dispose()
+    with admin.connect() as conn:
+        conn.execute(text(f"DROP DATABASE {name}"))
+    admin.dispose()
+
+
+def _add_run(db, started_at, with_side_rows=False):
+    run = JobRun(tenant_id="test-tenant", job_name="backup", status=JobStatus.SUCCESS, started_at=started_at)
+    db.add(run)
+    db.flush()
+    if with_side_rows:
+        db.add(JobRunOutput(**JobRunOutput.values_for(run.id, "output", None)))
+        db.add(JobRunOutputSegment(run_id=run.id, byte_offset=0, byte_length=3, data=b"log"))
+        db.add(CheckinIdempotencyKey(endpoint_id=1, key=f"key-{run.id}", run_id=run.id))
+    db.commit()
+    return run.id
+
+
+def _partition_names(db):
+    return [partition.name for partition in list_partitions(db)]
+
+
+def _run_ids(db, table):
+    return {run_id for (run_id,) in db.execute(text(f"SELECT id FROM {table}"))}
+
+
+class TestMonthArithmetic:
+    """Tests for month_start() and add_months()."""
+    
+    def test_add_months_across_year_boundaries(self):
+        """Months roll over into the next or previous year."""
+        assert add_months(_utc(2025, 12), 1) == _utc(2026, 1)
+        assert add_months(_utc(2026, 1), -1) == _utc(2025, 12)
+        assert add_months(_utc(2025, 11), 14) == _utc(2027, 1)
+        assert add_months(_utc(2026, 3), -15) == _utc(2024, 12)
+        assert add_months(_utc(2026, 3), 0) == _utc(2026, 3)
+    
+    def test_month_start_is_utc(self):
+        """Naive times are UTC; aware times are converted to UTC first."""
+        assert month_start(datetime(2026, 1, 1, 0, 30)) == _utc(2026, 1)
+        assert month_start(_utc(2025, 12, 31, 23)) == _utc(2025, 12)
+        # 00:30 on January 1st at UTC+2 is still December in UTC
+        plus_two = timezone(timedelta(hours=2))
+        assert month_start(datetime(2026, 1, 1, 0, 30, tzinfo=plus_two)) == _utc(2025, 12)
+
+
+class TestPartitionMaintenance:
+    """Tests for creating and dropping partitions (PostgreSQL)."""
+    
+    def test_ensure_partitions_is_idempotent(self, partitioned_db):
+        """Existing partitions are skipped, so repeated passes create nothing."""
+        now = _utc(2025, 12, 15)
+        
+        created = ensure_partitions(partitioned_db, months_ahead=2, now=now)
+        
+        assert created == ["job_run_p202512", "job_run_p202601", "job_run_p202602"]
+        assert ensure_partitions(partitioned_db, months_ahead=2, now=now) == []
+        # A later pass only adds the months that are new
+        assert ensure_partitions(partitioned_db, months_ahead=2, now=_utc(2026, 1, 2)) == ["job_run_p202603"]
+        assert _partition_names(partitioned_db) == [
+            "job_run_p202512", "job_run_p202601", "job_run_p202602", "job_run_p202603", DEFAULT_PARTITION
+        ]
+    
+    def test_create_partition_moves_default_rows(self, partitioned_db):
+        """Runs of the new month move out of the default partition; others stay."""
+        january = [_add_run(partitioned_db, _utc(2026, 1, day)) for day in (1, 31)]
+        february = _add_run(partitioned_db, _utc(2026, 2, 1))
+        
+        create_partition(partitioned_db, _utc(2026, 1))
+        partitioned_db.commit()
+        
+        assert _run_ids(partitioned_db, "job_run_p202601") == set(january)
+        assert _run_ids(partitioned_db, DEFAULT_PARTITION) == {february}
+        assert _run_ids(partitioned_db, "job_run") == set(january) | {february}
+    
+    def test_drop_partitions_before(self, partitioned_db):
+        """Only partitions entirely before the cutoff are dropped, with their side table rows."""
+        ensure_partitions(partitioned_db, months_ahead=2, now=_utc(2025, 11, 10))
+        _add_run(partitioned_db, _utc(2025, 11, 5), with_side_rows=True)
+        _add_run(partitioned_db, _utc(2025, 12, 31, 23), with_side_rows=True)
+        january = _add_run(partitioned_db, _utc(2026, 1, 1), with_side_rows=True)
+        # The default partition is never dropped
+        old = _add_run(partitioned_db, _utc(2025, 1, 1), with_side_rows=True)
+        
+        dropped = drop_partitions_before(partitioned_db, cutoff=_utc(2026, 1, 1))
+        
+        assert dropped == ["job_run_p202511", "job_run_p202512"]
+        assert _partition_names(partitioned_db) == ["job_run_p202601", DEFAULT_PARTITION]
+        assert _run_ids(partitioned_db, "job_run") == {january, old}
+        for model in (JobRunOutput, JobRunOutputSegment, CheckinIdempotencyKey):
+            run_ids = {run_id for (run_id,) in partitioned_db.query(model.run_id)}
+            assert run_ids == {january, old}, model.__tablename__
+        
+        assert drop_partitions_before(partitioned_db, cutoff=_utc(2026, 1, 1)) == []
@@ -0,0 +1,134 @@
+"""
+Tests for run retention policies.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+
+from crontopus_api.models import JobRun, JobRunOutput, JobRunRollupHourly, JobStatus
+from crontopus_api.services.retention import apply_retention
+from crontopus_api.services.rollups import rebuild_rollups
+
+
+def _add_runs(db, tenant_id, job_name, namespace, days_ago, count):
+    now = datetime.now(timezone.utc)
+    runs = [
+        JobRun(
+            tenant_id=tenant_id,
+            job_name=job_name,
+            namespace=namespace,
+            status=JobStatus.SUCCESS,
+            started_at=now - timedelta(days=days_ago, minutes=i)
+        )
+        for i in range(count)
+    ]
+    db.add_all(runs)
+    db.commit()
+    return runs
+
+
+class TestRetentionPolicies:
+    """Tests for /api/retention-policies endpoints."""
+    
+    def test_set_and_list_policies(self, client, auth_headers):
+        """PUT creates or replaces the policy for a namespace."""
+        response = client.put("/api/retention-policies", json={"retention_days": 30}, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["namespace"] is None
+        
+        client.put("/api/retention-policies", json={"namespace": "prod", "keep_last": 5}, headers=auth_headers)
+        response = client.put("/api/retention-policies", json={"namespace": "prod", "keep_last": 3}, headers=auth_headers)
+        assert response.json()["keep_last"] == 3
+        
+        policies = client.get("/api/retention-policies", headers=auth_headers).json()
+        assert [(p["namespace"], p["retention_days"], p["keep_last"]) for p in policies] == [
+            (None, 30, None),
+            ("prod", None, 3),
+        ]
+    
+    def test_policy_requires_a_rule(self, client, auth_headers):
+        """A policy without retention_days or keep_last is rejected."""
+        response = client.put("/api/retention-policies", json={"namespace": "prod"}, headers=auth_headers)
+        assert response.status_code == 422
+    
+    def test_delete_policy(self, client, auth_headers):
+        """Policies can be deleted; unknown ids return 404."""
+        policy = client.put("/api/retention-policies", json={"retention_days": 7}, headers=auth_headers).json()
+        
+        response = client.delete(f"/api/retention-policies/{policy['id']}", headers=auth_headers)
+        assert response.status_code == 200
+        assert client.get("/api/retention-policies", headers=auth_headers).json() == []
+        
+        response = client.delete(f"/api/retention-policies/{policy['id']}", headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestApplyRetention:
+    """Tests for the batched retention pass."""
+    
+    def test_age_and_keep_last_rules(self, client, db, test_tenant, auth_headers):
+        """Age and keep-last rules delete in batches; namespace policies override the tenant's."""
+        expired_id = _add_runs(db, test_tenant.id, "cleanup", None, 40, 5)[0].id
+        _add_runs(db, test_tenant.id, "cleanup", None, 1, 3)
+        _add_runs(db, test_tenant.id, "report", "prod", 40, 4)
+        _add_runs(db, test_tenant.id, "sync", "prod", 1, 10)
+        db.add(JobRunOutput(**JobRunOutput.values_for(expired_id, "old output", None)))
+        db.commit()
+        
+        client.put("/api/retention-policies", json={"retention_days": 30}, headers=auth_headers)
+        client.put("/api/retention-policies", json={"namespace": "prod", "keep_last": 2}, headers=auth_headers)
+        
+        deleted = apply_retention(db, batch_size=2, lock_timeout_ms=1000)
+        
+        assert deleted == {"age": 5, "keep_last": 10}
+        remaining = {}
+        for job_name, in db.query(JobRun.job_name).filter(JobRun.tenant_id == test_tenant.id):
+            remaining[job_name] = remaining.get(job_name, 0) + 1
+        # prod runs are governed by the namespace policy only, so old "report" runs survive the age rule
+        assert remaining == {"cleanup": 3, "report": 2, "sync": 2}
+        assert db.query(JobRunOutput).filter(JobRunOutput.run_id == expired_id).count() == 0
+        
+        policies = client.get("/api/retention-policies", headers=auth_headers).json()
+        assert [p["last_deleted_count"] for p in policies] == [5, 10]
+    
+    def test_retention_is_tenant_scoped(self, client, db, test_tenant, auth_headers):
+        """A tenant's policy never deletes another tenant's runs."""
+        _add_runs(db, test_tenant.id, "cleanup", None, 40, 2)
+        _add_runs(db, "other-tenant", "cleanup", None, 40, 2)
+        
+        client.put("/api/retention-policies", json={"retention_days": 30}, headers=auth_headers)
+        apply_retention(db, batch_size=100, lock_timeout_ms=1000)
+        
+        assert db.query(JobRun).filter(JobRun.tenant_id == test_tenant.id).count() == 0
+        assert db.query(JobRun).filter(JobRun.tenant_id == "other-tenant").count() == 2
+    
+    def test_rebuild_keeps_rollups_of_deleted_runs(self, client, db, test_tenant, auth_headers):
+        """Rebuilding rollups after retention only recomputes hours that still have every run."""
+        def rollup_counts():
+            return dict(db.query(JobRunRollupHourly.job_name, func.sum(JobRunRollupHourly.run_count)).filter(
+                JobRunRollupHourly.tenant_id == test_tenant.id
+            ).group_by(JobRunRollupHourly.job_name).all())
+        
+        _add_runs(db, test_tenant.id, "cleanup", None, 40, 5)
+        _add_runs(db, test_tenant.id, "cleanup", None, 1, 3)
+        _add_runs(db, test_tenant.id, "report", None, 40, 4)
+        _add_runs(db, test_tenant.id, "sync", "prod", 1, 10)
+        rebuild_rollups(db, tenant_id=test_tenant.id)
+        db.commit()
+        assert rollup_counts() == {"cleanup": 8, "report": 4, "sync": 10}
+        
+        client.put("/api/retention-policies", json={"retention_days": 30}, headers=auth_headers)
+        client.put("/api/retention-policies", json={"namespace": "prod", "keep_last": 2}, headers=auth_headers)
+        apply_retention(db, batch_size=100, lock_timeout_ms=1000)
+        
+        # Lose the recent rollups, as if runs had been written outside insert_runs()
+        db.query(JobRunRollupHourly).filter(
+            JobRunRollupHourly.job_name == "cleanup",
+            JobRunRollupHourly.hour >= datetime.now(timezone.utc) - timedelta(days=2)
+        ).delete()
+        db.commit()
+        
+        rebuild_rollups(db, tenant_id=test_tenant.id)
+        db.commit()
+        # Recent hours are rebuilt; hours whose runs were deleted keep their counts
+        assert rollup_counts() == {"cleanup": 8, "report": 4, "sync": 10}
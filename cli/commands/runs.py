@@ -3,12 +3,16 @@ Run history commands.
 
 View job execution history and details.
 """
+import shlex
+
 import click
 from datetime import datetime
 
 from core.api_client import api_client
 from core.formatter import print_table, print_json, print_error, print_info
 
+PAGE_SIZE_DEFAULT = 20
+
 
 @click.group()
 def runs():
@@ -17,28 +21,31 @@ def runs():
 
 
 @runs.command(name="list")
-@click.option('--page', '-p', default=1, type=int, help='Page number')
-@click.option('--page-size', '-s', default=20, type=int, help='Items per page')
+@click.option('--cursor', '-c', help='Cursor from the previous page (shown below the table)')
+@click.option('--page-size', '-s', default=PAGE_SIZE_DEFAULT, type=int, help='Items per page')
 @click.option('--job-name', '-j', help='Filter by job name')
 @click.option('--status', help='Filter by status (running, success, failure, timeout, cancelled)')
 @click.option('--json', 'output_json', is_flag=True, help='Output as JSON')
-def list_runs(page: int, page_size: int, job_name: str, status: str, output_json: bool):
+def list_runs(cursor: str, page_size: int, job_name: str, status: str, output_json: bool):
     """
     List job run history.
     
     Examples:
         crontopus runs list
-        crontopus runs list --page 2
+        crontopus runs list --cursor <next-cursor> --job-name backup-db
         crontopus runs list --job-name backup-db
         crontopus runs list --status success
         crontopus runs list --json
     """
     # Build query parameters
     params = {
-        'page': page,
-        'page_size': page_size
+        'limit': page_size,
+        'count': 'estimated'  # exact counts are slow on long histories
     }
     
+    if cursor:
+        params['cursor'] = cursor
+    
     if job_name:
         params['job_name'] = job_name
     
@@ -55,6 +62,7 @@ def list_runs(page: int, page_size: int, job_name: str, status: str, output_json
         
         runs = data.get('runs', [])
         total = data.get('total', 0)
+        next_cursor = data.get('next_cursor')
         
         if not runs:
             print_info("No runs found")
@@ -87,9 +95,25 @@ def list_runs(page: int, page_size: int, job_name: str, status: str, output_json
         
         # Print table
         columns = ['ID', 'Job Name', 'Status', 'Started', 'Duration', 'Exit Code']
-        title = f"Job Runs (Page {page}/{(total + page_size - 1) // page_size}, Total: {total})"
+        if total is None:
+            title = f"Job Runs (Showing {len(runs)})"
+        elif data.get('count_strategy') == 'estimated':
+            title = f"Job Runs (Showing {len(runs)} of ~{total})"
+        else:
+            title = f"Job Runs (Showing {len(runs)} of {total})"
         print_table(table_data, columns, title=title)
         
+        if next_cursor:
+            # The cursor only marks a position; repeat the filters it was made with
+            command = ['crontopus', 'runs', 'list', '--cursor', next_cursor]
+            if page_size != PAGE_SIZE_DEFAULT:
+                command += ['--page-size', str(page_size)]
+            if job_name:
+                command += ['--job-name', job_name]
+            if status:
+                command += ['--status', status]
+            print_info(f"Next page: {' '.join(shlex.quote(arg) for arg in command)}")
+        
     except Exception as e:
         print_error(f"Failed to fetch runs: {e}")
 
@@ -1,12 +1,11 @@
 import { apiClient } from './client';
 
-export interface JobRun {
+// Run as listed by GET /runs (view=summary): no output
+export interface JobRunSummary {
   id: number;
   job_name: string;
   namespace: string | null;
   status: 'success' | 'failure' | 'timeout' | 'running' | 'cancelled';
-  output: string | null;
-  error_message: string | null;
   started_at: string;
   finished_at: string;
   duration: number | null;
@@ -15,6 +14,12 @@ export interface JobRun {
   agent_id: string | null;
 }
 
+// Run as returned by GET /runs/{id}
+export interface JobRun extends JobRunSummary {
+  output: string | null;
+  error_message: string | null;
+}
+
 export interface JobAggregation {
   job_name: string;
   namespace: string;
@@ -46,8 +51,9 @@ export const runsApi = {
     endpoint_id?: number;
     status?: string;
     days?: number;
-  }): Promise<JobRun[]> => {
-    const response = await apiClient.get('/runs', { params });
+  }): Promise<JobRunSummary[]> => {
+    // Summaries keep pages small; fetch output per run with get()
+    const response = await apiClient.get('/runs', { params: { ...params, view: 'summary' } });
     return response.data.runs || [];
   },
 
@@ -1,10 +1,10 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
-import { runsApi, type JobRun } from '../api/runs';
+import { runsApi, type JobRunSummary } from '../api/runs';
 import { agentsApi, type Agent } from '../api/agents';
 
 export const Dashboard = () => {
-  const [recentRuns, setRecentRuns] = useState<JobRun[]>([]);
+  const [recentRuns, setRecentRuns] = useState<JobRunSummary[]>([]);
   const [agents, setAgents] = useState<Agent[]>([]);
   const [loading, setLoading] = useState(true);
 
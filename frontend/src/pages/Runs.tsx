@@ -1,12 +1,14 @@
 import { useEffect, useState } from 'react';
-import { runsApi, type JobRun } from '../api/runs';
+import { runsApi, type JobRun, type JobRunSummary } from '../api/runs';
 import { agentsApi, type Agent } from '../api/agents';
 
 export const Runs = () => {
-  const [runs, setRuns] = useState<JobRun[]>([]);
+  const [runs, setRuns] = useState<JobRunSummary[]>([]);
   const [endpoints, setEndpoints] = useState<Map<number, Agent>>(new Map());
   const [loading, setLoading] = useState(true);
   const [expandedRows, setExpandedRows] = useState<Set<number>>(new Set());
+  // Output and error details, loaded from GET /runs/{id} when a row is expanded
+  const [details, setDetails] = useState<Map<number, JobRun | 'loading' | 'error'>>(new Map());
 
   // Filters
   const [limit, setLimit] = useState(100);
@@ -29,6 +31,9 @@ export const Runs = () => {
     ])
       .then(([runsData, agentsData]) => {
         setRuns(runsData);
+        // Details of the previous list may be stale
+        setExpandedRows(new Set());
+        setDetails(new Map());
         const endpointMap = new Map(
           agentsData.map(e => [e.id, e])
         );
@@ -42,7 +47,20 @@ export const Runs = () => {
     loadData();
   }, [limit, jobNameFilter, namespaceFilter, statusFilter, days]);
 
+  const loadDetails = (runId: number) => {
+    setDetails(prev => new Map(prev).set(runId, 'loading'));
+    runsApi.get(String(runId))
+      .then((run) => setDetails(prev => new Map(prev).set(runId, run)))
+      .catch((err) => {
+        console.error('Failed to load run details:', err);
+        setDetails(prev => new Map(prev).set(runId, 'error'));
+      });
+  };
+
   const toggleRow = (runId: number) => {
+    if (!expandedRows.has(runId) && (!details.has(runId) || details.get(runId) === 'error')) {
+      loadDetails(runId);
+    }
     setExpandedRows(prev => {
       const next = new Set(prev);
       if (next.has(runId)) {
@@ -179,6 +197,7 @@ export const Runs = () => {
             ) : (
               runs.map((run) => {
                 const isExpanded = expandedRows.has(run.id);
+                const detail = details.get(run.id);
                 const endpoint = run.endpoint_id ? endpoints.get(run.endpoint_id) : null;
                 return (
                   <>
@@ -227,23 +246,29 @@ export const Runs = () => {
                     <tr key={`${run.id}-details`}>
                       <td colSpan={8} className="px-6 py-4 bg-gray-50 dark:bg-[#21222c] border-t border-gray-200 dark:border-[#44475a]">
                         <div className="space-y-3">
-                          {run.output && (
+                          {(detail === undefined || detail === 'loading') && (
+                            <div className="text-sm font-mono text-gray-500 dark:text-[#6272a4]">Loading details...</div>
+                          )}
+                          {detail === 'error' && (
+                            <div className="text-sm font-mono text-red-600 dark:text-[#ff5555]">Failed to load run details</div>
+                          )}
+                          {typeof detail === 'object' && detail.output && (
                             <div>
                               <h4 className="text-xs font-mono font-bold text-gray-500 dark:text-[#6272a4] mb-1 uppercase tracking-wider">Output:</h4>
                               <pre className="text-xs font-mono bg-white dark:bg-[#282a36] p-3 border border-gray-200 dark:border-[#44475a] overflow-x-auto text-gray-800 dark:text-[#f8f8f2]">
-                                {run.output}
+                                {detail.output}
                               </pre>
                             </div>
                           )}
-                          {run.error_message && (
+                          {typeof detail === 'object' && detail.error_message && (
                             <div>
                               <h4 className="text-xs font-mono font-bold text-red-600 dark:text-[#ff5555] mb-1 uppercase tracking-wider">Error:</h4>
                               <pre className="text-xs font-mono bg-red-50 dark:bg-red-900/10 p-3 border border-red-200 dark:border-red-800 overflow-x-auto text-red-900 dark:text-[#ff5555]">
-                                {run.error_message}
+                                {detail.error_message}
                               </pre>
                             </div>
                           )}
-                          {!run.output && !run.error_message && (
+                          {typeof detail === 'object' && !detail.output && !detail.error_message && (
                             <div className="text-sm font-mono text-gray-500 dark:text-[#6272a4]">No output or error details available</div>
                           )}
                         </div>